@@ -0,0 +1,73 @@
+"""
+Measures CaseManager.list_cases / get_case latency on a large case book.
+
+Opens --cases cases spread over --participants participants and 20
+instruments, then times typical queries (first page and a deep page)
+against the secondary indexes.
+
+Usage:
+    python benchmarks/bench_case_queries.py [--cases 1000000] [--participants 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from cases.case_manager import CaseManager
+
+
+def timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return np.percentile(samples, 50) * 1e6, np.percentile(samples, 99) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=1_000_000)
+    parser.add_argument("--participants", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    manager = CaseManager()
+    start = time.perf_counter()
+    for i in range(args.cases):
+        manager.open_case(
+            f"P{rng.randrange(args.participants)}", f"INST{rng.randrange(20)}", [],
+            rng.random(), rng.choice(["LOW", "MEDIUM", "HIGH"])
+        )
+    print(f"Opened {args.cases} cases in {time.perf_counter() - start:.1f}s")
+    for case in rng.sample(list(manager.cases.values()), args.cases // 10):
+        case.status = "CLOSED"
+
+    some_case = next(iter(manager.cases))
+    middle = manager._ordered[args.cases // 2].created_at
+    _, deep_cursor = manager.list_cases(limit=args.cases // 2)
+    queries = {
+        "get_case": lambda: manager.get_case(some_case),
+        "participant page": lambda: manager.list_cases(participant_id="P42", limit=100),
+        "participant+instrument": lambda: manager.list_cases(participant_id="P42", instrument="INST3"),
+        "instrument HIGH >0.9": lambda: manager.list_cases(instrument="INST3", priorities={"HIGH"}, min_score=0.9),
+        "all OPEN page": lambda: manager.list_cases(statuses={"OPEN"}, limit=100),
+        "time range page": lambda: manager.list_cases(created_before=middle, limit=100),
+        "deep cursor page": lambda: manager.list_cases(limit=100, cursor=deep_cursor),
+        "CLOSED page (selective)": lambda: manager.list_cases(statuses={"CLOSED"}, limit=100),
+    }
+    print(f"{'query':<26} {'p50_us':>8} {'p99_us':>8}")
+    for name, fn in queries.items():
+        p50, p99 = timed(fn, args.repeats)
+        print(f"{name:<26} {p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
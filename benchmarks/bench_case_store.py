@@ -0,0 +1,73 @@
+"""
+Measures SQLite case persistence throughput for several group-commit settings.
+
+For each setting, opens --cases cases (each with a rule alert and an
+explanation) through CaseManager and updates half of them, then waits for
+the write-behind queue to drain. Reports the caller-side cost per change
+(what the analysis loop pays) and durable cases/s (until committed).
+
+Usage:
+    python benchmarks/bench_case_store.py [--cases 20000] [--intervals-ms 0 5 50 200]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from cases.case_manager import CaseManager
+from cases.case_store import SqliteCaseStore
+
+
+def run(path, n_cases, commit_interval_s, max_batch):
+    store = SqliteCaseStore(path, commit_interval_s=commit_interval_s, max_batch=max_batch)
+    manager = CaseManager(store=store)
+    spoof = {"rule_id": "spoofing_large_orders", "type": "SPOOFING", "severity": "HIGH"}
+    call_s = []
+
+    start = time.perf_counter()
+    for i in range(n_cases):
+        explanation = {"feature": "num_trades", "value": float(i % 50), "deviation_sigma": 3.1}
+        t = time.perf_counter()
+        manager.record_finding(f"P{i % 1000}", f"INST{i % 10}", i, "SPOOFING", [spoof, explanation], 0.5, "MEDIUM")
+        if i % 2:
+            manager.record_finding(f"P{i % 1000}", f"INST{i % 10}", i, "SPOOFING", [spoof], 0.9, "HIGH")
+        call_s.append(time.perf_counter() - t)
+    enqueued = time.perf_counter() - start
+    store.flush()
+    durable = time.perf_counter() - start
+    store.close()
+    return enqueued, durable, np.array(call_s), store.commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--intervals-ms", type=float, nargs="+", default=[0, 5, 50, 200])
+    args = parser.parse_args()
+
+    # max_batch=1 commits every change on its own: the cost group commit avoids
+    settings = [(0.0, 1)] + [(ms / 1000.0, 1000) for ms in args.intervals_ms]
+    print(f"{'interval_ms':>11} {'max_batch':>9} {'commits':>8} {'call_p50_us':>11} {'call_p99_us':>11} "
+          f"{'enqueue/s':>10} {'durable/s':>10}")
+    for interval_s, max_batch in settings:
+        tmpdir = tempfile.mkdtemp()
+        try:
+            enqueued, durable, call_s, commits = run(
+                os.path.join(tmpdir, "cases.db"), args.cases, interval_s, max_batch
+            )
+        finally:
+            shutil.rmtree(tmpdir)
+        print(f"{interval_s * 1000:>11.0f} {max_batch:>9} {commits:>8} "
+              f"{np.percentile(call_s, 50) * 1e6:>11.1f} {np.percentile(call_s, 99) * 1e6:>11.1f} "
+              f"{args.cases / enqueued:>10.0f} {args.cases / durable:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measures gRPC event-loop lag while surveillance cycles run, for each execution mode.
+
+A probe task sleeps for a fixed tick and records how late it wakes up; that
+delay is what Subscribe/StreamCases streams and new PublishTrades calls see.
+
+Usage:
+    python benchmarks/bench_event_loop_lag.py [--batches 40] [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+sys.path.insert(0, ENGINE_DIR)
+os.chdir(ENGINE_DIR)  # main.py loads rules/ relative to the engine directory
+
+import main
+from cases.case_manager import CaseManager
+from features.baseline_store import BaselineStore
+from features.feature_extraction import extract_features
+from ml.anomaly_detection import AnomalyDetector
+from pipeline.stage_executor import StageExecutor
+from pipeline.surveillance_pipeline import SurveillancePipeline
+from synthetic import synthetic_trades
+
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+TICK_S = 0.005
+
+
+async def probe(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_S
+        await asyncio.sleep(TICK_S)
+        lags.append(max(loop.time() - expected, 0.0))
+
+
+async def run_mode(mode, batches, workers, model):
+    main.PIPELINE = SurveillancePipeline(FEATURE_COLS, rules_dir="rules")
+    # Pin the same model in every mode so they all score the same way
+    main.PIPELINE.detector.current = model
+    main.PIPELINE.trainer.retrain_min_rows = math.inf
+    main.PIPELINE.trainer.retrain_interval_s = math.inf
+    main.CASE_MANAGER = CaseManager()
+    main.BASELINE_STORE = BaselineStore(main.FEATURE_COLS)
+    main.STAGE_EXECUTOR = StageExecutor(mode=mode, workers=workers)
+    await main.STAGE_EXECUTOR.start()
+
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for batch in batches:
+            await main.run_surveillance_cycle(batch)
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    main.STAGE_EXECUTOR.shutdown()
+
+    lags_ms = np.array(lags) * 1e3
+    n_trades = sum(len(b) for b in batches)
+    print(f"{mode:>8} {n_trades / elapsed:>10.0f} {np.percentile(lags_ms, 50):>8.1f} "
+          f"{np.percentile(lags_ms, 99):>8.1f} {lags_ms.max():>8.1f}")
+
+
+async def bench(args):
+    df = synthetic_trades(args.batches * args.batch_size, n_participants=args.participants)
+
+    detector = AnomalyDetector()
+    detector.fit(extract_features(df.copy()), FEATURE_COLS)
+
+    trades = df.to_dict("records")
+    batches = [trades[i:i + args.batch_size] for i in range(0, len(trades), args.batch_size)]
+
+    print(f"{'mode':>8} {'trades/s':>10} {'lag_p50':>8} {'lag_p99':>8} {'lag_max':>8}  (ms)")
+    for mode in args.modes:
+        await run_mode(mode, batches, args.workers, detector.current)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--modes", nargs="+", default=["inline", "process"])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(parse_args()))
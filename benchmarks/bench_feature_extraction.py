@@ -0,0 +1,51 @@
+"""
+Benchmarks the columnar extract_features against the per-group reference.
+
+Usage:
+    python benchmarks/bench_feature_extraction.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from features.feature_extraction import extract_features, extract_features_reference
+from synthetic import synthetic_trades
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df.copy())
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--participants", type=int, default=2000)
+    parser.add_argument("--reference-limit", type=int, default=100_000,
+                        help="skip the reference path above this many trades")
+    args = parser.parse_args()
+
+    print(f"{'trades':>10} {'groups':>8} {'columnar_s':>11} {'reference_s':>12} {'speedup':>8}")
+    for n in args.sizes:
+        df = synthetic_trades(n, n_participants=args.participants)
+        fast, fast_s = timed(extract_features, df)
+
+        if n <= args.reference_limit:
+            ref, ref_s = timed(extract_features_reference, df)
+            pd.testing.assert_frame_equal(fast, ref)
+            ref_col, speedup = f"{ref_s:12.3f}", f"{ref_s / fast_s:7.1f}x"
+        else:
+            ref_col, speedup = f"{'skipped':>12}", f"{'-':>8}"
+
+        print(f"{n:>10} {len(fast):>8} {fast_s:11.3f} {ref_col} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compares ingest throughput of unary PublishTrades with the PublishTradeStream RPC.
+
+The engine's gRPC server runs in a separate process. By default its analysis
+worker only drains the ingest queue, so the numbers measure the ingest path
+(transport, conversion, queueing); --with-analysis runs full surveillance
+cycles instead. The unary producer sends one batch per round trip, as
+FixIngestor does; the streaming producer keeps --window trades in flight.
+
+Usage:
+    python benchmarks/bench_ingest_throughput.py [--trades 20000] [--batch-sizes 1 100]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import sys
+import time
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+sys.path.insert(0, ENGINE_DIR)
+
+import grpc
+import trades_pb2
+import trades_pb2_grpc
+from ingest.trade_producer import StreamingTradePublisher
+from synthetic import synthetic_trades
+
+TARGET = "127.0.0.1:50051"
+
+
+def run_server(with_analysis):
+    os.chdir(ENGINE_DIR)  # main.py loads rules/ relative to the engine directory
+    import main
+
+    async def drain_only():
+        while True:
+            await main.TRADES_QUEUE.get_batch()
+
+    if not with_analysis:
+        main.analysis_worker = drain_only
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        asyncio.run(main.serve())
+
+
+def proto_batches(n_trades, batch_size):
+    df = synthetic_trades(n_trades)
+    trades = [
+        trades_pb2.CanonicalTrade(
+            event_time_ns=int(r.event_time), venue=r.venue, instrument=r.instrument, side=r.side,
+            price=r.price, quantity=r.quantity, participant_id=r.participant_id,
+            order_id=r.order_id, origin=r.origin
+        )
+        for r in df.itertuples()
+    ]
+    return [trades[i:i + batch_size] for i in range(0, len(trades), batch_size)]
+
+
+async def wait_for_server(stub):
+    for _ in range(100):
+        try:
+            await stub.PublishTrades(trades_pb2.TradeBatch(), timeout=1)
+            return
+        except grpc.RpcError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("engine did not start")
+
+
+async def unary(stub, batches):
+    for batch in batches:
+        ack = await stub.PublishTrades(trades_pb2.TradeBatch(trades=batch))
+        while not ack.success:
+            await asyncio.sleep(0.01)
+            ack = await stub.PublishTrades(trades_pb2.TradeBatch(trades=batch))
+
+
+async def streaming(stub, batches, window):
+    async with StreamingTradePublisher(stub, max_in_flight=window) as publisher:
+        for batch in batches:
+            await publisher.publish(batch)
+
+
+async def run(args):
+    async with grpc.aio.insecure_channel(TARGET) as channel:
+        stub = trades_pb2_grpc.TradeStreamStub(channel)
+        await wait_for_server(stub)
+
+        print(f"{'batch':>6} {'unary/s':>10} {'stream/s':>10} {'speedup':>8}")
+        for batch_size in args.batch_sizes:
+            batches = proto_batches(args.trades, batch_size)
+            rates = []
+            for producer in (lambda: unary(stub, batches), lambda: streaming(stub, batches, args.window)):
+                start = time.perf_counter()
+                await producer()
+                rates.append(args.trades / (time.perf_counter() - start))
+            print(f"{batch_size:>6} {rates[0]:>10.0f} {rates[1]:>10.0f} {rates[1] / rates[0]:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trades", type=int, default=20_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--window", type=int, default=10_000, help="streaming trades in flight")
+    parser.add_argument("--with-analysis", action="store_true")
+    args = parser.parse_args()
+
+    server = multiprocessing.get_context("spawn").Process(target=run_server, args=(args.with_analysis,), daemon=True)
+    server.start()
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
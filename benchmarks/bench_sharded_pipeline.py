@@ -0,0 +1,113 @@
+"""
+Measures surveillance throughput of the sharded pipeline against the single-process one.
+
+Feeds the same micro-batches through main.run_surveillance_cycle (in-process)
+and through the ShardedPipeline for each --shards count, the way main.py's
+shard_feeder / shard_result_worker do. Besides wall-clock throughput it
+reports the parallel throughput: trades divided by the busiest process's
+CPU time (the coordinator or a shard). That is what wall-clock throughput
+approaches with a free core per shard; on a machine with fewer cores than
+shards the two diverge.
+
+Usage:
+    python benchmarks/bench_sharded_pipeline.py [--batches 40] [--batch-size 2000] [--shards 1 2 4 8]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import math
+import os
+import sys
+import time
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+sys.path.insert(0, ENGINE_DIR)
+os.chdir(ENGINE_DIR)  # main.py loads rules/ relative to the engine directory
+
+import main
+from cases.case_manager import CaseManager
+from features.baseline_store import BaselineStore
+from pipeline.sharded_pipeline import ShardedPipeline
+from pipeline.surveillance_pipeline import SurveillancePipeline
+from synthetic import synthetic_trade_dicts
+
+# Shards fit their own detectors; pin them to the initial fit so every run scores alike
+CONFIG = {"ml_model": {"retrain_interval_seconds": math.inf, "retrain_min_rows": math.inf}}
+
+
+async def run_in_process(batches):
+    start, cpu_start = time.perf_counter(), time.process_time()
+    for batch in batches:
+        await main.run_surveillance_cycle(batch)
+    return time.perf_counter() - start, time.process_time() - cpu_start, 0.0, len(batches)
+
+
+async def run_sharded(batches, shards):
+    sharded = main.SHARDED_PIPELINE = ShardedPipeline(shards, CONFIG, main.FEATURE_COLS, main.BASELINE_STORE)
+    await sharded.start()
+    n_trades = sum(len(b) for b in batches)
+    done = asyncio.Event()
+
+    async def collect():
+        analysed = 0
+        while analysed < n_trades:
+            result = await sharded.next_result()
+            main.publish_findings(result.findings)
+            analysed += result.trades
+        done.set()
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    collector = asyncio.create_task(collect())
+    for batch in batches:
+        await sharded.submit(batch)
+    await done.wait()
+    elapsed, coordinator_s = time.perf_counter() - start, time.process_time() - cpu_start
+    await collector
+    sharded.shutdown()
+    return elapsed, coordinator_s, max(sharded.busy_s), sum(sharded.calls)
+
+
+async def run(batches, shards):
+    main.load_engine()
+    main.CASE_MANAGER = CaseManager()
+    main.BASELINE_STORE = BaselineStore(main.FEATURE_COLS)
+    main.PIPELINE = SurveillancePipeline.from_config(CONFIG, main.FEATURE_COLS)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if shards:
+            elapsed, coordinator_s, shard_s, calls = await run_sharded(batches, shards)
+        else:
+            elapsed, coordinator_s, shard_s, calls = await run_in_process(batches)
+    n_trades = sum(len(b) for b in batches)
+    label = f"{shards} shards" if shards else "in-process"
+    return (label, n_trades / elapsed, n_trades / max(coordinator_s, shard_s), coordinator_s, shard_s,
+            n_trades / calls, len(main.CASE_MANAGER.cases))
+
+
+async def bench(args):
+    trades = synthetic_trade_dicts(args.batches * args.batch_size, n_participants=args.participants)
+    batches = [trades[i:i + args.batch_size] for i in range(0, len(trades), args.batch_size)]
+
+    print(f"{'pipeline':>12} {'wall trades/s':>14} {'parallel trades/s':>18} {'speed-up':>9} "
+          f"{'coord_cpu_s':>12} {'shard_cpu_s':>12} {'trades/call':>12} {'cases':>6}")
+    baseline = None
+    for shards in [0] + args.shards:
+        label, wall, parallel, coordinator_s, shard_s, per_call, cases = await run(batches, shards)
+        baseline = baseline or parallel
+        print(f"{label:>12} {wall:>14.0f} {parallel:>18.0f} {parallel / baseline:>8.1f}x "
+              f"{coordinator_s:>12.2f} {shard_s:>12.2f} {per_call:>12.0f} {cases:>6}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--participants", type=int, default=2000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    print(f"{os.cpu_count()} CPUs")
+    asyncio.run(bench(parse_args()))
@@ -0,0 +1,281 @@
+"""
+Stage-level benchmark suite for the surveillance pipeline.
+
+Runs every analysis stage on deterministic synthetic trades at several scales
+(participants x instruments x trades) and reports, per stage, throughput,
+p50/p99 latency and peak traced memory as JSON. Results are compared with a
+stored baseline; a stage whose p50 latency or peak memory grew by more than
+--tolerance is flagged as a regression.
+
+The human-readable table goes to stderr and the JSON to stdout (or --output).
+
+Usage:
+    python benchmarks/bench_stages.py [--scales small medium] [--repeats 7] [--output results.json]
+    python benchmarks/bench_stages.py --update-baseline        # store this run as the new baseline
+    python benchmarks/bench_stages.py --fail-on-regression     # exit 1 if any stage regressed
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+sys.path.insert(0, ENGINE_DIR)
+os.chdir(ENGINE_DIR)  # main.py loads rules/ relative to the engine directory
+
+import main
+from cases.case_manager import CaseManager
+from features.baseline_store import BaselineStore
+from features.feature_extraction import extract_features
+from features.feature_stats import compute_feature_baselines
+from ml.anomaly_detection import AnomalyDetector
+from ml.explainability import explain_anomalies, explain_anomaly
+from pipeline.surveillance_pipeline import SurveillancePipeline
+from rules.rule_engine import RuleEngine
+from synthetic import synthetic_trades
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "stages.json")
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+
+# name: (participants, instruments, trades)
+SCALES = {
+    "small": (100, 5, 10_000),
+    "medium": (1_000, 10, 100_000),
+    "large": (5_000, 20, 1_000_000),
+}
+# Per-row stages run on at most this many rows, so large scales stay quick
+ROW_SAMPLE = 2_000
+CASES_PER_RUN = 2_000
+CYCLE_BATCH = 1_000
+
+
+def measure(fn, repeats, trace_memory=True):
+    """
+    Calls fn() repeats times and returns the latencies (s). Peak memory is
+    taken from one extra traced call, so tracing does not skew the timings.
+    """
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                fn()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return samples, peak
+
+
+def summarise(samples, peak, items, unit):
+    p50 = float(np.percentile(samples, 50))
+    return {
+        "items": items,
+        "unit": unit,
+        "repeats": len(samples),
+        "p50_ms": round(p50 * 1e3, 3),
+        "p99_ms": round(float(np.percentile(samples, 99)) * 1e3, 3),
+        "throughput_per_s": round(items / p50, 1) if p50 > 0 else None,
+        "peak_mem_mb": None if peak is None else round(peak / 2**20, 2),
+    }
+
+
+def run_cycles(batches, model):
+    """
+    The full run_surveillance_cycle over every micro-batch, against fresh
+    engine state with a pinned model. Returns per-cycle latencies.
+    """
+    main.load_engine()
+    main.SHARDED_PIPELINE = None
+    main.PIPELINE = SurveillancePipeline(FEATURE_COLS, rules_dir="rules")
+    main.PIPELINE.detector.current = model
+    main.PIPELINE.trainer.retrain_min_rows = math.inf
+    main.PIPELINE.trainer.retrain_interval_s = math.inf
+    main.CASE_MANAGER = CaseManager()
+    main.BASELINE_STORE = BaselineStore(FEATURE_COLS)
+
+    async def cycles():
+        latencies = []
+        for batch in batches:
+            start = time.perf_counter()
+            await main.run_surveillance_cycle(batch)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    return asyncio.run(cycles())
+
+
+def bench_scale(name, repeats, trace_memory):
+    participants, instruments, n_trades = SCALES[name]
+    trades = synthetic_trades(n_trades, n_participants=participants, n_instruments=instruments)
+    features = extract_features(trades.copy())
+    baselines = compute_feature_baselines(features, FEATURE_COLS)
+    rows = features.head(ROW_SAMPLE).to_dict("records")
+    rule_engine = RuleEngine(rules_dir="rules")
+    detector = AnomalyDetector()
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector.fit(features, FEATURE_COLS)
+
+    def open_cases():
+        manager = CaseManager()
+        for i in range(CASES_PER_RUN):
+            manager.open_case(f"P{i}", "BTC-USDT", [], 0.9, "HIGH")
+
+    stages = {
+        "extract_features": (lambda: extract_features(trades.copy()), n_trades, "trades"),
+        "compute_feature_baselines": (lambda: compute_feature_baselines(features, FEATURE_COLS), len(features), "rows"),
+        "anomaly_detector.fit": (lambda: AnomalyDetector().fit(features, FEATURE_COLS), len(features), "rows"),
+        "anomaly_detector.score": (lambda: detector.score(features), len(features), "rows"),
+        "rule_engine.evaluate": (lambda: [rule_engine.evaluate(row) for row in rows], len(rows), "rows"),
+        "rule_engine.evaluate_frame": (lambda: rule_engine.evaluate_frame(features), len(features), "rows"),
+        "explain_anomaly": (lambda: [explain_anomaly(row, baselines) for row in rows], len(rows), "rows"),
+        "explain_anomalies": (lambda: explain_anomalies(features, {None: baselines}), len(features), "rows"),
+        "case_manager.open_case": (open_cases, CASES_PER_RUN, "cases"),
+    }
+    results = {}
+    for stage, (fn, items, unit) in stages.items():
+        samples, peak = measure(fn, repeats, trace_memory)
+        results[stage] = summarise(samples, peak, items, unit)
+
+    # One pass over the whole stream; each cycle is a latency sample
+    records = trades.to_dict("records")
+    batches = [records[i:i + CYCLE_BATCH] for i in range(0, len(records), CYCLE_BATCH)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        latencies = run_cycles(batches, detector.current)
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                run_cycles(batches, detector.current)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    cycle = summarise(latencies, peak, CYCLE_BATCH, "trades")
+    cycle["throughput_per_s"] = round(n_trades / sum(latencies), 1)
+    results["run_surveillance_cycle"] = cycle
+    return {"participants": participants, "instruments": instruments, "trades": n_trades, "stages": results}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Ratios of p50 latency and peak memory against the baseline, per stage
+    present in both. A ratio above 1 + tolerance is a regression.
+    """
+    comparison = []
+    for scale, current in results["scales"].items():
+        base_scale = baseline.get("scales", {}).get(scale)
+        if base_scale is None:
+            continue
+        for stage, stats in current["stages"].items():
+            base = base_scale["stages"].get(stage)
+            if base is None:
+                continue
+            entry = {"scale": scale, "stage": stage, "regressions": []}
+            for metric in ("p50_ms", "peak_mem_mb"):
+                if stats.get(metric) is None or not base.get(metric):
+                    continue
+                ratio = stats[metric] / base[metric]
+                entry[f"{metric}_ratio"] = round(ratio, 3)
+                if ratio > 1 + tolerance:
+                    entry["regressions"].append(metric)
+            comparison.append(entry)
+    return comparison
+
+
+def environment():
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def print_table(results, comparison, out):
+    ratios = {(c["scale"], c["stage"]): c for c in comparison}
+    print(f"{'scale':>7} {'stage':<28} {'items':>8} {'p50_ms':>10} {'p99_ms':>10} {'per_s':>12} "
+          f"{'peak_mb':>9} {'vs_base':>8}", file=out)
+    for scale, current in results["scales"].items():
+        for stage, s in current["stages"].items():
+            c = ratios.get((scale, stage), {})
+            ratio = f"{c['p50_ms_ratio']:.2f}x" if "p50_ms_ratio" in c else "-"
+            flag = "  REGRESSION " + ",".join(c["regressions"]) if c.get("regressions") else ""
+            peak = "-" if s["peak_mem_mb"] is None else f"{s['peak_mem_mb']:.1f}"
+            print(f"{scale:>7} {stage:<28} {s['items']:>8} {s['p50_ms']:>10.2f} {s['p99_ms']:>10.2f} "
+                  f"{s['throughput_per_s'] or 0:>12.0f} {peak:>9} {ratio:>8}{flag}", file=out)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced-memory pass")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth of p50 latency / peak memory")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    results = {"environment": environment(), "scales": {}}
+    for scale in args.scales:
+        print(f"Running {scale} scale...", file=sys.stderr)
+        results["scales"][scale] = bench_scale(scale, args.repeats, not args.no_memory)
+
+    comparison = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        comparison = compare(results, baseline, args.tolerance)
+        results["baseline"] = {"path": os.path.abspath(args.baseline), "environment": baseline.get("environment")}
+        if baseline.get("environment", {}).get("cpu_count") != os.cpu_count():
+            print("Baseline was recorded on a different machine; ratios are indicative only", file=sys.stderr)
+    results["comparison"] = comparison
+    regressions = [c for c in comparison if c["regressions"]]
+
+    print_table(results, comparison, sys.stderr)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": results["environment"], "scales": results["scales"]}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed beyond {args.tolerance:.0%}", file=sys.stderr)
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
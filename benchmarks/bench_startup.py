@@ -0,0 +1,97 @@
+"""
+Time from launching the engine to its first PublishTrades Ack, and to engine ready.
+
+Starts `python main.py` (with metrics disabled, so nothing else needs a free
+port), sends one trade as soon as port 50051 accepts connections, and reads
+the engine's "Engine ready" line for the time its background warm-up took.
+Port 50051 must be free.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+sys.path.insert(0, ENGINE_DIR)
+
+import grpc
+import trades_pb2
+import trades_pb2_grpc
+
+# Retry the connection every few ms instead of gRPC's default 1s backoff
+CHANNEL_OPTIONS = [
+    ("grpc.initial_reconnect_backoff_ms", 5),
+    ("grpc.min_reconnect_backoff_ms", 5),
+    ("grpc.max_reconnect_backoff_ms", 10),
+]
+TRADE = trades_pb2.CanonicalTrade(
+    event_time_ns=1_700_000_000_000_000_000, venue="CEX", instrument="BTC-USDT", side="BUY",
+    price=40000.0, quantity=1.0, participant_id="P1", order_id="O1", origin="CEX"
+)
+
+
+def run_once(config_path, timeout_s):
+    channel = grpc.insecure_channel("localhost:50051", options=CHANNEL_OPTIONS)
+    stub = trades_pb2_grpc.TradeStreamStub(channel)
+    ready = threading.Event()
+
+    start = time.perf_counter()
+    engine = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ENGINE_DIR, text=True,
+        env={**os.environ, "SURVEILLANCE_CONFIG": config_path, "PYTHONUNBUFFERED": "1"},
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    ready_s = []
+
+    def watch():
+        for line in engine.stdout:
+            if line.startswith("Engine ready"):
+                ready_s.append(time.perf_counter() - start)
+                ready.set()
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        ack = stub.PublishTrades(trades_pb2.TradeBatch(trades=[TRADE]), wait_for_ready=True, timeout=timeout_s)
+        first_ack_s = time.perf_counter() - start
+        if not ack.success:
+            raise RuntimeError(f"Engine refused the batch: {ack.message}")
+        ready.wait(timeout_s)
+        return first_ack_s, ready_s[0] if ready_s else None
+    finally:
+        engine.terminate()
+        engine.wait()
+        channel.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for each Ack and for ready")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with tempfile.NamedTemporaryFile("w", suffix=".toml", delete=False) as config:
+        config.write("[performance]\nenable_metrics = false\n")
+    try:
+        first_acks, readies = [], []
+        for run in range(args.runs):
+            first_ack_s, ready_s = run_once(config.name, args.timeout)
+            first_acks.append(first_ack_s)
+            readies.append(ready_s)
+            ready = "-" if ready_s is None else f"{ready_s * 1e3:.0f} ms"
+            print(f"run {run + 1}: first Ack after {first_ack_s * 1e3:.0f} ms, engine ready after {ready}")
+        print(f"median first Ack: {statistics.median(first_acks) * 1e3:.0f} ms")
+        if None not in readies:
+            print(f"median engine ready: {statistics.median(readies) * 1e3:.0f} ms")
+    finally:
+        os.unlink(config.name)
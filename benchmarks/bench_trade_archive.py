@@ -0,0 +1,134 @@
+"""
+Trade archive benchmark: ingest overhead and read latency.
+
+Ingest: the same micro-batches go through main.run_surveillance_cycle with and
+without archiving (append() on every batch plus the background writer).
+Modes alternate run by run so machine drift affects both alike. Reads: an
+archive of --archive-trades trades over a day is queried by participant, by
+participant and time range, and by time range alone.
+
+Usage:
+    python benchmarks/bench_trade_archive.py [--trades 100000] [--runs 3] [--archive-trades 2000000]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+sys.path.insert(0, ENGINE_DIR)
+os.chdir(ENGINE_DIR)  # main.py loads rules/ relative to the engine directory
+
+import main
+from archive.trade_archive import TradeArchive
+from cases.case_manager import CaseManager
+from features.baseline_store import BaselineStore
+from features.feature_extraction import extract_features
+from ml.anomaly_detection import AnomalyDetector
+from pipeline.surveillance_pipeline import SurveillancePipeline
+from synthetic import BASE_NS, synthetic_trade_dicts, synthetic_trades
+
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+HOUR_NS = 3600 * 10**9
+
+
+def run_cycles(batches, model, archive):
+    """
+    Trades per second through run_surveillance_cycle against fresh engine
+    state, archiving every batch first when an archive is given.
+    """
+    main.load_engine()
+    main.SHARDED_PIPELINE = None
+    main.PIPELINE = SurveillancePipeline(FEATURE_COLS, rules_dir="rules")
+    main.PIPELINE.detector.current = model
+    main.PIPELINE.trainer.retrain_min_rows = math.inf
+    main.PIPELINE.trainer.retrain_interval_s = math.inf
+    main.CASE_MANAGER = CaseManager()
+    main.BASELINE_STORE = BaselineStore(FEATURE_COLS)
+
+    async def cycles():
+        start = time.perf_counter()
+        for batch in batches:
+            if archive is not None:
+                archive.append(batch)
+            await main.run_surveillance_cycle(batch)
+        return sum(len(b) for b in batches) / (time.perf_counter() - start)
+
+    return asyncio.run(cycles())
+
+
+def bench_ingest(args, tmp):
+    trades = synthetic_trades(args.trades)
+    records = trades.to_dict("records")
+    batches = [records[i:i + args.batch_size] for i in range(0, len(records), args.batch_size)]
+    detector = AnomalyDetector()
+    results = {"off": [], "on": []}
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector.fit(extract_features(trades), FEATURE_COLS)
+        for run in range(args.runs):
+            for mode in results:
+                archive = None
+                if mode == "on":
+                    # A 1s flush interval keeps the writer busier than the default would
+                    archive = TradeArchive(os.path.join(tmp, f"ingest-{run}"), flush_interval_s=1.0)
+                results[mode].append(run_cycles(batches, detector.current, archive))
+                if archive is not None:
+                    archive.close()
+
+    off, on = statistics.median(results["off"]), statistics.median(results["on"])
+    print(f"Ingest, {args.trades} trades in batches of {args.batch_size} (median of {args.runs} runs)")
+    print(f"  archive off: {off:>10.0f} trades/s")
+    print(f"  archive on:  {on:>10.0f} trades/s ({(on - off) / off:+.1%})")
+
+
+def bench_reads(args, tmp):
+    archive = TradeArchive(os.path.join(tmp, "reads"), flush_interval_s=3600, max_segment_rows=args.segment_rows)
+    trades = synthetic_trade_dicts(args.archive_trades, span_minutes=24 * 60)
+    start = time.perf_counter()
+    for i in range(0, len(trades), args.batch_size):
+        archive.append(trades[i:i + args.batch_size])
+    archive.flush()
+    elapsed = time.perf_counter() - start
+    archive.close()
+    print(f"\nArchived {len(trades)} trades into {len(archive.catalog)} segments at {len(trades) / elapsed:.0f} trades/s")
+
+    noon = BASE_NS + 12 * HOUR_NS
+    queries = {
+        "one participant, all day": dict(participant_id="P000042"),
+        "one participant, 1 hour": dict(participant_id="P000042", start_ns=noon, end_ns=noon + HOUR_NS),
+        "participant + instrument": dict(participant_id="P000042", instrument="INST001-USDT"),
+        "all participants, 5 minutes": dict(start_ns=noon, end_ns=noon + 300 * 10**9),
+    }
+    print(f"  {'query':<30} {'rows':>8} {'p50_ms':>9}")
+    for label, query in queries.items():
+        latencies = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            rows = len(archive.read(**query))
+            latencies.append(time.perf_counter() - start)
+        print(f"  {label:<30} {rows:>8} {statistics.median(latencies) * 1e3:>9.2f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trades", type=int, default=100_000, help="trades per ingest run")
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--archive-trades", type=int, default=2_000_000)
+    parser.add_argument("--segment-rows", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="trade-archive-") as tmp:
+        bench_ingest(args, tmp)
+        bench_reads(args, tmp)
@@ -0,0 +1,40 @@
+"""
+Deterministic synthetic trade generator shared by the benchmarks.
+"""
+
+import numpy as np
+import pandas as pd
+
+BASE_NS = 1_700_000_000_000_000_000
+SIDES = np.array(["BUY", "SELL", "CANCEL"])
+VENUES = np.array(["CEX", "DEX", "OTC", "Injestor.NET"])
+
+
+def synthetic_trades(n_trades, n_participants=1000, n_instruments=10, span_minutes=60, seed=42) -> pd.DataFrame:
+    """
+    Returns a trade DataFrame with the same columns PublishTrades produces.
+    The same arguments always give the same trades.
+    """
+    rng = np.random.default_rng(seed)
+    participants = np.array([f"P{i:06d}" for i in range(n_participants)])
+    instruments = np.array([f"INST{i:03d}-USDT" for i in range(n_instruments)])
+
+    event_time = BASE_NS + np.sort(rng.integers(0, span_minutes * 60 * 10**9, n_trades))
+    return pd.DataFrame({
+        "event_time": event_time,
+        "venue": VENUES[rng.integers(0, len(VENUES), n_trades)],
+        "instrument": instruments[rng.integers(0, n_instruments, n_trades)],
+        "side": SIDES[rng.choice(3, n_trades, p=[0.4, 0.4, 0.2])],
+        "price": 40000.0 + rng.random(n_trades) * 1000.0,
+        "quantity": np.round(rng.lognormal(0.0, 1.0, n_trades), 4),
+        "participant_id": participants[rng.integers(0, n_participants, n_trades)],
+        "order_id": np.char.add("ORD-", np.arange(n_trades).astype(str)),
+        "origin": "CEX",
+    })
+
+
+def synthetic_trade_dicts(n_trades, **kwargs):
+    """
+    Same trades as synthetic_trades, as the list of dicts main.py works with.
+    """
+    return synthetic_trades(n_trades, **kwargs).to_dict("records")
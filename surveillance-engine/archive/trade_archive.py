@@ -0,0 +1,282 @@
+import json
+import math
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, List, Optional, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+DAY_NS = 86_400 * 10**9
+NUMERIC_COLUMNS = {
+    "event_time": np.int64,
+    "price": np.float64,
+    "quantity": np.float64,
+}
+# Stored as int32 codes into a sorted per-segment dictionary ("<name>.dict.npy").
+# instrument is not stored: it is the partition.
+STRING_COLUMNS = ("participant_id", "venue", "side", "order_id", "origin")
+COLUMNS = ["event_time", "venue", "instrument", "side", "price", "quantity", "participant_id", "order_id", "origin"]
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    One immutable archive file set: the trades of one instrument and UTC
+    day that arrived within one flush, sorted by (participant_id, event_time).
+    """
+    path: str
+    date: str
+    instrument: str
+    rows: int
+    min_time_ns: int
+    max_time_ns: int
+
+
+class TradeArchive:
+    """
+    Append-only columnar trade archive, partitioned as
+    <directory>/date=YYYY-MM-DD/instrument=<name>/<segment>/ with one .npy
+    file per column.
+
+    append() only enqueues the batch, so the event loop never waits for it.
+    A writer thread converts batches to columns as they arrive and writes a
+    segment per (day, instrument) every flush_interval_s, or once
+    max_segment_rows trades are pending. Segments are written under a
+    temporary name and renamed into place, so readers never see half of one.
+
+    read() memory-maps the columns it needs. Partitions and segments are
+    pruned by instrument and time range from the in-memory catalog; within a
+    segment, rows are sorted by participant, so a participant's rows are
+    found by binary search on the code column and only their pages are read.
+    """
+
+    def __init__(self, directory: str, flush_interval_s: float = 60.0, max_segment_rows: int = 500_000):
+        self.directory = directory
+        self.flush_interval_s = flush_interval_s
+        self.max_segment_rows = max_segment_rows
+        self.rows_written = 0
+        self.segments_written = 0
+        self.failed = 0
+        self.catalog: List[Segment] = []
+        self._catalog_lock = threading.Lock()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._sequence = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_catalog()
+        self._writer = threading.Thread(target=self._run, name="trade-archive-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def append(self, trades: List[Dict[str, Any]]):
+        """
+        Queues trade dicts for archiving. The list must not be mutated afterwards.
+        """
+        if trades:
+            self._queue.put(trades)
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Blocks until everything appended so far is on disk, or returns
+        early if the writer thread has stopped (nothing more will be written).
+        """
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        deadline = math.inf if timeout is None else time.monotonic() + timeout
+        while not done.is_set() and self._writer.is_alive():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            done.wait(min(remaining, 0.1))
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def read(
+        self,
+        participant_id: Union[str, Collection[str], None] = None,
+        instrument: Union[str, Collection[str], None] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Archived trades with start_ns <= event_time < end_ns, optionally for
+        some participants and instruments, ordered by event time.
+        """
+        participants = [participant_id] if isinstance(participant_id, str) else participant_id
+        instruments = {instrument} if isinstance(instrument, str) else set(instrument) if instrument else None
+        lo = start_ns if start_ns is not None else np.iinfo(np.int64).min
+        hi = end_ns if end_ns is not None else np.iinfo(np.int64).max
+
+        with self._catalog_lock:
+            segments = [
+                s for s in self.catalog
+                if s.max_time_ns >= lo and s.min_time_ns < hi and (instruments is None or s.instrument in instruments)
+            ]
+        frames = [f for f in (self._read_segment(s, participants, lo, hi) for s in segments) if f is not None]
+        if not frames:
+            return pd.DataFrame({name: pd.Series(dtype=object) for name in COLUMNS})
+        trades = pd.concat(frames, ignore_index=True)
+        return trades.sort_values("event_time", kind="stable", ignore_index=True)
+
+    def _read_segment(self, segment: Segment, participants: Optional[List[str]], lo: int, hi: int) -> Optional[pd.DataFrame]:
+        def load(name):
+            return np.load(os.path.join(segment.path, f"{name}.npy"), mmap_mode="r")
+
+        times = load("event_time")
+        if participants is None:
+            mask = (times >= lo) & (times < hi)
+            rows = np.flatnonzero(mask)
+        else:
+            dictionary = load("participant_id.dict")
+            codes = load("participant_id")
+            ranges = []
+            for pid in participants:
+                code = np.searchsorted(dictionary, pid)
+                if code == len(dictionary) or dictionary[code] != pid:
+                    continue
+                # Rows are sorted by (participant code, event time)
+                start = np.searchsorted(codes, code, side="left")
+                stop = np.searchsorted(codes, code, side="right")
+                start, stop = start + np.searchsorted(times[start:stop], [lo, hi])
+                ranges.append(np.arange(start, stop))
+            rows = np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+        if not len(rows):
+            return None
+
+        frame = {name: np.asarray(load(name)[rows]) for name in NUMERIC_COLUMNS}
+        for name in STRING_COLUMNS:
+            frame[name] = np.asarray(load(f"{name}.dict"))[load(name)[rows]].astype(object)
+        frame["instrument"] = segment.instrument
+        return pd.DataFrame(frame)[COLUMNS]
+
+    def _load_catalog(self):
+        for date_dir in sorted(os.listdir(self.directory)):
+            if not date_dir.startswith("date="):
+                continue
+            date_path = os.path.join(self.directory, date_dir)
+            for instrument_dir in sorted(os.listdir(date_path)):
+                instrument_path = os.path.join(date_path, instrument_dir)
+                for name in sorted(os.listdir(instrument_path)):
+                    meta_path = os.path.join(instrument_path, name, "meta.json")
+                    if name.startswith(".") or not os.path.exists(meta_path):
+                        continue  # an interrupted write
+                    with open(meta_path) as f:
+                        meta = json.load(f)
+                    self.catalog.append(Segment(
+                        path=os.path.join(instrument_path, name),
+                        date=date_dir[len("date="):],
+                        instrument=unquote(instrument_dir[len("instrument="):]),
+                        rows=meta["rows"],
+                        min_time_ns=meta["min_time_ns"],
+                        max_time_ns=meta["max_time_ns"]
+                    ))
+
+    def _run(self):
+        chunks: List[Dict[str, np.ndarray]] = []
+        pending = 0
+        deadline = time.monotonic() + self.flush_interval_s
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = False
+            if isinstance(item, list):
+                try:
+                    chunks.append(self._columns(item))
+                    pending += len(item)
+                except Exception as e:
+                    # A malformed batch is dropped and counted, like a failed write; the writer carries on
+                    self.failed += len(item)
+                    print(f"Trade archive dropped a batch it could not convert: {e!r}")
+                if pending < self.max_segment_rows:
+                    continue
+            if chunks:
+                self._write(chunks)
+                chunks, pending = [], 0
+            deadline = time.monotonic() + self.flush_interval_s
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
+
+    @staticmethod
+    def _columns(trades: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        # Done as batches arrive, so pending trades are held as arrays, not dicts
+        n = len(trades)
+        columns = {
+            name: np.fromiter((t[name] for t in trades), dtype=dtype, count=n)
+            for name, dtype in NUMERIC_COLUMNS.items()
+        }
+        for name in STRING_COLUMNS + ("instrument",):
+            columns[name] = np.array([t.get(name) or "" for t in trades], dtype=str)
+        return columns
+
+    def _write(self, chunks: List[Dict[str, np.ndarray]]):
+        try:
+            columns = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+            days = columns["event_time"] // DAY_NS
+            instruments, instrument_codes = np.unique(columns["instrument"], return_inverse=True)
+            for day in np.unique(days):
+                in_day = days == day
+                for code, instrument in enumerate(instruments):
+                    rows = np.flatnonzero(in_day & (instrument_codes == code))
+                    if len(rows):
+                        self._write_segment(int(day), str(instrument), {n: c[rows] for n, c in columns.items()})
+        except Exception as e:
+            self.failed += sum(len(c["event_time"]) for c in chunks)
+            print(f"Trade archive write failed: {e}")
+
+    def _write_segment(self, day: int, instrument: str, columns: Dict[str, np.ndarray]):
+        date = pd.Timestamp(day * DAY_NS, unit="ns").strftime("%Y-%m-%d")
+        partition = os.path.join(self.directory, f"date={date}", f"instrument={quote(instrument, safe='')}")
+        os.makedirs(partition, exist_ok=True)
+        times = columns["event_time"]
+        self._sequence += 1
+        name = f"{int(times.min()):020d}-{os.getpid()}-{self._sequence}"
+        tmp = os.path.join(partition, f".{name}")
+        os.makedirs(tmp)
+
+        participants, participant_codes = np.unique(columns["participant_id"], return_inverse=True)
+        order = np.lexsort((times, participant_codes))
+        for column in NUMERIC_COLUMNS:
+            np.save(os.path.join(tmp, f"{column}.npy"), columns[column][order])
+        for column in STRING_COLUMNS:
+            values, codes = np.unique(columns[column][order], return_inverse=True)
+            np.save(os.path.join(tmp, f"{column}.dict.npy"), values)
+            np.save(os.path.join(tmp, f"{column}.npy"), codes.astype(np.int32))
+        meta = {"rows": len(times), "min_time_ns": int(times.min()), "max_time_ns": int(times.max())}
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        path = os.path.join(partition, name)
+        os.rename(tmp, path)
+
+        with self._catalog_lock:
+            self.catalog.append(Segment(path, date, instrument, **meta))
+        self.rows_written += len(times)
+        self.segments_written += 1
+
+
+def create_trade_archive(config: Dict[str, Any]) -> Optional[TradeArchive]:
+    """
+    Builds the archive from the [archive] config section, or returns None when disabled.
+    """
+    if not config.get("enabled", False):
+        return None
+    return TradeArchive(
+        config.get("directory", "data/archive"),
+        flush_interval_s=config.get("flush_interval_seconds", 60.0),
+        max_segment_rows=config.get("max_segment_rows", 500_000)
+    )
@@ -1,8 +1,19 @@
+import math
+import time
 import uuid
+from bisect import bisect_left
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional
+from typing import Callable, Collection, List, Dict, Optional, Sequence, Tuple
+
+from ml.explainability import with_description
+
+# Findings that map to the same key update one case instead of opening new ones
+CaseKey = Tuple[str, str, int, str]  # participant_id, instrument, window start (ns), alert type
+
+PRIORITY_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2}
 
 class CaseStatus(str, Enum):
     OPEN = "OPEN"
@@ -28,12 +39,154 @@ class SurveillanceCase:
     events: List[CaseEvent] = field(default_factory=list)
     resolution: Optional[str] = None
     alerts: List[Dict] = field(default_factory=list)
+    window_start_ns: int = 0
+    alert_type: str = ""
+    revision: int = 1
+
+@dataclass
+class CaseUpdate:
+    """
+    What a finding changed: a newly opened case, or a delta on an existing
+    one (new or changed evidence, a higher score, an escalated priority).
+    """
+    case: SurveillanceCase
+    is_new: bool
+    new_alerts: List[Dict] = field(default_factory=list)
+
+def evidence_key(alert: Dict) -> Tuple:
+    # Rule alerts are identified by rule, explanations by the feature they describe
+    if "rule_id" in alert:
+        return ("rule", alert["rule_id"])
+    if "feature" in alert:
+        return ("feature", alert["feature"])
+    return ("alert", repr(alert))
 
 class CaseManager:
-    def __init__(self):
+    def __init__(
+        self,
+        coalesce_ttl_s: float = 300.0,
+        score_update_threshold: float = 0.01,
+        clock: Callable[[], float] = time.monotonic,
+        store=None
+    ):
+        """
+        store is an optional cases.case_store.CaseStore: cases it holds are
+        loaded now, and every change is handed to it (write-behind) after.
+        """
         self.cases: Dict[str, SurveillanceCase] = {}
+        # Query indexes: a case's position in _ordered is its sequence number,
+        # and the per-key lists hold sequence numbers, so all stay sorted by
+        # creation without any re-sorting
+        self._ordered: List[SurveillanceCase] = []
+        # created_at by sequence number, for bisecting date ranges
+        self._created: List[str] = []
+        self._by_participant: Dict[str, List[int]] = {}
+        self._by_instrument: Dict[str, List[int]] = {}
+        self.coalesce_ttl_s = coalesce_ttl_s
+        self.score_update_threshold = score_update_threshold
+        self.clock = clock
+        self.suppressed = 0
+        # key -> (case_id, last seen), least recently seen first
+        self._index: "OrderedDict[CaseKey, Tuple[str, float]]" = OrderedDict()
+        self.store = store
+        if store is not None:
+            now = clock()
+            for case in store.load_cases():
+                self._add(case)
+                # Cases still open keep absorbing their findings after a restart
+                if case.status != CaseStatus.CLOSED.value:
+                    key = (case.participant_id, case.instrument, case.window_start_ns, case.alert_type)
+                    self._index[key] = (case.case_id, now)
+
+    def record_finding(
+        self,
+        participant_id: str,
+        instrument: str,
+        window_start_ns: int,
+        alert_type: str,
+        alerts: List[Dict],
+        ml_score: float,
+        priority: str
+    ) -> Optional[CaseUpdate]:
+        """
+        Opens a case for a finding, or folds it into the case already open
+        for the same (participant, instrument, window, alert type).
+
+        The key stays live for coalesce_ttl_s after the last finding for it.
+        Returns None when nothing changed, or when the case was closed
+        within the TTL (the finding is suppressed rather than reopening it).
+        """
+        now = self.clock()
+        self._expire(now)
+        key = (participant_id, instrument, window_start_ns, alert_type)
+        entry = self._index.get(key)
+        if entry is None or entry[0] not in self.cases:
+            case = self.open_case(participant_id, instrument, alerts, ml_score, priority, window_start_ns, alert_type)
+            self._index[key] = (case.case_id, now)
+            return CaseUpdate(case=case, is_new=True, new_alerts=list(alerts))
+
+        case = self.cases[entry[0]]
+        self._index[key] = (case.case_id, now)
+        self._index.move_to_end(key)
+        if case.status == CaseStatus.CLOSED.value:
+            self.suppressed += 1
+            return None
+        return self.update_case(case, alerts, ml_score, priority)
+
+    def update_case(self, case: SurveillanceCase, alerts: List[Dict], ml_score: float, priority: str) -> Optional[CaseUpdate]:
+        """
+        Merges new evidence into a case. Scores and priorities only go up.
+        Returns the delta, or None if the finding added nothing.
+        """
+        current = {evidence_key(a): i for i, a in enumerate(case.alerts)}
+        new_alerts = []
+        for alert in alerts:
+            i = current.get(evidence_key(alert))
+            if i is None:
+                current[evidence_key(alert)] = len(case.alerts)
+                case.alerts.append(alert)
+                new_alerts.append(alert)
+            elif with_description(case.alerts[i]) != with_description(alert):
+                # Compared as displayed: baselines drift every cycle, below the precision shown
+                case.alerts[i] = alert
+                new_alerts.append(alert)
+
+        score_raised = ml_score >= case.ml_score + self.score_update_threshold
+        escalated = PRIORITY_RANK.get(priority, 0) > PRIORITY_RANK.get(case.priority, 0)
+        if not (new_alerts or score_raised or escalated):
+            return None
+
+        if score_raised:
+            case.ml_score = ml_score
+        if escalated:
+            case.priority = priority
+        case.revision += 1
+        case.events.append(CaseEvent(
+            timestamp=datetime.utcnow().isoformat(),
+            actor="SYSTEM",
+            action="CASE_UPDATED",
+            details={"revision": case.revision, "new_alert_count": len(new_alerts), "ml_score": case.ml_score}
+        ))
+        self._persist(case, case.events[-1:], new_alerts)
+        return CaseUpdate(case=case, is_new=False, new_alerts=new_alerts)
+
+    def _expire(self, now: float):
+        while self._index:
+            key, (_, last_seen) = next(iter(self._index.items()))
+            if now - last_seen < self.coalesce_ttl_s:
+                break
+            del self._index[key]
 
-    def open_case(self, participant_id: str, instrument: str, alerts: List[Dict], ml_score: float, priority: str) -> SurveillanceCase:
+    def open_case(
+        self,
+        participant_id: str,
+        instrument: str,
+        alerts: List[Dict],
+        ml_score: float,
+        priority: str,
+        window_start_ns: int = 0,
+        alert_type: str = ""
+    ) -> SurveillanceCase:
         case_id = str(uuid.uuid4())
         
         case = SurveillanceCase(
@@ -44,7 +197,9 @@ class CaseManager:
             priority=priority,
             ml_score=ml_score,
             created_at=datetime.utcnow().isoformat(),
-            alerts=alerts
+            alerts=alerts,
+            window_start_ns=window_start_ns,
+            alert_type=alert_type
         )
         
         case.events.append(CaseEvent(
@@ -54,9 +209,81 @@ class CaseManager:
             details={"alert_count": len(alerts), "trigger_score": ml_score}
         ))
         
-        self.cases[case_id] = case
+        self._add(case)
+        self._persist(case, case.events, alerts)
         return case
 
+    def get_case(self, case_id: str) -> Optional[SurveillanceCase]:
+        return self.cases.get(case_id)
+
+    def list_cases(
+        self,
+        participant_id: Optional[str] = None,
+        instrument: Optional[str] = None,
+        statuses: Optional[Collection[str]] = None,
+        priorities: Optional[Collection[str]] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        max_scan: int = 2000
+    ) -> Tuple[List[SurveillanceCase], Optional[int]]:
+        """
+        Cases matching every given filter, newest first.
+
+        Walks the participant or instrument index when one is given (the
+        shorter if both), and bisects it to the cursor and created_at range
+        (ISO 8601, after inclusive, before exclusive), so only that slice is
+        scanned for the mutable fields. At most max(max_scan, limit) cases
+        are looked at per call, so a filter that rarely matches returns a
+        short (or empty) page rather than walking every case. Returns the
+        page and the cursor for the next one, or None when there is nothing
+        left.
+        """
+        # Walk the smallest index that applies; its own key then needs no check
+        seqs: Sequence[int] = range(len(self._ordered))
+        by_participant = None if participant_id is None else self._by_participant.get(participant_id, [])
+        by_instrument = None if instrument is None else self._by_instrument.get(instrument, [])
+        if by_instrument is not None and (by_participant is None or len(by_instrument) < len(by_participant)):
+            seqs, instrument = by_instrument, None
+        elif by_participant is not None:
+            seqs, participant_id = by_participant, None
+
+        # Sequence numbers follow created_at, so a date bound is a sequence number bound
+        hi = len(seqs) if cursor is None else bisect_left(seqs, cursor)
+        if created_before is not None:
+            hi = min(hi, bisect_left(seqs, bisect_left(self._created, created_before)))
+        lo = 0 if created_after is None else bisect_left(seqs, bisect_left(self._created, created_after))
+
+        low = -math.inf if min_score is None else min_score
+        high = math.inf if max_score is None else max_score
+        page: List[SurveillanceCase] = []
+        ordered = self._ordered
+        i = hi - 1
+        stop = max(lo, hi - max(max_scan, limit))
+        while i >= stop and len(page) < limit:
+            case = ordered[seqs[i]]
+            i -= 1
+            if (
+                low <= case.ml_score <= high
+                and (not priorities or case.priority in priorities)
+                and (not statuses or case.status in statuses)
+                and (participant_id is None or case.participant_id == participant_id)
+                and (instrument is None or case.instrument == instrument)
+            ):
+                page.append(case)
+        return page, (seqs[i + 1] if i >= lo else None)
+
+    def _add(self, case: SurveillanceCase):
+        seq = len(self._ordered)
+        self.cases[case.case_id] = case
+        self._ordered.append(case)
+        self._created.append(case.created_at)
+        self._by_participant.setdefault(case.participant_id, []).append(seq)
+        self._by_instrument.setdefault(case.instrument, []).append(seq)
+
     def start_investigation(self, case_id: str, analyst_id: str):
         case = self.cases.get(case_id)
         if not case:
@@ -69,6 +296,7 @@ class CaseManager:
             action="INVESTIGATION_STARTED",
             details={}
         ))
+        self._persist(case, case.events[-1:], [])
 
     def close_case(self, case_id: str, analyst_id: str, resolution: str):
         case = self.cases.get(case_id)
@@ -83,3 +311,8 @@ class CaseManager:
             action="CASE_CLOSED",
             details={"resolution": resolution}
         ))
+        self._persist(case, case.events[-1:], [])
+
+    def _persist(self, case: SurveillanceCase, new_events: List[CaseEvent], new_alerts: List[Dict]):
+        if self.store is not None:
+            self.store.case_changed(case, new_events, new_alerts)
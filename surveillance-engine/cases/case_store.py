@@ -0,0 +1,246 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from cases.case_manager import CaseEvent, SurveillanceCase, evidence_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    case_id TEXT PRIMARY KEY,
+    participant_id TEXT NOT NULL,
+    instrument TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    ml_score REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    resolution TEXT,
+    window_start_ns INTEGER NOT NULL DEFAULT 0,
+    alert_type TEXT NOT NULL DEFAULT '',
+    revision INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_cases_participant ON cases (participant_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_instrument ON cases (instrument, created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_status ON cases (status, priority);
+
+CREATE TABLE IF NOT EXISTS case_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_id TEXT NOT NULL REFERENCES cases (case_id),
+    timestamp TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    action TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_case_events_case ON case_events (case_id, event_id);
+
+CREATE TABLE IF NOT EXISTS case_alerts (
+    case_id TEXT NOT NULL REFERENCES cases (case_id),
+    evidence_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    alert TEXT NOT NULL,
+    PRIMARY KEY (case_id, evidence_key)
+);
+"""
+
+UPSERT_CASE = """
+INSERT INTO cases (case_id, participant_id, instrument, status, priority, ml_score, created_at,
+                   resolution, window_start_ns, alert_type, revision)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (case_id) DO UPDATE SET
+    status = excluded.status, priority = excluded.priority, ml_score = excluded.ml_score,
+    resolution = excluded.resolution, revision = excluded.revision
+"""
+INSERT_EVENT = "INSERT INTO case_events (case_id, timestamp, actor, action, details) VALUES (?, ?, ?, ?, ?)"
+UPSERT_ALERT = """
+INSERT INTO case_alerts (case_id, evidence_key, position, alert) VALUES (?, ?, ?, ?)
+ON CONFLICT (case_id, evidence_key) DO UPDATE SET alert = excluded.alert
+"""
+
+
+@dataclass
+class CaseChange:
+    """
+    Everything one CaseManager mutation needs persisted, captured at the
+    time of the change: the case row's values plus the events and alerts
+    it added. Events and alert dicts are never mutated once created, so
+    they are referenced rather than copied.
+    """
+    row: Tuple
+    events: List[CaseEvent]
+    alerts: List[Tuple[int, Dict[str, Any]]]
+
+
+class CaseStore:
+    """
+    Storage backend interface for CaseManager. The base class keeps
+    nothing, which is the in-memory behaviour.
+    """
+
+    def load_cases(self) -> List[SurveillanceCase]:
+        return []
+
+    def case_changed(self, case: SurveillanceCase, new_events: List[CaseEvent], new_alerts: List[Dict]):
+        pass
+
+    def flush(self, timeout: Optional[float] = None):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteCaseStore(CaseStore):
+    """
+    SQLite (WAL) case storage with a write-behind queue.
+
+    case_changed() only snapshots the change and enqueues it, so callers on
+    the event loop never wait for the disk. A single writer thread drains
+    the queue and commits everything that arrived within commit_interval_s
+    (at most max_batch changes) as one transaction.
+    """
+
+    def __init__(self, path: str, commit_interval_s: float = 0.05, max_batch: int = 1000):
+        self.path = path
+        self.commit_interval_s = commit_interval_s
+        self.max_batch = max_batch
+        self.committed = 0
+        self.commits = 0
+        self.failed = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+        self._writer = threading.Thread(target=self._run, name="case-store-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def load_cases(self) -> List[SurveillanceCase]:
+        conn = self._connect()
+        try:
+            cases = {}
+            for row in conn.execute(
+                "SELECT case_id, participant_id, instrument, status, priority, ml_score, created_at, "
+                "resolution, window_start_ns, alert_type, revision FROM cases ORDER BY created_at"
+            ):
+                case = SurveillanceCase(
+                    case_id=row[0], participant_id=row[1], instrument=row[2], status=row[3],
+                    priority=row[4], ml_score=row[5], created_at=row[6], resolution=row[7],
+                    window_start_ns=row[8], alert_type=row[9], revision=row[10]
+                )
+                cases[case.case_id] = case
+            for case_id, timestamp, actor, action, details in conn.execute(
+                "SELECT case_id, timestamp, actor, action, details FROM case_events ORDER BY event_id"
+            ):
+                if case_id in cases:
+                    cases[case_id].events.append(CaseEvent(timestamp, actor, action, json.loads(details)))
+            for case_id, alert in conn.execute(
+                "SELECT case_id, alert FROM case_alerts ORDER BY case_id, position"
+            ):
+                if case_id in cases:
+                    cases[case_id].alerts.append(json.loads(alert))
+            return list(cases.values())
+        finally:
+            conn.close()
+
+    def case_changed(self, case: SurveillanceCase, new_events: List[CaseEvent], new_alerts: List[Dict]):
+        positions = {evidence_key(a): i for i, a in enumerate(case.alerts)}
+        self._queue.put(CaseChange(
+            row=(
+                case.case_id, case.participant_id, case.instrument, case.status, case.priority,
+                float(case.ml_score), case.created_at, case.resolution, int(case.window_start_ns),
+                case.alert_type, case.revision
+            ),
+            events=list(new_events),
+            alerts=[(positions.get(evidence_key(a), 0), a) for a in new_alerts]
+        ))
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Blocks until every change enqueued so far is committed.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last transactions on power loss, never corruption
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            running = True
+            while running:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.commit_interval_s
+                # A flush or stop marker commits what has been collected straight away
+                while len(batch) < self.max_batch and isinstance(batch[-1], CaseChange):
+                    remaining = deadline - time.monotonic()
+                    try:
+                        batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                running = self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Any]) -> bool:
+        changes = [item for item in batch if isinstance(item, CaseChange)]
+        if changes:
+            try:
+                with conn:
+                    conn.executemany(UPSERT_CASE, [c.row for c in changes])
+                    conn.executemany(INSERT_EVENT, [
+                        (c.row[0], e.timestamp, e.actor, e.action, json.dumps(e.details, default=str))
+                        for c in changes for e in c.events
+                    ])
+                    conn.executemany(UPSERT_ALERT, [
+                        (c.row[0], json.dumps(evidence_key(a), default=str), position, json.dumps(a, default=str))
+                        for c in changes for position, a in c.alerts
+                    ])
+                self.committed += len(changes)
+                self.commits += 1
+            except sqlite3.Error as e:
+                self.failed += len(changes)
+                print(f"Case store commit failed ({len(changes)} changes): {e}")
+
+        running = True
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                running = False
+        return running
+
+
+def create_case_store(config: Dict[str, Any]) -> CaseStore:
+    """
+    Builds the backend described by the [database] config section.
+    """
+    if not config.get("enabled", False):
+        return CaseStore()
+    db_type = config.get("type", "sqlite")
+    if db_type != "sqlite":
+        raise ValueError(f"Unsupported database type: {db_type}")
+    return SqliteCaseStore(
+        config.get("path", "surveillance.db"),
+        commit_interval_s=config.get("commit_interval_ms", 50) / 1000.0,
+        max_batch=config.get("commit_batch_size", 1000)
+    )
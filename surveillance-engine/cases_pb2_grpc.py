@@ -40,6 +40,16 @@ class CaseStreamStub(object):
                 request_serializer=trades__pb2.Empty.SerializeToString,
                 response_deserializer=cases__pb2.SurveillanceCase.FromString,
                 _registered_method=True)
+        self.ListCases = channel.unary_unary(
+                '/surveillance.CaseStream/ListCases',
+                request_serializer=cases__pb2.CaseQuery.SerializeToString,
+                response_deserializer=cases__pb2.CasePage.FromString,
+                _registered_method=True)
+        self.GetCase = channel.unary_unary(
+                '/surveillance.CaseStream/GetCase',
+                request_serializer=cases__pb2.CaseRequest.SerializeToString,
+                response_deserializer=cases__pb2.SurveillanceCase.FromString,
+                _registered_method=True)
 
 
 class CaseStreamServicer(object):
@@ -51,6 +61,18 @@ class CaseStreamServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ListCases(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCase(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CaseStreamServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -59,6 +81,16 @@ def add_CaseStreamServicer_to_server(servicer, server):
                     request_deserializer=trades__pb2.Empty.FromString,
                     response_serializer=cases__pb2.SurveillanceCase.SerializeToString,
             ),
+            'ListCases': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListCases,
+                    request_deserializer=cases__pb2.CaseQuery.FromString,
+                    response_serializer=cases__pb2.CasePage.SerializeToString,
+            ),
+            'GetCase': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCase,
+                    request_deserializer=cases__pb2.CaseRequest.FromString,
+                    response_serializer=cases__pb2.SurveillanceCase.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'surveillance.CaseStream', rpc_method_handlers)
@@ -96,3 +128,57 @@ class CaseStream(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ListCases(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/surveillance.CaseStream/ListCases',
+            cases__pb2.CaseQuery.SerializeToString,
+            cases__pb2.CasePage.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetCase(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/surveillance.CaseStream/GetCase',
+            cases__pb2.CaseRequest.SerializeToString,
+            cases__pb2.SurveillanceCase.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
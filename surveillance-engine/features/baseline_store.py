@@ -0,0 +1,297 @@
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from features.feature_stats import FeatureStats
+
+# Segment key for the market-wide baseline (instrument segments use the instrument name)
+MARKET = None
+
+
+@dataclass
+class StreamingStat:
+    """
+    Exponentially decayed Welford mean/variance. Each observation's weight
+    halves every half_life_s seconds; with no decay it matches pandas
+    mean() and std() exactly.
+    """
+    weight: float = 0.0
+    mean: float = 0.0
+    m2: float = 0.0
+    last_time: Optional[float] = None
+
+    def decay_to(self, now: Optional[float], half_life_s: Optional[float]):
+        if now is None:
+            return
+        if half_life_s and self.last_time is not None and now > self.last_time:
+            factor = 0.5 ** ((now - self.last_time) / half_life_s)
+            self.weight *= factor
+            self.m2 *= factor
+        if self.last_time is None or now > self.last_time:
+            self.last_time = now
+
+    def update(self, value: float, now: Optional[float] = None, half_life_s: Optional[float] = None):
+        self.decay_to(now, half_life_s)
+        self.weight += 1.0
+        delta = value - self.mean
+        self.mean += delta / self.weight
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "StreamingStat", half_life_s: Optional[float] = None):
+        """
+        Chan et al. parallel combination, after decaying both sides to the same time.
+        """
+        other = StreamingStat(other.weight, other.mean, other.m2, other.last_time)
+        latest = max((t for t in (self.last_time, other.last_time) if t is not None), default=None)
+        self.decay_to(latest, half_life_s)
+        other.decay_to(latest, half_life_s)
+
+        total = self.weight + other.weight
+        if total == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.weight / total
+        self.m2 += other.m2 + delta * delta * self.weight * other.weight / total
+        self.weight = total
+
+    @property
+    def std(self) -> float:
+        # Sample std (ddof=1); undefined below one effective observation
+        if self.weight <= 1.0:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.weight - 1.0))
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang & Liberty). Memory is bounded by
+    roughly 3k items regardless of stream length; rank error is O(1/k).
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._compute_max_size()
+        self._rng = random.Random(seed)
+
+    def update(self, value: float):
+        self.compactors[0].append(value)
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        self._size = sum(len(c) for c in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+
+    def quantile(self, q: float) -> float:
+        return weighted_quantile([self], q)
+
+    def weighted_items(self):
+        for level, items in enumerate(self.compactors):
+            weight = 1 << level
+            for value in items:
+                yield value, weight
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(math.ceil(self.k * (2.0 / 3.0) ** depth)), 2)
+
+    def _compute_max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = self._compute_max_size()
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            items = self.compactors[level]
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self._grow()
+            # Keep every other item (random offset) at double weight one level up
+            items.sort()
+            leftover = [items.pop()] if len(items) % 2 else []
+            self.compactors[level + 1].extend(items[self._rng.randint(0, 1)::2])
+            self.compactors[level] = leftover
+            self._size = sum(len(c) for c in self.compactors)
+            if self._size < self._max_size:
+                break
+
+
+@dataclass
+class FeatureBaseline:
+    """
+    Streaming baseline for one feature in one segment. Quantiles come from
+    per-epoch sketches; only the current and previous epoch are kept, which
+    gives the sketch the same forgetting horizon as the decayed moments.
+    """
+    stat: StreamingStat = field(default_factory=StreamingStat)
+    sketches: Dict[int, KLLSketch] = field(default_factory=dict)
+
+    def update(self, value: float, now: Optional[float], half_life_s: Optional[float], sketch_k: int):
+        self.stat.update(value, now, half_life_s)
+        epoch = _epoch(now, half_life_s)
+        sketch = self.sketches.get(epoch)
+        if sketch is None:
+            sketch = self.sketches[epoch] = KLLSketch(k=sketch_k)
+            self._expire(max(self.sketches))
+        sketch.update(value)
+
+    def merge(self, other: "FeatureBaseline", half_life_s: Optional[float], sketch_k: int):
+        self.stat.merge(other.stat, half_life_s)
+        for epoch, sketch in other.sketches.items():
+            mine = self.sketches.setdefault(epoch, KLLSketch(k=sketch_k))
+            mine.merge(sketch)
+        if self.sketches:
+            self._expire(max(self.sketches))
+
+    def to_stats(self) -> FeatureStats:
+        p95 = weighted_quantile(self.sketches.values(), 0.95)
+        return FeatureStats(mean=float(self.stat.mean), std=float(self.stat.std), p95=float(p95))
+
+    def _expire(self, current_epoch: int):
+        for epoch in [e for e in self.sketches if e < current_epoch - 1]:
+            del self.sketches[epoch]
+
+
+class BaselineStore:
+    """
+    Market baselines per feature, maintained from the stream of feature rows.
+
+    Keeps one FeatureBaseline per (segment, feature) where segment is the
+    market as a whole (MARKET) or a single instrument. Updates are O(1) per
+    feature row; stores built by different workers can be merged. Quantiles
+    are not: every snapshot sorts the sketches, so callers on the event loop
+    use shared_snapshot(), which recomputes at most every refresh_s.
+    """
+
+    def __init__(
+        self,
+        feature_cols: List[str],
+        half_life_s: Optional[float] = 3600.0,
+        sketch_k: int = 200,
+        min_segment_weight: float = 30.0,
+        refresh_s: float = 1.0
+    ):
+        self.feature_cols = list(feature_cols)
+        self.half_life_s = half_life_s
+        self.sketch_k = sketch_k
+        self.min_segment_weight = min_segment_weight
+        self.refresh_s = refresh_s
+        self.segments: Dict[Optional[str], Dict[str, FeatureBaseline]] = {}
+        self._snapshot: Dict[Optional[str], Dict[str, FeatureStats]] = {}
+        self._snapshot_at = -math.inf
+        self._snapshot_stale = True
+
+    def update(self, features_df: pd.DataFrame, now: Optional[float] = None):
+        """
+        Folds feature rows into the market-wide and per-instrument baselines.
+        now is the time (seconds) the rows are observed at, used for decay.
+        """
+        if features_df.empty:
+            return
+        self._snapshot_stale = True
+        cols = [c for c in self.feature_cols if c in features_df.columns]
+        instruments = features_df["instrument"] if "instrument" in features_df.columns else None
+        for col in cols:
+            values = features_df[col].to_numpy(dtype=float)
+            segment_keys = instruments.to_numpy() if instruments is not None else [None] * len(values)
+            market = self._baseline(MARKET, col)
+            for instrument, value in zip(segment_keys, values):
+                if math.isnan(value):
+                    continue
+                market.update(value, now, self.half_life_s, self.sketch_k)
+                if instrument is not None:
+                    self._baseline(instrument, col).update(value, now, self.half_life_s, self.sketch_k)
+
+    def baselines(self, instrument: Optional[str] = MARKET) -> Dict[str, FeatureStats]:
+        """
+        FeatureStats per feature for an instrument segment, falling back to
+        the market-wide baseline for features the segment has too little data for.
+        """
+        market = self.segments.get(MARKET, {})
+        segment = self.segments.get(instrument, {}) if instrument is not MARKET else market
+        stats = {}
+        for col in self.feature_cols:
+            baseline = segment.get(col)
+            if baseline is None or baseline.stat.weight < self.min_segment_weight:
+                baseline = market.get(col)
+            if baseline is not None and baseline.stat.weight > 0:
+                stats[col] = baseline.to_stats()
+        return stats
+
+    def snapshot(self, instruments: Iterable[str] = ()) -> Dict[Optional[str], Dict[str, FeatureStats]]:
+        """
+        Baselines for the market and the given instruments, as plain
+        FeatureStats dicts that can be shipped to another process.
+        """
+        snapshot = {MARKET: self.baselines(MARKET)}
+        for instrument in instruments:
+            snapshot[instrument] = self.baselines(instrument)
+        return snapshot
+
+    def shared_snapshot(self, now: float) -> Dict[Optional[str], Dict[str, FeatureStats]]:
+        """
+        snapshot() of every segment, recomputed only when the store changed
+        and refresh_s has passed since the last one (now is in seconds, on
+        the caller's clock). With decay half-lives of an hour that staleness
+        is immaterial. Returns a new top-level dict each call, so callers
+        may add segments to it.
+        """
+        # Refresh early while there is no market baseline yet, so callers stop using their fallback
+        due = now - self._snapshot_at >= self.refresh_s or not self._snapshot.get(MARKET)
+        if self._snapshot_stale and due:
+            self._snapshot = self.snapshot([segment for segment in self.segments if segment is not MARKET])
+            self._snapshot_at = now
+            self._snapshot_stale = False
+        return dict(self._snapshot)
+
+    def merge(self, other: "BaselineStore"):
+        self._snapshot_stale = True
+        for segment, baselines in other.segments.items():
+            for col, baseline in baselines.items():
+                self._baseline(segment, col).merge(baseline, self.half_life_s, self.sketch_k)
+
+    def _baseline(self, segment: Optional[str], col: str) -> FeatureBaseline:
+        baselines = self.segments.setdefault(segment, {})
+        baseline = baselines.get(col)
+        if baseline is None:
+            baseline = baselines[col] = FeatureBaseline()
+        return baseline
+
+
+def _epoch(now: Optional[float], half_life_s: Optional[float]) -> int:
+    if now is None or not half_life_s:
+        return 0
+    return int(now // half_life_s)
+
+
+def weighted_quantile(sketches: Iterable[KLLSketch], q: float) -> float:
+    """
+    Quantile over the union of several sketches, without compacting them.
+    """
+    weighted = sorted(item for sketch in sketches for item in sketch.weighted_items())
+    if not weighted:
+        return math.nan
+    target = q * sum(w for _, w in weighted)
+    cumulative = 0
+    for value, weight in weighted:
+        cumulative += weight
+        if cumulative >= target:
+            return value
+    return weighted[-1][0]
@@ -2,9 +2,77 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any
 
+FEATURE_COLUMNS = [
+    "num_trades",
+    "buy_sell_ratio",
+    "avg_quantity",
+    "max_quantity",
+    "venue_switch_count",
+    "cancel_ratio",
+    "quantity_percentile",
+    "self_trade_ratio",
+    "wash_volume_ratio",
+]
+
 def extract_features(trades_df: pd.DataFrame, window="5min") -> pd.DataFrame:
     """
     Aggregates raw trades into per-participant behavioral feature vectors.
+
+    Columnar implementation: side indicator columns are reduced with a single
+    named aggregation per (participant, instrument, window) group, then the
+    ratios and heuristics are derived on whole columns at once.
+    """
+    if trades_df.empty:
+        return pd.DataFrame()
+
+    event_time = trades_df["event_time"]
+    if not pd.api.types.is_datetime64_any_dtype(event_time):
+        event_time = pd.to_datetime(event_time)
+
+    side = trades_df["side"]
+    is_buy = side == "BUY"
+    is_sell = side == "SELL"
+
+    columns = pd.DataFrame({
+        "participant_id": trades_df["participant_id"],
+        "instrument": trades_df["instrument"],
+        "event_time": event_time,
+        "is_buy": is_buy,
+        "is_sell": is_sell,
+        "is_cancel": side == "CANCEL",
+        # Execution-only quantity; NaN rows are skipped by mean/std
+        "exec_qty": trades_df["quantity"].where(is_buy | is_sell),
+        "quantity": trades_df["quantity"],
+        "venue": trades_df["venue"],
+    })
+
+    raw = (
+        columns
+        .groupby([
+            "participant_id",
+            "instrument",
+            pd.Grouper(key="event_time", freq=window)
+        ], observed=True)
+        .agg(
+            buy_count=("is_buy", "sum"),
+            sell_count=("is_sell", "sum"),
+            cancel_count=("is_cancel", "sum"),
+            exec_qty_mean=("exec_qty", "mean"),
+            exec_qty_std=("exec_qty", "std"),
+            max_quantity=("quantity", "max"),
+            venue_count=("venue", "nunique"),
+        )
+    )
+
+    return derive_window_metrics(raw).reset_index()
+
+
+def extract_features_reference(trades_df: pd.DataFrame, window="5min") -> pd.DataFrame:
+    """
+    Original per-group implementation of extract_features.
+
+    Kept as the reference path for equivalence checks and benchmarks; it runs
+    a Python closure per group and is far slower on large inputs.
     """
     if trades_df.empty:
         return pd.DataFrame()
@@ -98,3 +166,47 @@ def extract_features(trades_df: pd.DataFrame, window="5min") -> pd.DataFrame:
 
     features = grouped.apply(calculate_metrics, include_groups=False)
     return features.reset_index()
+
+
+def derive_window_metrics(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turns per-window tallies into the same feature columns as extract_features.
+
+    Expects columns buy_count, sell_count, cancel_count, exec_qty_mean,
+    exec_qty_std, max_quantity and venue_count (one row per window).
+    """
+    buy = raw["buy_count"].to_numpy(dtype=float)
+    sell = raw["sell_count"].to_numpy(dtype=float)
+    cancels = raw["cancel_count"].to_numpy(dtype=float)
+    qty_mean = raw["exec_qty_mean"].to_numpy(dtype=float)
+    qty_std = raw["exec_qty_std"].to_numpy(dtype=float)
+
+    executions = buy + sell
+    total_events = cancels + executions
+    has_executions = executions > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cancel_ratio = np.where(total_events > 0, cancels / total_events, 0.0)
+        buy_sell_ratio = buy / np.maximum(sell, 1)
+        qty_cv = np.where(qty_mean > 0, qty_std / qty_mean, 0.0)
+
+    max_qty = raw["max_quantity"].to_numpy(dtype=float)
+    qty_percentile = np.where(max_qty > 5.0, 99.0, np.where(max_qty > 1.0, 80.0, 50.0))
+
+    # Same wash trading heuristics as calculate_metrics: balanced buy/sell
+    # flow plus uniform sizes (NaN std from a single execution is not uniform)
+    balanced = np.abs(buy_sell_ratio - 1.0) < 0.2
+    uniform_quantities = has_executions & (qty_cv < 0.1)
+
+    features = pd.DataFrame({
+        "num_trades": executions,
+        "buy_sell_ratio": buy_sell_ratio,
+        "avg_quantity": np.where(has_executions, qty_mean, 0.0),
+        "max_quantity": max_qty,
+        "venue_switch_count": raw["venue_count"].to_numpy(dtype=float),
+        "cancel_ratio": cancel_ratio,
+        "quantity_percentile": qty_percentile,
+        "self_trade_ratio": np.where(balanced & uniform_quantities, 0.5, 0.0),
+        "wash_volume_ratio": np.where(balanced & (executions >= 4), 0.5, 0.0),
+    }, index=raw.index)
+    return features[FEATURE_COLUMNS]
@@ -0,0 +1,177 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from features.feature_extraction import derive_window_metrics
+
+# (participant_id, instrument, window_start_ns)
+WindowKey = Tuple[str, str, int]
+
+
+@dataclass
+class WindowState:
+    """
+    Running tallies for one (participant, instrument, window) bucket.
+    """
+    buy_count: int = 0
+    sell_count: int = 0
+    cancel_count: int = 0
+    # Welford accumulators over BUY/SELL quantities
+    exec_qty_mean: float = 0.0
+    exec_qty_m2: float = 0.0
+    max_quantity: float = -math.inf
+    venues: Set[str] = field(default_factory=set)
+
+    def add(self, side: str, quantity: float, venue: str):
+        if side == "CANCEL":
+            self.cancel_count += 1
+        elif side == "BUY" or side == "SELL":
+            if side == "BUY":
+                self.buy_count += 1
+            else:
+                self.sell_count += 1
+            n = self.buy_count + self.sell_count
+            delta = quantity - self.exec_qty_mean
+            self.exec_qty_mean += delta / n
+            self.exec_qty_m2 += delta * (quantity - self.exec_qty_mean)
+
+        if quantity > self.max_quantity:
+            self.max_quantity = quantity
+        self.venues.add(venue)
+
+    @property
+    def exec_qty_std(self) -> float:
+        n = self.buy_count + self.sell_count
+        if n < 2:
+            return math.nan
+        return math.sqrt(max(self.exec_qty_m2, 0.0) / (n - 1))
+
+
+class WindowAggregator:
+    """
+    Incrementally maintains per-window feature tallies as trades arrive.
+
+    update() only touches the windows the new trades fall into and returns
+    their keys, so the cost of a batch scales with the batch, not with the
+    amount of history held. Windows older than the retention horizon
+    (relative to the newest event time seen) are evicted.
+    """
+
+    def __init__(self, window: str = "5min", retention: str = "15min"):
+        self.window_ns = pd.Timedelta(window).value
+        self.retention_ns = pd.Timedelta(retention).value
+        self.windows: Dict[WindowKey, WindowState] = {}
+        self.watermark_ns: Optional[int] = None
+        self.late_trades = 0
+        self._keys_by_start: Dict[int, Set[WindowKey]] = {}
+        self._closed_through = -math.inf
+        self._closed: Dict[WindowKey, WindowState] = {}
+
+    def __len__(self):
+        return len(self.windows)
+
+    def update(self, trades: Iterable[Dict[str, Any]]) -> Set[WindowKey]:
+        """
+        Folds a batch of trade dicts into the window state.
+        Returns the keys of the windows that changed.
+        """
+        changed = set()
+        for t in trades:
+            ts = int(t["event_time"])
+            start = ts - ts % self.window_ns
+            if self.watermark_ns is None or ts > self.watermark_ns:
+                self.watermark_ns = ts
+            if start + self.window_ns <= self._cutoff():
+                # Window already evicted; counting it again would emit a partial window
+                self.late_trades += 1
+                continue
+
+            key = (t["participant_id"], t["instrument"], start)
+            state = self.windows.get(key)
+            if state is None:
+                state = self.windows[key] = WindowState()
+                self._keys_by_start.setdefault(start, set()).add(key)
+            state.add(t["side"], float(t["quantity"]), t["venue"])
+            changed.add(key)
+
+        self._close()
+        evicted = self.evict()
+        return changed - evicted
+
+    def take_closed(self) -> pd.DataFrame:
+        """
+        Feature rows for the windows that have closed (ended at or before the
+        watermark) since the last call. Each window is handed out once, so
+        consumers such as the baseline store never count a window twice or
+        see it half-filled. Late trades into a window that has already been
+        handed out still update its live state but are not handed out again.
+        """
+        closed, self._closed = self._closed, {}
+        return self._frame(sorted(closed), closed)
+
+    def evict(self) -> Set[WindowKey]:
+        """
+        Drops windows that ended before the retention horizon.
+        """
+        cutoff = self._cutoff()
+        evicted = set()
+        for start in [s for s in self._keys_by_start if s + self.window_ns <= cutoff]:
+            keys = self._keys_by_start.pop(start)
+            for key in keys:
+                del self.windows[key]
+            evicted |= keys
+        return evicted
+
+    def features(self, keys: Optional[Iterable[WindowKey]] = None) -> pd.DataFrame:
+        """
+        Emits feature rows (same columns as extract_features) for the given
+        window keys, or for every live window when keys is None.
+        """
+        if keys is None:
+            keys = self.windows.keys()
+        keys = sorted(k for k in keys if k in self.windows)
+        return self._frame(keys, self.windows)
+
+    def _frame(self, keys: List[WindowKey], states: Dict[WindowKey, WindowState]) -> pd.DataFrame:
+        if not keys:
+            return pd.DataFrame()
+
+        rows: List[Dict[str, Any]] = []
+        for key in keys:
+            state = states[key]
+            rows.append({
+                "buy_count": state.buy_count,
+                "sell_count": state.sell_count,
+                "cancel_count": state.cancel_count,
+                "exec_qty_mean": state.exec_qty_mean,
+                "exec_qty_std": state.exec_qty_std,
+                "max_quantity": state.max_quantity,
+                "venue_count": len(state.venues),
+            })
+
+        features = derive_window_metrics(pd.DataFrame(rows))
+        features.insert(0, "participant_id", [k[0] for k in keys])
+        features.insert(1, "instrument", [k[1] for k in keys])
+        features.insert(2, "event_time", pd.to_datetime([k[2] for k in keys], unit="ns"))
+        return features
+
+    def _close(self):
+        # Runs before evict() so a window is captured even if the watermark
+        # jumps past the whole retention horizon in a single batch
+        if self.watermark_ns is None:
+            return
+        for start in sorted(self._keys_by_start):
+            if start <= self._closed_through:
+                continue
+            if start + self.window_ns > self.watermark_ns:
+                break
+            for key in self._keys_by_start[start]:
+                self._closed[key] = self.windows[key]
+            self._closed_through = start
+
+    def _cutoff(self) -> int:
+        if self.watermark_ns is None:
+            return -math.inf
+        return self.watermark_ns - self.retention_ns
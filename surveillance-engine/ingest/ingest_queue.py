@@ -0,0 +1,82 @@
+import asyncio
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"              # producer waits for space
+    REJECT = "reject"            # whole batch refused, producer should retry
+    DROP_OLDEST = "drop_oldest"  # oldest queued trades are discarded
+
+
+class BatchTooLarge(ValueError):
+    """
+    Raised under REJECT for a batch larger than the whole queue: it would
+    be refused on every retry, so the producer must split it instead.
+    """
+
+
+class IngestQueue:
+    """
+    Bounded trade queue between PublishTrades and the analysis worker.
+
+    Capacity is counted in trades, not batches. The consumer drains up to
+    max_batch_size trades per get_batch() call so a backlog is analysed in
+    larger micro-batches instead of one cycle per producer batch.
+    """
+
+    def __init__(self, maxsize: int = 5000, policy: str = OverflowPolicy.BLOCK, max_batch_size: int = 1000):
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.max_batch_size = max_batch_size
+        self.dropped = 0
+        self.rejected = 0
+        # Created on first use so the queue binds to the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+    async def put_batch(self, trades: List[Dict[str, Any]]) -> bool:
+        """
+        Enqueues a producer batch according to the overflow policy.
+        Returns False if the batch was rejected and may be retried, and
+        raises BatchTooLarge if it can never fit.
+        """
+        queue = self.queue
+        if self.policy == OverflowPolicy.REJECT:
+            if len(trades) > self.maxsize > 0:
+                self.rejected += len(trades)
+                raise BatchTooLarge(f"Batch of {len(trades)} trades exceeds the ingest queue size ({self.maxsize})")
+            if self.maxsize - queue.qsize() < len(trades):
+                self.rejected += len(trades)
+                return False
+            for trade in trades:
+                queue.put_nowait(trade)
+        elif self.policy == OverflowPolicy.DROP_OLDEST:
+            for trade in trades:
+                if queue.full():
+                    queue.get_nowait()
+                    self.dropped += 1
+                queue.put_nowait(trade)
+        else:
+            for trade in trades:
+                await queue.put(trade)
+        return True
+
+    async def get_batch(self) -> List[Dict[str, Any]]:
+        """
+        Waits for at least one trade, then drains whatever else is already
+        queued (up to max_batch_size) without waiting.
+        """
+        queue = self.queue
+        batch = [await queue.get()]
+        while len(batch) < self.max_batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
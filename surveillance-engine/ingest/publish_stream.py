@@ -0,0 +1,77 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable
+
+import trades_pb2
+from ingest.ingest_queue import BatchTooLarge
+
+
+async def serve_publish_stream(
+    requests: AsyncIterator[trades_pb2.TradeBatch],
+    accept: Callable[[trades_pb2.TradeBatch], Awaitable[bool]],
+    ack_every: int = 32
+) -> AsyncIterator[trades_pb2.Ack]:
+    """
+    Server side of PublishTradeStream.
+
+    Batches are accepted strictly in sequence order (go-back-N): a batch
+    the ingest queue refuses is nacked with the last accepted sequence, and
+    later batches already in flight are discarded until the producer
+    resends from there. Resent batches that were already accepted are
+    ignored. A batch with sequence 0 takes the next number.
+
+    Acks are cumulative and coalesced: one goes out once ack_every batches
+    are unacknowledged, or as soon as no further batch is buffered. Only
+    ack_every batches are read ahead, so a blocking ingest queue pushes
+    back on the producer through HTTP/2 flow control.
+
+    A batch that can never be accepted (BatchTooLarge) is nacked as not
+    retryable, and the stream ends there.
+    """
+    pending: asyncio.Queue = asyncio.Queue(maxsize=ack_every)
+
+    async def read_requests():
+        # The end marker is queued on completion or error, not on cancellation
+        try:
+            async for batch in requests:
+                await pending.put(batch)
+        except Exception:
+            await pending.put(None)
+            raise
+        await pending.put(None)
+
+    reader = asyncio.create_task(read_requests())
+    accepted = 0
+    unacked = 0
+    try:
+        while True:
+            batch = await pending.get()
+            if batch is None:
+                break
+            sequence = batch.sequence or accepted + 1
+            if sequence == accepted + 1:
+                try:
+                    queued = await accept(batch)
+                except BatchTooLarge as e:
+                    yield trades_pb2.Ack(success=False, retryable=False, sequence=accepted, message=str(e))
+                    return
+                if not queued:
+                    yield trades_pb2.Ack(
+                        success=False, retryable=True, sequence=accepted,
+                        message=f"Ingest queue full, resend from {accepted + 1}"
+                    )
+                    unacked = 0
+                    continue
+                accepted = sequence
+                unacked += 1
+            # sequence <= accepted: a resend already accepted; > accepted + 1:
+            # in flight behind a rejected batch. Neither is queued.
+
+            if unacked and (unacked >= ack_every or pending.empty()):
+                yield trades_pb2.Ack(success=True, message="Queued", sequence=accepted)
+                unacked = 0
+
+        if unacked:
+            yield trades_pb2.Ack(success=True, message="Queued", sequence=accepted)
+        await reader
+    finally:
+        reader.cancel()
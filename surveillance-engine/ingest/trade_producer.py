@@ -0,0 +1,158 @@
+import asyncio
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import grpc
+import trades_pb2
+import trades_pb2_grpc
+
+
+class PublishStreamError(Exception):
+    pass
+
+
+class StreamingTradePublisher:
+    """
+    Reference producer for PublishTradeStream.
+
+    publish() returns as soon as the trades are queued on the stream; it
+    only waits when max_in_flight trades are unacknowledged. Trades from
+    consecutive publish() calls are coalesced into one numbered TradeBatch
+    (up to max_batch_trades) that goes out on the next event-loop turn, so
+    a producer publishing one trade at a time still sends large messages.
+    A retryable nack rewinds the stream: every batch after the nacked
+    sequence is resent, in order, after retry_delay_s.
+
+    Usage:
+        async with StreamingTradePublisher(trades_pb2_grpc.TradeStreamStub(channel)) as publisher:
+            await publisher.publish(trades)
+    """
+
+    def __init__(
+        self,
+        stub: trades_pb2_grpc.TradeStreamStub,
+        max_in_flight: int = 10000,
+        max_batch_trades: int = 1000,
+        retry_delay_s: float = 0.05
+    ):
+        self.stub = stub
+        self.max_in_flight = max_in_flight
+        self.max_batch_trades = max_batch_trades
+        self.retry_delay_s = retry_delay_s
+        self.sequence = 0
+        self.acked_sequence = 0
+        self.in_flight = 0
+        self.resent = 0
+        self.error: Optional[Exception] = None
+        self._unacked: "OrderedDict[int, trades_pb2.TradeBatch]" = OrderedDict()
+        self._pending: List[trades_pb2.CanonicalTrade] = []
+        self._flush_scheduled = False
+        self._outbox: Optional[asyncio.Queue] = None
+        self._credit: Optional[asyncio.Condition] = None
+        self._call = None
+        self._ack_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "StreamingTradePublisher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        self._outbox = asyncio.Queue()
+        self._credit = asyncio.Condition()
+        self._call = self.stub.PublishTradeStream(self._requests())
+        self._ack_task = asyncio.create_task(self._read_acks())
+
+    async def publish(self, trades: Sequence[trades_pb2.CanonicalTrade]) -> int:
+        """
+        Queues trades on the stream and returns the sequence number of the
+        batch they will be sent in.
+        """
+        async with self._credit:
+            # More trades than the whole window still go out on their own
+            await self._credit.wait_for(
+                lambda: self.error is not None or self.in_flight == 0
+                or self.in_flight + len(trades) <= self.max_in_flight
+            )
+            if self.error is not None:
+                raise PublishStreamError(str(self.error)) from self.error
+            self._pending.extend(trades)
+            self.in_flight += len(trades)
+            sequence = self.sequence + 1
+            if len(self._pending) >= self.max_batch_trades:
+                self._send_pending()
+            elif not self._flush_scheduled:
+                self._flush_scheduled = True
+                asyncio.get_running_loop().call_soon(self._send_pending)
+        return sequence
+
+    async def flush(self):
+        """
+        Waits until every published trade has been acknowledged.
+        """
+        self._send_pending()
+        async with self._credit:
+            await self._credit.wait_for(lambda: self.error is not None or not self._unacked)
+            if self.error is not None:
+                raise PublishStreamError(str(self.error)) from self.error
+
+    async def close(self):
+        try:
+            if self._call is not None and self.error is None:
+                await self.flush()
+        finally:
+            if self._outbox is not None:
+                self._outbox.put_nowait(None)
+            if self._ack_task is not None:
+                await self._ack_task
+
+    def _send_pending(self):
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        self.sequence += 1
+        batch = trades_pb2.TradeBatch(trades=self._pending, sequence=self.sequence)
+        self._pending = []
+        self._unacked[self.sequence] = batch
+        self._outbox.put_nowait(batch)
+
+    async def _requests(self):
+        while True:
+            batch = await self._outbox.get()
+            if batch is None:
+                return
+            yield batch
+
+    async def _read_acks(self):
+        try:
+            async for ack in self._call:
+                await self._release(ack.sequence)
+                if ack.success:
+                    continue
+                if not ack.retryable:
+                    raise PublishStreamError(ack.message)
+                await asyncio.sleep(self.retry_delay_s)
+                resend: List[trades_pb2.TradeBatch] = list(self._unacked.values())
+                self.resent += len(resend)
+                for batch in resend:
+                    self._outbox.put_nowait(batch)
+        except (grpc.RpcError, PublishStreamError) as e:
+            await self._fail(e)
+        else:
+            if self._unacked:
+                await self._fail(PublishStreamError("Stream closed with unacknowledged batches"))
+
+    async def _release(self, sequence: int):
+        async with self._credit:
+            while self._unacked and next(iter(self._unacked)) <= sequence:
+                _, batch = self._unacked.popitem(last=False)
+                self.in_flight -= len(batch.trades)
+            self.acked_sequence = max(self.acked_sequence, sequence)
+            self._credit.notify_all()
+
+    async def _fail(self, error: Exception):
+        async with self._credit:
+            self.error = error
+            self._credit.notify_all()
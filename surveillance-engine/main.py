@@ -1,182 +1,605 @@
 import asyncio
+import json
+import signal
+import time
+
+from metrics.startup import StartupTimer
+
+# Started before the remaining imports, so "listening" includes them
+STARTUP = StartupTimer()
+
 import grpc
-import pandas as pd
 from concurrent import futures
 import trades_pb2
 import trades_pb2_grpc
+import cases_pb2
 import cases_pb2_grpc
 
-from cases.case_manager import CaseManager
-from features.feature_extraction import extract_features
-from features.feature_stats import compute_feature_baselines
-from rules.rule_engine import RuleEngine
-from ml.anomaly_detection import AnomalyDetector
-from ml.explainability import explain_anomaly
+# Only light modules are imported here, so the port is bound within
+# milliseconds; pandas, sklearn and everything built on them load in
+# load_engine(), in the background (see serve)
+from config import load_config, get_setting
+from ingest.ingest_queue import BatchTooLarge, IngestQueue
+from ingest.publish_stream import serve_publish_stream
+from metrics.http_server import MetricsServer
+from metrics.profiler import CycleProfiler
+from metrics.registry import SIZE_BUCKETS, MetricsRegistry
+from streaming.broadcaster import Broadcaster, SlowConsumerPolicy, SubscriberClosed
+from streaming.case_deltas import merge_case_messages
+
+CONFIG = load_config()
 
 # Global state
-TRADES_QUEUE = asyncio.Queue()
-TRADES_BUFFER = []
-BASELINES = {}
+TRADES_QUEUE = IngestQueue(
+    maxsize=get_setting(CONFIG, "trade_ingestion", "max_queue_size", 5000),
+    policy=get_setting(CONFIG, "trade_ingestion", "overflow_policy", "block"),
+    max_batch_size=get_setting(CONFIG, "trade_ingestion", "max_batch_size", 1000)
+)
+# Batches a PublishTradeStream producer may have unacknowledged before an ack is forced
+STREAM_ACK_EVERY = get_setting(CONFIG, "trade_ingestion", "stream_ack_every", 32)
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+
+# Alert type of cases opened by the ML score alone
+ML_ANOMALY = "ML_ANOMALY"
+ANOMALY_THRESHOLD = get_setting(CONFIG, "thresholds.anomaly", "ml_score_threshold", 0.8)
+
+# shards > 1: the pipeline runs in that many processes, partitioned by participant
+SHARDS = get_setting(CONFIG, "performance", "shards", 0)
+LIST_PAGE_SIZE = get_setting(CONFIG, "cases", "list_page_size", 100)
+LIST_MAX_PAGE_SIZE = get_setting(CONFIG, "cases", "list_max_page_size", 1000)
+# Cases looked at per ListCases call; rarely matching filters return short pages
+LIST_MAX_SCAN = get_setting(CONFIG, "cases", "list_max_scan", 2000)
+
+# Surveillance components, built by load_engine(). Until then trades are
+# acknowledged and wait in TRADES_QUEUE; case queries wait for engine_ready().
+BASELINE_STORE = None
+PIPELINE = None
+SHARDED_PIPELINE = None
+CASE_STORE = None
+CASE_MANAGER = None
+# Raw trades are kept on disk here when [archive] is enabled
+TRADE_ARCHIVE = None
+ARCHIVE_ENABLED = get_setting(CONFIG, "archive", "enabled", False)
+# Batches accepted before the archive was opened; handed to it once it is
+ARCHIVE_BACKLOG = []
+STAGE_EXECUTOR = None
+# Created on first use so the event binds to serve()'s loop, not the one current at import
+ENGINE_READY = None
+
+TRADE_BROADCASTER = Broadcaster(
+    "trades",
+    maxsize=get_setting(CONFIG, "grpc", "subscriber_queue_size", 10000),
+    policy=get_setting(CONFIG, "grpc", "slow_consumer_policy", "drop"),
+    key=lambda t: (t.participant_id, t.instrument)
+)
+# Trades per SubscribeBatches message, keeps messages well under the gRPC size limit
+SUBSCRIBE_BATCH_LIMIT = get_setting(CONFIG, "trade_ingestion", "max_batch_size", 1000)
+# Case messages are deltas, so none may be dropped or overwritten: a slow
+# subscriber gets them merged per case, or is disconnected
+CASE_BROADCASTER = Broadcaster(
+    "cases",
+    maxsize=get_setting(CONFIG, "grpc", "subscriber_queue_size", 10000),
+    policy=SlowConsumerPolicy.MERGE,
+    key=lambda c: c.case_id,
+    merge=merge_case_messages
+)
+
+# Prometheus metrics, served on [performance] metrics_port. Values the
+# engine already tracks are read by callbacks at scrape time.
+METRICS = MetricsRegistry()
+TRADES_INGESTED = METRICS.counter("surveillance_trades_ingested_total", "Trades accepted into the ingest queue")
+INGEST_BATCH_TRADES = METRICS.histogram(
+    "surveillance_ingest_batch_trades", "Trades per accepted producer batch", buckets=SIZE_BUCKETS
+)
+ANALYSIS_BATCH_TRADES = METRICS.histogram(
+    "surveillance_analysis_batch_trades", "Trades per micro-batch drained for analysis", buckets=SIZE_BUCKETS
+)
+STAGE_SECONDS = METRICS.histogram(
+    "surveillance_stage_duration_seconds",
+    "Time per pipeline stage and batch: features, baselines, fit, score, rules, explain, cases",
+    labels=("stage",)
+)
+CASES_OPENED = METRICS.counter("surveillance_cases_opened_total", "Cases opened", labels=("alert_type",))
+CASE_UPDATES = METRICS.counter("surveillance_case_updates_total", "Updates to open cases streamed to clients")
+METRICS.callback(
+    "surveillance_startup_seconds", "Seconds from startup to listening and ready, and per warm-up phase",
+    STARTUP.samples, labels=("phase",)
+)
+METRICS.callback("surveillance_ingest_queue_depth", "Trades waiting for analysis", lambda: TRADES_QUEUE.qsize())
+METRICS.callback(
+    "surveillance_ingest_lost_trades_total", "Trades refused or discarded by the ingest queue's overflow policy",
+    lambda: [(("rejected",), TRADES_QUEUE.rejected), (("dropped",), TRADES_QUEUE.dropped)],
+    kind="counter", labels=("reason",)
+)
+METRICS.callback(
+    "surveillance_subscribers", "Connected streaming clients",
+    lambda: [((b.name,), len(b.subscribers)) for b in (TRADE_BROADCASTER, CASE_BROADCASTER)],
+    labels=("stream",)
+)
+
+def subscriber_samples(field):
+    return lambda: [
+        ((b.name, m["subscriber"]), m[field])
+        for b in (TRADE_BROADCASTER, CASE_BROADCASTER) for m in b.metrics()
+    ]
+
+METRICS.callback(
+    "surveillance_subscriber_backlog", "Messages waiting in a client's mailbox",
+    subscriber_samples("depth"), labels=("stream", "subscriber")
+)
+METRICS.callback(
+    "surveillance_subscriber_lag_seconds", "Age of the oldest message waiting for a client",
+    subscriber_samples("lag_seconds"), labels=("stream", "subscriber")
+)
+METRICS.callback(
+    "surveillance_subscriber_dropped_total", "Messages a client lost to the slow consumer policy",
+    subscriber_samples("dropped"), kind="counter", labels=("stream", "subscriber")
+)
+METRICS_SERVER = MetricsServer(
+    METRICS,
+    host=get_setting(CONFIG, "performance", "metrics_host", "0.0.0.0"),
+    port=get_setting(CONFIG, "performance", "metrics_port", 9090),
+    read_timeout_s=get_setting(CONFIG, "performance", "metrics_read_timeout_seconds", 5.0)
+) if get_setting(CONFIG, "performance", "enable_metrics", True) else None
+
+# Profiles every Nth surveillance cycle; toggled with SIGUSR1, or with
+# POST /profiling?enabled=1|0 when profiling_http_control is set
+PROFILER = CycleProfiler.from_config(CONFIG)
+if METRICS_SERVER is not None:
+    METRICS_SERVER.route("/profiling", PROFILER.status_http)
+    if get_setting(CONFIG, "performance", "profiling_http_control", False):
+        METRICS_SERVER.route("/profiling", PROFILER.handle_http, methods=("POST",))
+
+def engine_ready() -> asyncio.Event:
+    """
+    Set once load_engine() has finished and the analysis workers are running.
+    """
+    global ENGINE_READY
+    if ENGINE_READY is None:
+        ENGINE_READY = asyncio.Event()
+    return ENGINE_READY
+
+def load_engine():
+    """
+    Imports the analysis stack and builds the surveillance components.
+    serve() runs this in a thread once the port is bound; tools that drive
+    main directly (benchmarks) call it after importing main.
+    Does nothing if the engine is already loaded.
+    """
+    global BASELINE_STORE, PIPELINE, SHARDED_PIPELINE, CASE_STORE, CASE_MANAGER, TRADE_ARCHIVE, STAGE_EXECUTOR
+    if STAGE_EXECUTOR is not None:
+        return
+    with STARTUP.phase("imports"):
+        from archive.trade_archive import create_trade_archive
+        from cases.case_manager import CaseManager
+        from cases.case_store import create_case_store
+        from features.baseline_store import BaselineStore
+        from pipeline.sharded_pipeline import ShardedPipeline
+        from pipeline.stage_executor import StageExecutor
+        from pipeline.surveillance_pipeline import SurveillancePipeline
+
+    with STARTUP.phase("pipeline"):
+        baseline_store = BaselineStore(
+            FEATURE_COLS,
+            half_life_s=get_setting(CONFIG, "baselines", "half_life_seconds", 3600.0),
+            sketch_k=get_setting(CONFIG, "baselines", "sketch_k", 200),
+            min_segment_weight=get_setting(CONFIG, "baselines", "min_segment_samples", 30),
+            refresh_s=get_setting(CONFIG, "baselines", "refresh_seconds", 1.0)
+        )
+        pipeline = SurveillancePipeline.from_config(CONFIG, FEATURE_COLS) if SHARDS <= 1 else None
+        sharded_pipeline = ShardedPipeline(
+            SHARDS, CONFIG, FEATURE_COLS,
+            # Shards score against, and merge their closed windows into, the market-wide baselines
+            baseline_store=baseline_store,
+            max_pending=get_setting(CONFIG, "performance", "shard_max_pending_trades", 20000)
+        ) if SHARDS > 1 else None
+        stage_executor = StageExecutor(
+            mode=get_setting(CONFIG, "performance", "execution_mode", "inline"),
+            workers=get_setting(CONFIG, "performance", "async_workers", 4)
+        )
+
+    with STARTUP.phase("cases"):
+        case_store = create_case_store(CONFIG.get("database", {}))
+        case_manager = CaseManager(
+            coalesce_ttl_s=get_setting(CONFIG, "cases", "coalesce_ttl_seconds", 300.0),
+            score_update_threshold=get_setting(CONFIG, "cases", "score_update_threshold", 0.01),
+            store=case_store
+        )
+        trade_archive = create_trade_archive(CONFIG.get("archive", {}))
+
+    METRICS.callback("surveillance_cases", "Cases held by the case manager", lambda: len(CASE_MANAGER.cases))
+    METRICS.callback(
+        "surveillance_case_store_backlog", "Case changes waiting for the database writer",
+        lambda: getattr(CASE_STORE, "backlog", 0)
+    )
+    if trade_archive is not None:
+        METRICS.callback("surveillance_archive_backlog", "Trade batches waiting for the archive writer",
+                         lambda: TRADE_ARCHIVE.backlog)
+        METRICS.callback("surveillance_archive_trades_written_total", "Trades written to the archive",
+                         lambda: TRADE_ARCHIVE.rows_written, kind="counter")
+    if pipeline is not None:
+        pipeline.trainer.on_fit = STAGE_SECONDS.labels("fit").observe
+        METRICS.callback("surveillance_model_version", "Version of the scoring model", lambda: PIPELINE.detector.model_version)
+        METRICS.callback("surveillance_model_last_fit_timestamp_seconds", "Unix time the scoring model was fitted",
+                         lambda: PIPELINE.detector.last_fit_timestamp)
+        METRICS.callback("surveillance_rules_version", "Reloads that changed the active rule set",
+                         lambda: PIPELINE.rule_engine.version)
+        if pipeline.rule_watcher is not None:
+            METRICS.callback("surveillance_rule_reload_failures_total", "Rule reloads rejected as invalid",
+                             lambda: PIPELINE.rule_watcher.failures, kind="counter")
+    if sharded_pipeline is not None:
+        METRICS.callback(
+            "surveillance_shard_pending_trades", "Trades queued on or being analysed by the shards",
+            lambda: SHARDED_PIPELINE.pending
+        )
+        METRICS.callback(
+            "surveillance_shard_busy_seconds_total", "CPU seconds each shard spent analysing",
+            lambda: [((str(i),), s) for i, s in enumerate(SHARDED_PIPELINE.busy_s)], kind="counter", labels=("shard",)
+        )
+        METRICS.callback(
+            "surveillance_shard_calls_total", "Analysis calls dispatched to each shard",
+            lambda: [((str(i),), n) for i, n in enumerate(SHARDED_PIPELINE.calls)], kind="counter", labels=("shard",)
+        )
+        METRICS.callback(
+            "surveillance_model_version", "Version of each shard's scoring model",
+            lambda: [((str(i),), v) for i, v in enumerate(SHARDED_PIPELINE.model_versions)], labels=("shard",)
+        )
+        METRICS.callback(
+            "surveillance_model_last_fit_timestamp_seconds", "Unix time each shard's scoring model was fitted",
+            lambda: [((str(i),), t) for i, t in enumerate(SHARDED_PIPELINE.last_fit_timestamps) if t is not None],
+            labels=("shard",)
+        )
+
+    BASELINE_STORE, PIPELINE, SHARDED_PIPELINE = baseline_store, pipeline, sharded_pipeline
+    CASE_STORE, CASE_MANAGER, TRADE_ARCHIVE = case_store, case_manager, trade_archive
+    # Set last: accept_batch and the metrics callbacks key off it
+    STAGE_EXECUTOR = stage_executor
+
+def observe_stages(stage_seconds):
+    for stage, seconds in stage_seconds:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+def trade_dicts(batch):
+    # Convert Proto to Dict
+    return [
+        {
+            "event_time": t.event_time_ns,
+            "venue": t.venue,
+            "instrument": t.instrument,
+            "side": t.side,
+            "price": t.price,
+            "quantity": t.quantity,
+            "participant_id": t.participant_id,
+            "order_id": t.order_id,
+            "origin": t.origin
+        }
+        for t in batch.trades
+    ]
 
-# Initialize surveillance components
-RULE_ENGINE = RuleEngine(rules_dir="rules")
-ANOMALY_DETECTOR = AnomalyDetector()
-CASE_MANAGER = CaseManager()
+async def accept_batch(batch):
+    """
+    Queues a TradeBatch for analysis and fans it out to subscribers.
+    Returns False if the ingest queue refused it, and raises BatchTooLarge
+    if it never can.
+    """
+    trades = trade_dicts(batch)
+    if not await TRADES_QUEUE.put_batch(trades):
+        return False
+    if TRADE_ARCHIVE is not None:
+        TRADE_ARCHIVE.append(trades)
+    elif ARCHIVE_ENABLED:
+        ARCHIVE_BACKLOG.append(trades)
+    TRADES_INGESTED.inc(len(batch.trades))
+    INGEST_BATCH_TRADES.observe(len(batch.trades))
+    # Subscribers get the request's own protos, one offer per subscriber per batch
+    TRADE_BROADCASTER.publish(list(batch.trades))
+    return True
 
 class TradeStreamServicer(trades_pb2_grpc.TradeStreamServicer):
     async def PublishTrades(self, request, context):
-        global TRADES_QUEUE
-        
-        # Convert Proto to Dict
-        new_trades = []
-        for t in request.trades:
-            trade_dict = {
-                "event_time": t.event_time_ns,
-                "venue": t.venue,
-                "instrument": t.instrument,
-                "side": t.side,
-                "price": t.price,
-                "quantity": t.quantity,
-                "participant_id": t.participant_id,
-                "order_id": t.order_id,
-                "origin": t.origin
-            }
-            new_trades.append(trade_dict)
-            
-        print(f"Received batch of {len(new_trades)} trades")
-        
-        # Schedule analysis
-        await run_surveillance_cycle(new_trades)
-        
-        return trades_pb2.Ack(success=True, message="Processed")
+        print(f"Received batch of {len(request.trades)} trades")
+
+        # Hand off to the analysis worker; the Ack no longer waits for the cycle
+        try:
+            queued = await accept_batch(request)
+        except BatchTooLarge as e:
+            return trades_pb2.Ack(success=False, retryable=False, message=f"{e}; split it into smaller batches")
+        if not queued:
+            return trades_pb2.Ack(success=False, retryable=True, message="Ingest queue full, retry later")
+        return trades_pb2.Ack(success=True, message="Queued")
+
+    async def PublishTradeStream(self, request_iterator, context):
+        async for ack in serve_publish_stream(request_iterator, accept_batch, ack_every=STREAM_ACK_EVERY):
+            yield ack
 
     async def Subscribe(self, request, context):
-        # streaming response
-        # In a real app, we'd use a dedicated queue per subscriber.
-        # For this demo, we'll just stream what comes into the global analysis loop via a simplified bus or just echo for now.
-        # Let's implement a listener pattern.
-        queue = asyncio.Queue()
-        BROADCAST_CHANNELS.add(queue)
+        # Each client gets a bounded mailbox; see [grpc] slow_consumer_policy
+        subscriber = TRADE_BROADCASTER.subscribe(context.peer())
+        try:
+            while True:
+                for trade in await subscriber.drain():
+                    yield trade
+        except SubscriberClosed:
+            print(f"Disconnected slow subscriber: {subscriber.metrics()}")
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Subscriber fell too far behind")
+        finally:
+            TRADE_BROADCASTER.unsubscribe(subscriber)
+
+    async def SubscribeBatches(self, request, context):
+        subscriber = TRADE_BROADCASTER.subscribe(context.peer())
         try:
             while True:
-                trade = await queue.get()
-                yield trade
+                trades = await subscriber.drain()
+                for i in range(0, len(trades), SUBSCRIBE_BATCH_LIMIT):
+                    yield trades_pb2.TradeBatch(trades=trades[i:i + SUBSCRIBE_BATCH_LIMIT])
+        except SubscriberClosed:
+            print(f"Disconnected slow subscriber: {subscriber.metrics()}")
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Subscriber fell too far behind")
         finally:
-            BROADCAST_CHANNELS.remove(queue)
+            TRADE_BROADCASTER.unsubscribe(subscriber)
+
+async def analysis_worker():
+    """
+    Consumes the ingest queue and runs one surveillance cycle per drained micro-batch.
+    """
+    while True:
+        new_trades = await TRADES_QUEUE.get_batch()
+        ANALYSIS_BATCH_TRADES.observe(len(new_trades))
+        try:
+            await run_surveillance_cycle(new_trades)
+        except Exception as e:
+            print(f"Surveillance cycle failed: {e}")
+        # get_batch() does not suspend while trades are queued; yield so
+        # pending PublishTrades/Subscribe calls are served between cycles
+        await asyncio.sleep(0)
+
+async def shard_feeder():
+    """
+    Sharded mode: hands drained micro-batches to the shards. submit() waits
+    while the shards are max_pending trades behind, so the ingest queue's
+    overflow policy still applies.
+    """
+    while True:
+        new_trades = await TRADES_QUEUE.get_batch()
+        ANALYSIS_BATCH_TRADES.observe(len(new_trades))
+        await SHARDED_PIPELINE.submit(new_trades)
+        await asyncio.sleep(0)
+
+async def shard_result_worker():
+    """
+    Sharded mode: turns each shard's findings into cases as it finishes.
+    """
+    while True:
+        result = await SHARDED_PIPELINE.next_result()
+        if result.error is not None:
+            print(f"Shard {result.shard} failed on {result.trades} trades: {result.error!r}")
+            continue
+        observe_stages(result.stage_seconds)
+        try:
+            with PROFILER.profile():
+                publish_findings(result.findings)
+        except Exception as e:
+            print(f"Shard {result.shard} results failed: {e}")
+
+async def analyse_local(new_trades):
+    # 1. Feature Extraction (incremental: only the windows this batch touched)
+    with STAGE_SECONDS.labels("features").time():
+        features = PIPELINE.ingest(new_trades)
+    if features is None:
+        return []
+
+    # 2. Fold closed windows into the streaming baselines (decayed by event time)
+    with STAGE_SECONDS.labels("baselines").time():
+        BASELINE_STORE.update(PIPELINE.take_closed(), now=PIPELINE.watermark_s)
+        # Refreshed by event time, so a replay sees the same baselines on every run
+        baselines = PIPELINE.fill_baselines(BASELINE_STORE.shared_snapshot(PIPELINE.watermark_s or 0.0))
 
-BROADCAST_CHANNELS = set()
+    # 3. Model retraining happens in the background; scoring uses the current version
+    PIPELINE.maybe_retrain(len(features))
+
+    # 4. Scoring, rules and explanations (inline or in the process pool)
+    timings = {}
+    findings = await STAGE_EXECUTOR.analyse(
+        features,
+        PIPELINE.detector.current,
+        PIPELINE.rule_engine,
+        baselines,
+        anomaly_threshold=ANOMALY_THRESHOLD,
+        timings=timings
+    )
+    observe_stages(timings.items())
+    return findings
 
 async def run_surveillance_cycle(new_trades):
-    global BASELINES, TRADES_BUFFER
-    
-    # Broadcast to UI subscribers
-    import trades_pb2
-    for t_dict in new_trades:
-        # Re-wrap in Proto for the stream
-        t_proto = trades_pb2.CanonicalTrade(
-            event_time_ns=int(t_dict.get("event_time", 0)),
-            venue=t_dict.get("venue"),
-            instrument=t_dict.get("instrument"),
-            side=t_dict.get("side"),
-            price=t_dict.get("price"),
-            quantity=t_dict.get("quantity"),
-            participant_id=t_dict.get("participant_id"),
-            origin=t_dict.get("origin"),
-            order_id=t_dict.get("order_id"),
-            execution_id=t_dict.get("execution_id", "")
-        )
-        for q in list(BROADCAST_CHANNELS):
-            await q.put(t_proto)
-
-    # Accumulate trades for stateful analysis
-    TRADES_BUFFER.extend(new_trades)
-    # Prune buffer (simplistic sliding window)
-    if len(TRADES_BUFFER) > 1000:
-        TRADES_BUFFER = TRADES_BUFFER[-1000:]
-        
-    # Minimum window size check (optional)
-    if len(TRADES_BUFFER) < 1:
-        return
+    with PROFILER.profile():
+        publish_findings(await analyse_local(new_trades))
 
-    df = pd.DataFrame(TRADES_BUFFER)
-    
-    # 1. Feature Extraction
-    features = extract_features(df)
-    if features.empty:
-        return
+def publish_findings(findings):
+    """
+    Cases & fan-out (event loop): one case per (participant, instrument, window, alert type).
+    """
+    start = time.perf_counter()
+    case_protos = []
+    for finding in findings:
+        pid = finding.participant_id
+        priority = "HIGH" if (finding.alerts and finding.is_anomaly) else "MEDIUM"
+        alerts_by_type = {}
+        for alert in finding.alerts:
+            alerts_by_type.setdefault(alert["type"], []).append(alert)
+        if not alerts_by_type:
+            alerts_by_type[ML_ANOMALY] = []
 
-    # 2. Update Baselines (rolling strategy would be better, here we accumulate or just use batch)
-    feature_cols = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
-    # In reality we need historical context. For this demo we just calc stats on the batch.
-    current_stats = compute_feature_baselines(features, feature_cols)
-    BASELINES.update(current_stats) 
-    
-    # 3. ML Scoring
-    ANOMALY_DETECTOR.fit(features, feature_cols)
-    scores = ANOMALY_DETECTOR.score(features)
-    features["ml_score"] = scores
-    
-    # 4. Rules & Cases
-    for i, row in features.iterrows():
-        metrics = row.to_dict()
-        alerts = RULE_ENGINE.evaluate(metrics)
-        is_anomaly = row["ml_score"] > 0.8
-        
-        if alerts or is_anomaly:
-            pid = row["participant_id"]
-            instrument = row["instrument"]
-            explanations = explain_anomaly(metrics, BASELINES)
-            
-            priority = "HIGH" if (alerts and is_anomaly) else "MEDIUM"
-            case = CASE_MANAGER.open_case(
+        for alert_type, alerts in alerts_by_type.items():
+            update = CASE_MANAGER.record_finding(
                 participant_id=pid,
-                instrument=instrument,
-                alerts=alerts + explanations,
-                ml_score=float(row["ml_score"]),
+                instrument=finding.instrument,
+                window_start_ns=finding.window_start_ns,
+                alert_type=alert_type,
+                alerts=alerts + finding.explanations,
+                ml_score=finding.ml_score,
                 priority=priority
             )
-            print(f"OPENED CASE {case.case_id} for {pid}")
-            
-            # Broadcast Case
-            import cases_pb2
-            
-            # Create Case Proto
-            case_proto = cases_pb2.SurveillanceCase(
-                case_id=case.case_id,
-                participant_id=case.participant_id,
-                instrument=case.instrument,
-                status=case.status,
-                priority=case.priority,
-                ml_score=case.ml_score
+            if update is None:
+                continue
+            case = update.case
+            if update.is_new:
+                CASES_OPENED.labels(alert_type).inc()
+                print(f"OPENED CASE {case.case_id} for {pid}")
+            else:
+                CASE_UPDATES.inc()
+                print(f"UPDATED CASE {case.case_id} for {pid} (revision {case.revision})")
+            case_protos.append(case_update_proto(update))
+
+    CASE_BROADCASTER.publish(case_protos)
+    STAGE_SECONDS.labels("cases").observe(time.perf_counter() - start)
+
+def case_proto(case, alerts, is_update=False, events=()):
+    # Imported here: the module pulls in pandas, which main leaves to load_engine()
+    from ml.explainability import with_description
+    return cases_pb2.SurveillanceCase(
+        case_id=case.case_id,
+        participant_id=case.participant_id,
+        instrument=case.instrument,
+        status=case.status,
+        priority=case.priority,
+        ml_score=case.ml_score,
+        events=[
+            cases_pb2.CaseEvent(
+                timestamp=e.timestamp, actor=e.actor, action=e.action,
+                details=json.dumps(e.details, default=str)
             )
-            # TODO: Add alerts once proto is properly regenerated
-            # case_proto.alerts.extend(case.alerts)
-            
-            for q in list(CASE_CHANNELS):
-                await q.put(case_proto)
+            for e in events
+        ],
+        alerts=[json.dumps(with_description(alert), default=str) for alert in alerts],
+        revision=case.revision,
+        is_update=is_update,
+        window_start_ns=case.window_start_ns,
+        alert_type=case.alert_type,
+        created_at=case.created_at
+    )
 
-CASE_CHANNELS = set()
+def case_update_proto(update):
+    """
+    Wire form of a CaseUpdate. Updates are deltas: same case_id, a higher
+    revision, and only the evidence that is new or changed.
+    """
+    return case_proto(update.case, update.new_alerts, is_update=not update.is_new)
 
 class CaseStreamServicer(cases_pb2_grpc.CaseStreamServicer):
     async def StreamCases(self, request, context):
-        queue = asyncio.Queue()
-        CASE_CHANNELS.add(queue)
+        subscriber = CASE_BROADCASTER.subscribe(context.peer())
         try:
             while True:
-                case = await queue.get()
-                yield case
+                for case in await subscriber.drain():
+                    yield case
+        except SubscriberClosed:
+            print(f"Disconnected slow case subscriber: {subscriber.metrics()}")
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Subscriber fell too far behind")
         finally:
-            CASE_CHANNELS.remove(queue)
+            CASE_BROADCASTER.unsubscribe(subscriber)
+
+    async def ListCases(self, request, context):
+        await engine_ready().wait()
+        cursor = None
+        if request.page_token:
+            try:
+                cursor = int(request.page_token)
+            except ValueError:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid page_token")
+        page_size = min(request.page_size or LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE)
+        cases, next_cursor = CASE_MANAGER.list_cases(
+            participant_id=request.participant_id or None,
+            instrument=request.instrument or None,
+            statuses=set(request.statuses),
+            priorities=set(request.priorities),
+            min_score=request.min_score if request.HasField("min_score") else None,
+            max_score=request.max_score if request.HasField("max_score") else None,
+            created_after=request.created_after or None,
+            created_before=request.created_before or None,
+            limit=max(page_size, 1),
+            cursor=cursor,
+            max_scan=LIST_MAX_SCAN
+        )
+        return cases_pb2.CasePage(
+            cases=[case_proto(case, case.alerts, events=case.events) for case in cases],
+            next_page_token="" if next_cursor is None else str(next_cursor)
+        )
+
+    async def GetCase(self, request, context):
+        await engine_ready().wait()
+        case = CASE_MANAGER.get_case(request.case_id)
+        if case is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Case {request.case_id} not found")
+        return case_proto(case, case.alerts, events=case.events)
+
+async def start_engine(server, workers):
+    """
+    Loads the engine in a thread while the server already accepts trades,
+    then archives what arrived meanwhile and starts the analysis workers.
+    """
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, load_engine)
+    except Exception as e:
+        print(f"Engine failed to load: {e!r}")
+        await server.stop(None)
+        raise
+    if TRADE_ARCHIVE is not None:
+        for trades in ARCHIVE_BACKLOG:
+            TRADE_ARCHIVE.append(trades)
+    ARCHIVE_BACKLOG.clear()
+    if SHARDED_PIPELINE is not None:
+        await SHARDED_PIPELINE.start()
+        print(f"Analysis sharded over {SHARDS} processes")
+        workers += [asyncio.create_task(shard_feeder()), asyncio.create_task(shard_result_worker())]
+    else:
+        await STAGE_EXECUTOR.start()
+        workers.append(asyncio.create_task(analysis_worker()))
+    engine_ready().set()
+    STARTUP.mark("ready")
+    print(f"Engine ready: {STARTUP.summary()}")
 
 async def serve():
     server = grpc.aio.server()
     trades_pb2_grpc.add_TradeStreamServicer_to_server(TradeStreamServicer(), server)
     cases_pb2_grpc.add_CaseStreamServicer_to_server(CaseStreamServicer(), server)
     server.add_insecure_port('[::]:50051')
+    await server.start()
+    STARTUP.mark("listening")
     print("Surveillance Engine running on port 50051...")
     print("Audit Log: Ready to ingest trades...")
-    await server.start()
-    await server.wait_for_termination()
+    workers = []
+    engine = asyncio.create_task(start_engine(server, workers))
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, PROFILER.toggle)
+    except (AttributeError, NotImplementedError):
+        pass  # No SIGUSR1 on Windows; /profiling still works
+    if METRICS_SERVER is not None:
+        try:
+            await METRICS_SERVER.start()
+            print(f"Metrics on http://{METRICS_SERVER.host}:{METRICS_SERVER.port}/metrics")
+        except OSError as e:
+            # Surveillance keeps running without its metrics endpoint
+            print(f"Metrics endpoint unavailable: {e}")
+    try:
+        await server.wait_for_termination()
+        if engine.done() and not engine.cancelled():
+            engine.result()  # Re-raises a failed load_engine()
+    finally:
+        engine.cancel()
+        for worker in workers:
+            worker.cancel()
+        if METRICS_SERVER is not None:
+            await METRICS_SERVER.stop()
+        if STAGE_EXECUTOR is not None:
+            STAGE_EXECUTOR.shutdown()
+        if SHARDED_PIPELINE is not None:
+            SHARDED_PIPELINE.shutdown()
+        if PIPELINE is not None and PIPELINE.rule_watcher is not None:
+            PIPELINE.rule_watcher.close()
+        if CASE_STORE is not None:
+            CASE_STORE.close()
+        if TRADE_ARCHIVE is not None:
+            TRADE_ARCHIVE.close()
 
 if __name__ == '__main__':
     asyncio.run(serve())
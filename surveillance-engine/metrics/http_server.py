@@ -0,0 +1,97 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from metrics.registry import MetricsRegistry
+
+# (status, content type, body)
+Response = Tuple[int, str, bytes]
+Handler = Callable[[str], Union[Response, Awaitable[Response]]]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 408: "Request Timeout",
+    500: "Internal Server Error"
+}
+
+
+class MetricsServer:
+    """
+    Minimal HTTP/1.1 server on the engine's event loop for Prometheus
+    scrapes. GET /metrics renders the registry; further paths can be added
+    with route(), per method, so anything that changes state can be kept to
+    POST. Handlers get the query string and run on the loop, so they must
+    be quick. One request per connection; a client that has not sent its
+    request line and headers within read_timeout_s is answered with 408.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "0.0.0.0", port: int = 9090, read_timeout_s: float = 5.0):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.read_timeout_s = read_timeout_s
+        # path -> method -> handler
+        self.routes: Dict[str, Dict[str, Handler]] = {"/metrics": {"GET": self._metrics}}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def route(self, path: str, handler: Handler, methods: Sequence[str] = ("GET",)):
+        for method in methods:
+            self.routes.setdefault(path, {})[method] = handler
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # With port 0 the OS picks one
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _metrics(self, query: str) -> Response:
+        return 200, CONTENT_TYPE, self.registry.render().encode()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status, content_type, body = await self._respond(reader)
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request_line(self, reader: asyncio.StreamReader) -> List[str]:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        # Headers are read and ignored; requests have no body we care about
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        return request_line
+
+    async def _respond(self, reader: asyncio.StreamReader) -> Response:
+        try:
+            request_line = await asyncio.wait_for(self._read_request_line(reader), self.read_timeout_s)
+        except asyncio.TimeoutError:
+            return 408, "text/plain", b"Request timeout\n"
+        if len(request_line) < 2:
+            return 400, "text/plain", b"Bad request\n"
+        method, target = request_line[0], request_line[1]
+        path, _, query = target.partition("?")
+        handlers = self.routes.get(path)
+        if handlers is None:
+            return 404, "text/plain", b"Not found\n"
+        handler = handlers.get(method)
+        if handler is None:
+            return 405, "text/plain", b"Method not allowed\n"
+        try:
+            response = handler(query)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+        except Exception as e:
+            return 500, "text/plain", f"{e!r}\n".encode()
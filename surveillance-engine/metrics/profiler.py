@@ -0,0 +1,237 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from config import get_setting
+
+
+class ProfilingMode(str, Enum):
+    SAMPLE = "sample"      # stack sampler thread: low overhead, collapsed stacks for flamegraphs
+    CPROFILE = "cprofile"  # deterministic: exact call counts, but slows the profiled cycle down
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every interval_s from a helper
+    thread, counting identical stacks. The profiled thread pays nothing but
+    the GIL hand-overs, so sampled cycles run at close to normal speed.
+    """
+
+    def __init__(self, interval_s: float = 0.002):
+        self.interval_s = interval_s
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: Optional[int] = None):
+        self.samples = Counter()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(thread_id or threading.get_ident(),), name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.samples
+
+    def _run(self, thread_id: int):
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+
+class CycleProfiler:
+    """
+    Profiles every every_n-th surveillance cycle while enabled and keeps
+    the last `window` cycle profiles. Each time the window has turned over
+    (and on dump), the aggregate is written to output_dir:
+
+    - hot_functions.txt: in sample mode, self and inclusive sample counts per
+      function; in cprofile mode, pstats sorted by cumulative time
+    - stacks.collapsed: sample mode only, one "frame;frame;frame count" line
+      per stack, the input format of flamegraph.pl and speedscope
+
+    Only the thread running the cycle is profiled; with shards or the process
+    executor, time spent in other processes shows up as waiting.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        mode: str = ProfilingMode.SAMPLE,
+        every_n: int = 10,
+        window: int = 50,
+        sample_interval_s: float = 0.002,
+        output_dir: str = "data/profiles",
+        top: int = 40
+    ):
+        self.enabled = enabled
+        self.mode = ProfilingMode(mode)
+        self.every_n = max(every_n, 1)
+        self.window = window
+        self.sample_interval_s = sample_interval_s
+        self.output_dir = output_dir
+        self.top = top
+        self.cycles = 0
+        self.profiled = 0
+        self.reports_written = 0
+        self.profiles: Deque[Any] = deque(maxlen=window)
+        self._active = False
+        self._since_report = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "CycleProfiler":
+        return cls(
+            enabled=get_setting(config, "performance", "enable_profiling", False),
+            mode=get_setting(config, "performance", "profiling_mode", "sample"),
+            every_n=get_setting(config, "performance", "profile_every_n_cycles", 10),
+            window=get_setting(config, "performance", "profile_window", 50),
+            sample_interval_s=get_setting(config, "performance", "profile_sample_interval_ms", 2) / 1000,
+            output_dir=get_setting(config, "performance", "profile_dir", "data/profiles")
+        )
+
+    def set_enabled(self, enabled: bool):
+        if self.enabled and not enabled and self._since_report:
+            # Keep what was gathered before switching off
+            self.write_reports()
+        self.enabled = enabled
+        print(f"Cycle profiling {'enabled' if enabled else 'disabled'} ({self.mode.value}, every {self.every_n} cycles)")
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    @contextmanager
+    def profile(self):
+        """
+        Wraps one surveillance cycle. Only every every_n-th cycle is profiled,
+        and never two at once (cProfile cannot nest).
+        """
+        self.cycles += 1
+        if not self.enabled or self._active or self.cycles % self.every_n:
+            yield
+            return
+
+        self._active = True
+        if self.mode == ProfilingMode.CPROFILE:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(self.sample_interval_s)
+            profiler.start()
+        try:
+            yield
+        finally:
+            if self.mode == ProfilingMode.CPROFILE:
+                profiler.disable()
+                self.profiles.append(profiler)
+            else:
+                self.profiles.append(profiler.stop())
+            self._active = False
+            self.profiled += 1
+            self._since_report += 1
+            if self._since_report >= self.window:
+                self.write_reports()
+
+    def hot_functions(self) -> str:
+        if not self.profiles:
+            return "No cycles profiled yet\n"
+        if self.mode == ProfilingMode.CPROFILE:
+            out = io.StringIO()
+            stats = pstats.Stats(self.profiles[0], stream=out)
+            for profile in list(self.profiles)[1:]:
+                stats.add(profile)
+            stats.sort_stats("cumulative").print_stats(self.top)
+            return out.getvalue()
+
+        own, inclusive = Counter(), Counter()
+        total = 0
+        for stack, n in self.stacks().items():
+            total += n
+            own[stack[-1]] += n
+            for frame in set(stack):
+                inclusive[frame] += n
+        if not total:
+            return f"No samples in the last {len(self.profiles)} profiled cycles; lower profile_sample_interval_ms\n"
+        lines = [
+            f"{total} samples over the last {len(self.profiles)} profiled cycles "
+            f"(every {self.sample_interval_s * 1000:g} ms)",
+            f"{'self%':>7} {'total%':>7}  function"
+        ]
+        for frame, n in own.most_common(self.top):
+            lines.append(f"{100 * n / total:>6.1f}% {100 * inclusive[frame] / total:>6.1f}%  {frame}")
+        return "\n".join(lines) + "\n"
+
+    def stacks(self) -> Counter:
+        stacks: Counter = Counter()
+        if self.mode == ProfilingMode.SAMPLE:
+            for samples in self.profiles:
+                stacks.update(samples)
+        return stacks
+
+    def collapsed_stacks(self) -> str:
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in self.stacks().most_common())
+
+    def write_reports(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._write("hot_functions.txt", self.hot_functions())
+        if self.mode == ProfilingMode.SAMPLE:
+            self._write("stacks.collapsed", self.collapsed_stacks())
+        self._since_report = 0
+        self.reports_written += 1
+
+    def _write(self, name: str, text: str):
+        # Replace atomically so a reader never sees half a report
+        path = os.path.join(self.output_dir, name)
+        with open(path + ".tmp", "w") as f:
+            f.write(text)
+        os.replace(path + ".tmp", path)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode.value,
+            "every_n_cycles": self.every_n,
+            "cycles": self.cycles,
+            "profiled": self.profiled,
+            "profiles_held": len(self.profiles),
+            "reports_written": self.reports_written,
+            "output_dir": os.path.abspath(self.output_dir)
+        }
+
+    def status_http(self, query: str) -> Tuple[int, str, bytes]:
+        """
+        GET /profiling: the current status as JSON.
+        """
+        return 200, "application/json", json.dumps(self.status()).encode()
+
+    def handle_http(self, query: str) -> Tuple[int, str, bytes]:
+        """
+        POST /profiling?enabled=1|0 switches profiling on or off, ?dump=1
+        writes the reports now; either way the current status is returned
+        as JSON. Only routed when [performance] profiling_http_control is set.
+        """
+        params = parse_qs(query)
+        if "enabled" in params:
+            self.set_enabled(params["enabled"][-1].lower() in ("1", "true", "on", "yes"))
+        if "dump" in params:
+            self.write_reports()
+        return 200, "application/json", json.dumps(self.status()).encode()
@@ -0,0 +1,140 @@
+"""
+Startup timing for the engine.
+
+StartupTimer records how long the engine took to listen and to be ready, by
+phase. Run as a script it summarises `python -X importtime` for one or more
+modules, grouped by top-level package, so import-time regressions show up:
+
+    python -m metrics.startup                                  # import main
+    python -m metrics.startup --module main --module pipeline.surveillance_pipeline
+    python -m metrics.startup --budget-ms 300                  # exit 1 if `import main` is slower
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+SECTION_MARKER = "-- startup section --"
+
+
+class StartupTimer:
+    """
+    Seconds since the timer was created at which milestones were reached
+    ("listening", "ready"), and the seconds spent in named phases.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.milestones: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, milestone: str):
+        self.milestones[milestone] = time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def samples(self) -> List[Tuple[Tuple[str], float]]:
+        # For a labelled metrics callback: milestones and phases share one label
+        return [((name,), seconds) for name, seconds in {**self.milestones, **self.phases}.items()]
+
+    def summary(self) -> str:
+        milestones = ", ".join(f"{name} after {seconds * 1e3:.0f} ms" for name, seconds in self.milestones.items())
+        phases = ", ".join(f"{name} {seconds * 1e3:.0f} ms" for name, seconds in self.phases.items())
+        return f"{milestones} ({phases})" if phases else milestones
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(stderr: str) -> List[List[ImportTime]]:
+    """
+    -X importtime output, split into sections at each SECTION_MARKER line.
+    """
+    sections: List[List[ImportTime]] = [[]]
+    for line in stderr.splitlines():
+        if line == SECTION_MARKER:
+            sections.append([])
+            continue
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            sections[-1].append(ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return sections
+
+
+def measure_imports(modules: Sequence[str], python: str = sys.executable, cwd: Optional[str] = None) -> List[List[ImportTime]]:
+    """
+    Imports modules one after another in a fresh interpreter; one section
+    per module, holding the imports it triggered that earlier ones had not.
+    """
+    code = "; ".join(f"import sys; print({SECTION_MARKER!r}, file=sys.stderr); import {m}" for m in modules)
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return parse_import_times(result.stderr)[1:]
+
+
+def by_package(entries: List[ImportTime]) -> List[Tuple[str, float]]:
+    """
+    Self time per top-level package in ms, slowest first.
+    """
+    totals: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[entry.module.split(".")[0]] += entry.self_us
+    return sorted(((name, us / 1e3) for name, us in totals.items()), key=lambda item: -item[1])
+
+
+def format_report(modules: Sequence[str], sections: List[List[ImportTime]], top: int = 10) -> str:
+    lines = []
+    for module, entries in zip(modules, sections):
+        total_ms = sum(e.self_us for e in entries) / 1e3
+        lines.append(f"import {module}: {total_ms:.0f} ms, {len(entries)} modules")
+        packages = by_package(entries)
+        for name, ms in packages[:top]:
+            lines.append(f"  {name:<32} {ms:>8.1f} ms")
+        if len(packages) > top:
+            rest = sum(ms for _, ms in packages[top:])
+            lines.append(f"  {f'({len(packages) - top} more)':<32} {rest:>8.1f} ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise python -X importtime by top-level package.")
+    parser.add_argument("--module", action="append", help="module to import, in order (default: main)")
+    parser.add_argument("--top", type=int, default=10, help="packages listed per module")
+    parser.add_argument("--budget-ms", type=float, help="exit 1 when the first module takes longer to import")
+    args = parser.parse_args()
+    modules = args.module or ["main"]
+    engine_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    sections = measure_imports(modules, cwd=engine_dir)
+    print(format_report(modules, sections, top=args.top))
+    first_ms = sum(e.self_us for e in sections[0]) / 1e3
+    if args.budget_ms is not None and first_ms > args.budget_ms:
+        print(f"import {modules[0]} took {first_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
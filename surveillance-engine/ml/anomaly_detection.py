@@ -1,53 +1,129 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
 import pandas as pd
 from sklearn.ensemble import IsolationForest
 from sklearn.impute import SimpleImputer
 import numpy as np
 
+
+@dataclass(frozen=True)
+class FittedModel:
+    """
+    Immutable snapshot of a trained model. Swapped in as a whole, so a
+    scorer never sees a model from one fit and an imputer from another.
+    """
+    model: IsolationForest
+    imputer: SimpleImputer
+    feature_cols: List[str]
+    version: int
+    fitted_at: str  # ISO 8601, UTC
+    n_samples: int
+
+
 class AnomalyDetector:
     def __init__(self, contamination=0.02):
-        self.model = IsolationForest(
-            n_estimators=200,
-            contamination=contamination,
-            random_state=42,
-            n_jobs=-1
-        )
-        self.imputer = SimpleImputer(strategy="mean")
-        self.is_fitted = False
-        self.feature_cols = []
+        self.contamination = contamination
+        self.current: Optional[FittedModel] = None
+        self._version = 0
+        self._version_lock = threading.Lock()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.current is not None
+
+    @property
+    def model_version(self) -> int:
+        current = self.current
+        return current.version if current else 0
+
+    @property
+    def last_fit_time(self) -> Optional[str]:
+        current = self.current
+        return current.fitted_at if current else None
+
+    @property
+    def last_fit_timestamp(self) -> Optional[float]:
+        # Unix time of last_fit_time, for metrics
+        current = self.current
+        return datetime.fromisoformat(current.fitted_at).replace(tzinfo=timezone.utc).timestamp() if current else None
+
+    @property
+    def feature_cols(self) -> List[str]:
+        current = self.current
+        return current.feature_cols if current else []
 
     def fit(self, features_df: pd.DataFrame, feature_cols: list):
         """
         Trains the Isolation Forest on historical feature vectors.
+        A fresh model and imputer are built and swapped in atomically, so
+        this is safe to run in a background thread while score() is called.
         """
         if features_df.empty:
             return
-            
-        self.feature_cols = feature_cols
+
+        model = IsolationForest(
+            n_estimators=200,
+            contamination=self.contamination,
+            random_state=42,
+            n_jobs=-1
+        )
+        imputer = SimpleImputer(strategy="mean")
+
         X = features_df[feature_cols]
-        
+
         # Handle missing values
-        X_imputed = self.imputer.fit_transform(X)
-        self.model.fit(X_imputed)
-        self.is_fitted = True
+        X_imputed = imputer.fit_transform(X)
+        model.fit(X_imputed)
+
+        with self._version_lock:
+            self._version += 1
+            self.current = FittedModel(
+                model=model,
+                imputer=imputer,
+                feature_cols=list(feature_cols),
+                version=self._version,
+                fitted_at=datetime.utcnow().isoformat(),
+                n_samples=len(X)
+            )
+
+    def load(self, fitted: FittedModel):
+        """
+        Swaps in a previously fitted model (see ModelRegistry). Later fits
+        continue its version numbering.
+        """
+        with self._version_lock:
+            self._version = max(self._version, fitted.version)
+            self.current = fitted
 
     def score(self, features_df: pd.DataFrame) -> pd.Series:
         """
         Returns anomaly scores (-1 to 0 usually, lower is more anomalous).
         We normalize to 0..1 scale where 1 is highly anomalous.
         """
-        if not self.is_fitted or features_df.empty:
-            return pd.Series([0.0] * len(features_df), index=features_df.index)
-
-        X = features_df[self.feature_cols]
-        X_imputed = self.imputer.transform(X)
-        
-        # decision_function returns negative for anomalies
-        raw_scores = self.model.decision_function(X_imputed)
-        
-        # Normalize: raw_scores usually range [-0.5, 0.5] approx.
-        # We want high positive score for anomalies.
-        # Flip sign and shift/scale loosely to 0-1 range for simplicity
-        # Real impl would calibrate this better.
-        normalized_scores = 0.5 - raw_scores 
-        
-        return pd.Series(normalized_scores, index=features_df.index)
+        return score_features(self.current, features_df)
+
+
+def score_features(current: Optional[FittedModel], features_df: pd.DataFrame) -> pd.Series:
+    """
+    Scores feature rows against a fitted snapshot (see AnomalyDetector.score).
+    Module-level so it can run in a worker process with a shipped snapshot.
+    """
+    if current is None or features_df.empty:
+        return pd.Series([0.0] * len(features_df), index=features_df.index)
+
+    X = features_df[current.feature_cols]
+    X_imputed = current.imputer.transform(X)
+
+    # decision_function returns negative for anomalies
+    raw_scores = current.model.decision_function(X_imputed)
+
+    # Normalize: raw_scores usually range [-0.5, 0.5] approx.
+    # We want high positive score for anomalies.
+    # Flip sign and shift/scale loosely to 0-1 range for simplicity
+    # Real impl would calibrate this better.
+    normalized_scores = 0.5 - raw_scores
+
+    return pd.Series(normalized_scores, index=features_df.index)
@@ -1,16 +1,22 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
 from features.feature_stats import FeatureStats
 
 def explain_anomaly(row: Dict[str, Any], baselines: Dict[str, FeatureStats]) -> List[Dict[str, Any]]:
     """
     Compares a single participant's feature row against market baselines
-    and returns 'Plain English' evidence for any statistically significant deviation.
+    and returns evidence for any statistically significant deviation.
+    Numbers are kept at full precision; with_description rounds them for
+    display and adds the 'Plain English' description.
     """
     explanations = []
 
     for feature, stats in baselines.items():
         value = row.get(feature)
-        
+
         # Skip if missing or zero division risk (simplified)
         if value is None or stats.std == 0:
             continue
@@ -18,16 +24,84 @@ def explain_anomaly(row: Dict[str, Any], baselines: Dict[str, FeatureStats]) ->
         # Check if value exceeds P95 (or other threshold logic)
         if value > stats.p95:
             deviation_sigma = (value - stats.mean) / stats.std
-            
+
             explanations.append({
                 "feature": feature,
-                "value": round(float(value), 3),
-                "market_p95": round(stats.p95, 3),
-                "deviation_sigma": round(deviation_sigma, 2),
-                "description": (
-                    f"Participant value ({round(value, 2)}) exceeded market 95th percentile "
-                    f"({round(stats.p95, 2)}) by {round(deviation_sigma, 1)}x standard deviations."
-                )
+                "value": float(value),
+                "market_p95": float(stats.p95),
+                "deviation_sigma": float(deviation_sigma)
             })
 
     return explanations
+
+def explain_anomalies(
+    features: pd.DataFrame,
+    baselines: Dict[Optional[str], Dict[str, FeatureStats]]
+) -> List[List[Dict[str, Any]]]:
+    """
+    explain_anomaly for every row of a feature frame at once: one list of
+    evidence per row, in row order. Each row is compared with its
+    instrument's baselines, or the market-wide ones under None.
+    Deviations are computed for all rows and features as one matrix.
+    """
+    n = len(features)
+    if n == 0:
+        return []
+    instruments = features["instrument"] if "instrument" in features.columns else pd.Series([None] * n)
+    codes, uniques = pd.factorize(instruments, use_na_sentinel=False)
+    row_baselines = [baselines.get(instrument) or baselines.get(None, {}) for instrument in uniques]
+    feature_names = [
+        f for f in dict.fromkeys(f for stats in row_baselines for f in stats)
+        if f in features.columns
+    ]
+    if not feature_names:
+        return [[] for _ in range(n)]
+
+    # (instrument, feature) tables; NaN where an instrument has no baseline for a feature
+    shape = (len(uniques), len(feature_names))
+    mean, std, p95 = np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+    for i, stats in enumerate(row_baselines):
+        for j, feature in enumerate(feature_names):
+            if feature in stats:
+                mean[i, j], std[i, j], p95[i, j] = stats[feature].mean, stats[feature].std, stats[feature].p95
+
+    values = features[feature_names].to_numpy(dtype=float, na_value=np.nan)
+    mean, std, p95 = mean[codes], std[codes], p95[codes]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = (values - mean) / std
+    rows, cols = np.nonzero((values > p95) & (std != 0))
+
+    explanations: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+    for row, col, value, market_p95, deviation_sigma in zip(
+        rows.tolist(), cols.tolist(), values[rows, cols].tolist(), p95[rows, cols].tolist(), sigma[rows, cols].tolist()
+    ):
+        explanations[row].append({
+            "feature": feature_names[col],
+            "value": value,
+            "market_p95": market_p95,
+            "deviation_sigma": deviation_sigma
+        })
+    return explanations
+
+def describe(explanation: Dict[str, Any]) -> str:
+    # Rounds the explanation's full-precision numbers once, to the precision shown
+    return (
+        f"Participant value ({round(explanation['value'], 2)}) exceeded market 95th percentile "
+        f"({round(explanation['market_p95'], 2)}) by {round(explanation['deviation_sigma'], 1)}x standard deviations."
+    )
+
+def with_description(alert: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The alert as shown to users: explanations get their description, and
+    their numbers are rounded, here, only once a case carrying them is sent
+    out or looked at.
+    """
+    if "feature" not in alert or "description" in alert:
+        return alert
+    return {
+        **alert,
+        "value": round(alert["value"], 3),
+        "market_p95": round(alert["market_p95"], 3),
+        "deviation_sigma": round(alert["deviation_sigma"], 2),
+        "description": describe(alert)
+    }
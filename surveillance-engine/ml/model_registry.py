@@ -0,0 +1,148 @@
+import json
+import os
+import pickle
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import sklearn
+
+from config import get_setting
+from ml.anomaly_detection import FittedModel
+
+
+@dataclass(frozen=True)
+class RegistryEntry:
+    """
+    The metadata saved next to a pickled FittedModel. Entries are listed
+    and checked for compatibility from these alone, without unpickling.
+    """
+    path: str  # the .pkl file
+    model_name: str
+    model_version: str
+    feature_cols: List[str]
+    sklearn_version: str
+    version: int
+    fitted_at: str
+    n_samples: int
+    saved_at: float
+
+
+class ModelRegistry:
+    """
+    Fitted anomaly models on disk, under <directory>/<model_name>/<model_version>/.
+
+    save() pickles a FittedModel (forest, imputer and feature columns) and
+    writes its metadata as a .json file beside it; the model file is
+    written first and both are renamed into place, so a listed entry is
+    always complete. load_latest() unpickles the newest entry fitted on the
+    same feature columns with the installed scikit-learn, which takes
+    milliseconds where a refit takes seconds.
+
+    Shards partition participants, so a model fitted in one shard is no
+    use to another: create_model_registry() gives each shard its own
+    directory. File names still carry the process id, and only the newest
+    `keep` entries are kept.
+    """
+
+    def __init__(self, directory: str, model_name: str = "IsolationForest", model_version: str = "v1", keep: int = 5):
+        self.model_name = model_name
+        self.model_version = model_version
+        self.keep = keep
+        self.directory = os.path.join(directory, model_name, model_version)
+
+    def save(self, model: FittedModel) -> RegistryEntry:
+        name = f"model-{time.time_ns()}-{os.getpid()}-v{model.version}"
+        path = os.path.join(self.directory, f"{name}.pkl")
+        os.makedirs(self.directory, exist_ok=True)
+        entry = RegistryEntry(
+            path=path,
+            model_name=self.model_name,
+            model_version=self.model_version,
+            feature_cols=list(model.feature_cols),
+            sklearn_version=sklearn.__version__,
+            version=model.version,
+            fitted_at=model.fitted_at,
+            n_samples=model.n_samples,
+            saved_at=time.time()
+        )
+        with open(f"{path}.tmp", "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+        meta = {k: v for k, v in asdict(entry).items() if k != "path"}
+        meta_path = os.path.join(self.directory, f"{name}.json")
+        with open(f"{meta_path}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        self.prune()
+        return entry
+
+    def entries(self) -> List[RegistryEntry]:
+        """
+        Saved entries, newest first.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    meta = json.load(f)
+                entries.append(RegistryEntry(path=os.path.join(self.directory, filename[:-len(".json")] + ".pkl"), **meta))
+            except FileNotFoundError:
+                continue  # Pruned by another process meanwhile
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Skipping model registry entry {filename}: {e}")
+        return sorted(entries, key=lambda e: e.saved_at, reverse=True)
+
+    def compatible(self, entry: RegistryEntry, feature_cols: List[str]) -> bool:
+        return (
+            entry.model_name == self.model_name
+            and entry.model_version == self.model_version
+            and list(entry.feature_cols) == list(feature_cols)
+            and entry.sklearn_version == sklearn.__version__
+        )
+
+    def load_latest(self, feature_cols: List[str]) -> Optional[FittedModel]:
+        """
+        The newest compatible model, or None if there is none.
+        """
+        for entry in self.entries():
+            if not self.compatible(entry, feature_cols):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    return pickle.load(f)
+            except Exception as e:
+                print(f"Could not load model {entry.path}: {e}")
+        return None
+
+    def prune(self):
+        for entry in self.entries()[self.keep:]:
+            # Metadata first, so the entry is never listed without its model
+            for path in (entry.path[:-len(".pkl")] + ".json", entry.path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def create_model_registry(config: Dict[str, Any], shard: Optional[Tuple[int, int]] = None) -> Optional[ModelRegistry]:
+    """
+    Builds the registry from [ml_model], or returns None when registry_dir is not set.
+    A (shard, shards) pair namespaces it under <registry_dir>/shard-<i>-of-<n>/,
+    since the same shard index holds other participants when the count changes.
+    """
+    directory = get_setting(config, "ml_model", "registry_dir")
+    if not directory:
+        return None
+    if shard is not None:
+        directory = os.path.join(directory, f"shard-{shard[0]}-of-{shard[1]}")
+    return ModelRegistry(
+        directory,
+        model_name=get_setting(config, "ml_model", "model_name", "IsolationForest"),
+        model_version=str(get_setting(config, "ml_model", "model_version", "v1")),
+        keep=get_setting(config, "ml_model", "registry_keep", 5)
+    )
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from ml.anomaly_detection import AnomalyDetector
+from ml.model_registry import ModelRegistry
+
+
+class BackgroundTrainer:
+    """
+    Decides when the AnomalyDetector should be retrained and runs the fit
+    in a background executor, keeping it off the surveillance hot path.
+
+    A retrain is due once retrain_min_rows new feature rows have been
+    observed, or retrain_interval_s has passed with any new rows. Only one
+    fit runs at a time; the detector swaps the new model in when it finishes.
+    on_fit, if set, is called from the training thread with the duration
+    of every successful fit in seconds. With a registry, every fitted model
+    is also saved there from the training thread.
+    """
+
+    def __init__(
+        self,
+        detector: AnomalyDetector,
+        retrain_interval_s: float = 60.0,
+        retrain_min_rows: int = 500,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_fit: Optional[Callable[[float], None]] = None,
+        registry: Optional[ModelRegistry] = None
+    ):
+        self.detector = detector
+        self.retrain_interval_s = retrain_interval_s
+        self.retrain_min_rows = retrain_min_rows
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-trainer")
+        self.clock = clock
+        self.on_fit = on_fit
+        self.registry = registry
+        self.pending_rows = 0
+        # The interval counts from construction until the first fit starts
+        self.last_started = clock()
+        self._future: Optional[Future] = None
+
+    @property
+    def training(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def observe(self, n_rows: int):
+        """
+        Records that n_rows new or updated feature rows were produced.
+        """
+        self.pending_rows += n_rows
+
+    def due(self) -> bool:
+        if self.training or self.pending_rows == 0:
+            return False
+        if not self.detector.is_fitted or self.pending_rows >= self.retrain_min_rows:
+            return True
+        return self.clock() - self.last_started >= self.retrain_interval_s
+
+    def maybe_retrain(self, snapshot: Callable[[], pd.DataFrame], feature_cols: List[str]) -> bool:
+        """
+        Starts a background fit if one is due. snapshot is only called when
+        a fit starts, and must return a frame the caller will not mutate.
+        """
+        if not self.due():
+            return False
+
+        training_df = snapshot()
+        if training_df.empty:
+            return False
+
+        self.pending_rows = 0
+        self.last_started = self.clock()
+        self._future = self.executor.submit(self._fit, training_df, feature_cols)
+        return True
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Blocks until the in-flight fit (if any) has finished.
+        """
+        if self._future is not None:
+            self._future.result(timeout=timeout)
+
+    def _fit(self, training_df: pd.DataFrame, feature_cols: List[str]):
+        try:
+            start = time.perf_counter()
+            self.detector.fit(training_df, feature_cols)
+            if self.on_fit is not None:
+                self.on_fit(time.perf_counter() - start)
+            print(
+                f"Model v{self.detector.model_version} fitted on {len(training_df)} rows "
+                f"at {self.detector.last_fit_time}"
+            )
+        except Exception as e:
+            print(f"Model retraining failed: {e}")
+            return
+        if self.registry is not None:
+            try:
+                self.registry.save(self.detector.current)
+            except Exception as e:
+                print(f"Saving model v{self.detector.model_version} failed: {e}")
@@ -0,0 +1,221 @@
+import asyncio
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from features.baseline_store import BaselineStore
+from pipeline.stages import Finding
+from pipeline.surveillance_pipeline import Baselines, SurveillancePipeline
+
+
+def shard_for(participant_id: str, shards: int) -> int:
+    # crc32 rather than hash(): str hashes are salted per process
+    return zlib.crc32(participant_id.encode()) % shards
+
+
+@dataclass
+class ShardResult:
+    shard: int
+    trades: int = 0
+    findings: List[Finding] = field(default_factory=list)
+    baselines: Optional[BaselineStore] = None  # windows closed by this call
+    busy_s: float = 0.0
+    # (stage, seconds) measured in the shard, for the coordinator's metrics
+    stage_seconds: List[Tuple[str, float]] = field(default_factory=list)
+    # The shard's scoring model after this call, for the same metrics
+    model_version: int = 0
+    last_fit_timestamp: Optional[float] = None
+    error: Optional[BaseException] = None
+
+
+# The shard's own pipeline, created once per worker process by _init_shard
+_SHARD: Optional[SurveillancePipeline] = None
+# Durations of background fits finished since the last call
+_FITS: List[float] = []
+
+
+def _init_shard(config: Dict[str, Any], feature_cols: List[str], shard: int, shards: int):
+    global _SHARD
+    _SHARD = SurveillancePipeline.from_config(config, feature_cols, shard=(shard, shards))
+    _SHARD.trainer.on_fit = _FITS.append
+
+
+def _run_shard(shard: int, trades: List[Dict[str, Any]], baselines: Baselines) -> ShardResult:
+    start = time.process_time()
+    result = ShardResult(shard=shard, trades=len(trades))
+    timings: Dict[str, float] = {}
+    clock = time.perf_counter()
+    features = _SHARD.ingest(trades)
+    timings["features"] = time.perf_counter() - clock
+    result.baselines = _SHARD.take_closed_baselines()
+    if features is not None:
+        _SHARD.maybe_retrain(len(features))
+        result.findings = _SHARD.analyse(features, _SHARD.fill_baselines(baselines), timings)
+    while _FITS:
+        result.stage_seconds.append(("fit", _FITS.pop(0)))
+    result.stage_seconds.extend(timings.items())
+    result.model_version = _SHARD.detector.model_version
+    result.last_fit_timestamp = _SHARD.detector.last_fit_timestamp
+    result.busy_s = time.process_time() - start
+    return result
+
+
+class ShardedPipeline:
+    """
+    Runs the whole analysis pipeline in N worker processes, partitioned by
+    participant. Windows are keyed by (participant, instrument), so every
+    window lives in exactly one shard and shards never share state.
+
+    Each shard is a single-process pool whose SurveillancePipeline (buffer,
+    windows, detector, trainer) persists between calls. Shards do not wait
+    for each other: submit() queues trades per shard, and an idle shard is
+    handed everything queued for it in one call. Under load those calls
+    grow, which amortises the per-call cost of building frames and scoring
+    (an IsolationForest call costs about the same for 10 rows as for 1000).
+    One call per shard is in flight, so a participant's trades are analysed
+    in order.
+
+    Baselines stay market-wide: each shard folds the windows it closes into
+    a small BaselineStore that is merged into baseline_store here, and every
+    call is dispatched with its shared_snapshot(), recomputed at most every
+    baseline_store.refresh_s.
+
+    Findings are collected with next_result().
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        config: Dict[str, Any],
+        feature_cols: List[str],
+        baseline_store: Optional[BaselineStore] = None,
+        max_pending: int = 20000
+    ):
+        self.shards = shards
+        self.config = config
+        self.feature_cols = feature_cols
+        self.baseline_store = baseline_store if baseline_store is not None else BaselineStore(feature_cols)
+        self.max_pending = max_pending
+        self.pools: List[ProcessPoolExecutor] = []
+        self.busy_s = [0.0] * shards
+        self.calls = [0] * shards
+        self.model_versions = [0] * shards
+        self.last_fit_timestamps: List[Optional[float]] = [None] * shards
+        self.pending = 0
+        self._queued: List[List[Dict[str, Any]]] = [[] for _ in range(shards)]
+        self._running = [False] * shards
+        self._routes: Dict[str, int] = {}
+        self._results: Optional[asyncio.Queue] = None
+        self._capacity: Optional[asyncio.Condition] = None
+
+    async def start(self):
+        if self.pools:
+            return
+        self._results = asyncio.Queue()
+        self._capacity = asyncio.Condition()
+        self.pools = [self._pool(shard) for shard in range(self.shards)]
+        # Pay the interpreter, import and rule loading cost before the first batch
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, _run_shard, shard, [], {}) for shard, pool in enumerate(self.pools)
+        ))
+        for result in results:
+            self._record_model(result)
+
+    def shutdown(self):
+        for pool in self.pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.pools = []
+
+    def partition(self, trades: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        parts: List[List[Dict[str, Any]]] = [[] for _ in range(self.shards)]
+        routes = self._routes
+        for t in trades:
+            pid = t["participant_id"]
+            shard = routes.get(pid)
+            if shard is None:
+                shard = routes[pid] = shard_for(pid, self.shards)
+            parts[shard].append(t)
+        return parts
+
+    async def submit(self, trades: List[Dict[str, Any]]):
+        """
+        Queues a micro-batch on its shards. Waits while max_pending trades
+        are queued or being analysed, so a backlog backs up into the ingest
+        queue instead of growing here.
+        """
+        await self.start()
+        async with self._capacity:
+            await self._capacity.wait_for(lambda: self.pending == 0 or self.pending + len(trades) <= self.max_pending)
+            self.pending += len(trades)
+        for shard, part in enumerate(self.partition(trades)):
+            if part:
+                self._queued[shard].extend(part)
+                self._dispatch(shard)
+
+    async def next_result(self) -> ShardResult:
+        return await self._results.get()
+
+    async def drain(self) -> List[ShardResult]:
+        """
+        Waits until everything submitted has been analysed and returns the
+        results not yet collected.
+        """
+        results = []
+        while self.pending or not self._results.empty():
+            results.append(await self._results.get())
+        return results
+
+    def _pool(self, shard: int) -> ProcessPoolExecutor:
+        # spawn: forking a process that already runs grpc's threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_shard,
+            initargs=(self.config, self.feature_cols, shard, self.shards)
+        )
+
+    def _dispatch(self, shard: int):
+        if self._running[shard] or not self._queued[shard]:
+            return
+        trades, self._queued[shard] = self._queued[shard], []
+        self._running[shard] = True
+        self.calls[shard] += 1
+        future = self.pools[shard].submit(_run_shard, shard, trades, self._baselines())
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(
+            lambda f: loop.call_soon_threadsafe(self._finished, shard, len(trades), f)
+        )
+
+    def _finished(self, shard: int, n_trades: int, future: Future):
+        self._running[shard] = False
+        self.pending -= n_trades
+        try:
+            result = future.result()
+            self.busy_s[shard] += result.busy_s
+            self._record_model(result)
+            if result.baselines is not None and result.baselines.segments:
+                self.baseline_store.merge(result.baselines)
+        except Exception as e:
+            result = ShardResult(shard=shard, trades=n_trades, error=e)
+            if isinstance(e, BrokenProcessPool):
+                # The shard's state is gone with its process; start over with empty windows
+                self.pools[shard] = self._pool(shard)
+        self._results.put_nowait(result)
+        self._dispatch(shard)
+        asyncio.get_running_loop().create_task(self._notify_capacity())
+
+    def _record_model(self, result: ShardResult):
+        self.model_versions[result.shard] = result.model_version
+        self.last_fit_timestamps[result.shard] = result.last_fit_timestamp
+
+    def _baselines(self) -> Baselines:
+        return self.baseline_store.shared_snapshot(time.monotonic())
+
+    async def _notify_capacity(self):
+        async with self._capacity:
+            self._capacity.notify_all()
@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from features.feature_stats import FeatureStats
+from ml.anomaly_detection import FittedModel
+from pipeline.stages import Finding, ModelRef, analyse_windows
+from rules.rule_engine import RuleEngine
+
+
+class ExecutionMode(str, Enum):
+    INLINE = "inline"    # stages run on the event loop
+    PROCESS = "process"  # stages run in a ProcessPoolExecutor
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _analyse_timed(*args) -> Tuple[List[Finding], Dict[str, float]]:
+    # Stage timings measured in the worker travel back with the findings
+    timings: Dict[str, float] = {}
+    return analyse_windows(*args, timings=timings), timings
+
+
+class StageExecutor:
+    """
+    Runs the CPU-bound analysis stages either inline on the event loop or
+    in a pool of worker processes, so the loop only does I/O and fan-out.
+
+    In process mode each new model version is pickled to a spill file once;
+    workers load it on first use and cache it until the version changes.
+    """
+
+    def __init__(self, mode: str = ExecutionMode.INLINE, workers: int = 4):
+        self.mode = ExecutionMode(mode)
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._spill_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._model_refs: List[ModelRef] = []
+
+    async def start(self):
+        if self.mode != ExecutionMode.PROCESS or self.pool is not None:
+            return
+        # spawn: forking a process that already runs grpc's threads is unsafe
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._spill_dir = tempfile.TemporaryDirectory(prefix="surveillance-models-")
+        loop = asyncio.get_running_loop()
+        # Pay the interpreter + pandas/sklearn import cost before the first cycle
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_up) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        if self._spill_dir is not None:
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+
+    async def analyse(
+        self,
+        features: pd.DataFrame,
+        model: Optional[FittedModel],
+        rule_engine: RuleEngine,
+        baselines: Dict[Optional[str], Dict[str, FeatureStats]],
+        anomaly_threshold: float = 0.8,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Finding]:
+        if self.mode != ExecutionMode.PROCESS:
+            return analyse_windows(features, model, rule_engine, baselines, anomaly_threshold, timings)
+
+        await self.start()
+        loop = asyncio.get_running_loop()
+        model_ref = await self._model_ref(model) if model is not None else None
+        findings, worker_timings = await loop.run_in_executor(
+            self.pool, _analyse_timed, features, model_ref, rule_engine, baselines, anomaly_threshold
+        )
+        if timings is not None:
+            for stage, seconds in worker_timings.items():
+                timings[stage] = timings.get(stage, 0.0) + seconds
+        return findings
+
+    async def _model_ref(self, model: FittedModel) -> ModelRef:
+        if self._model_refs and self._model_refs[-1].version == model.version:
+            return self._model_refs[-1]
+
+        ref = ModelRef(
+            version=model.version,
+            path=os.path.join(self._spill_dir.name, f"model-v{model.version}.pkl")
+        )
+        await asyncio.get_running_loop().run_in_executor(None, self._spill, model, ref.path)
+        self._model_refs.append(ref)
+
+        # Keep the previous version around for calls already in flight
+        while len(self._model_refs) > 2:
+            os.remove(self._model_refs.pop(0).path)
+        return ref
+
+    @staticmethod
+    def _spill(model: FittedModel, path: str):
+        with open(path, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
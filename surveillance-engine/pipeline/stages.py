@@ -0,0 +1,112 @@
+import pickle
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from features.feature_stats import FeatureStats
+from ml.anomaly_detection import FittedModel, score_features
+from ml.explainability import explain_anomalies
+from rules.rule_engine import RuleEngine
+
+
+@dataclass(frozen=True)
+class ModelRef:
+    """
+    Points a worker process at a pickled FittedModel on disk, so the model
+    crosses the process boundary once per version instead of once per call.
+    """
+    version: int
+    path: str
+
+
+@dataclass
+class Finding:
+    """
+    A feature row that tripped a rule or the anomaly threshold.
+    """
+    participant_id: str
+    instrument: str
+    ml_score: float
+    is_anomaly: bool
+    window_start_ns: int = 0
+    alerts: List[Dict[str, Any]] = field(default_factory=list)
+    explanations: List[Dict[str, Any]] = field(default_factory=list)
+
+
+# Per-process cache of the last model loaded from a ModelRef
+_WORKER_MODEL: Optional[FittedModel] = None
+
+
+def resolve_model(model: Union[FittedModel, ModelRef, None]) -> Optional[FittedModel]:
+    global _WORKER_MODEL
+    if not isinstance(model, ModelRef):
+        return model
+    if _WORKER_MODEL is None or _WORKER_MODEL.version != model.version:
+        with open(model.path, "rb") as f:
+            _WORKER_MODEL = pickle.load(f)
+    return _WORKER_MODEL
+
+
+def analyse_windows(
+    features: pd.DataFrame,
+    model: Union[FittedModel, ModelRef, None],
+    rule_engine: RuleEngine,
+    baselines: Dict[Optional[str], Dict[str, FeatureStats]],
+    anomaly_threshold: float = 0.8,
+    timings: Optional[Dict[str, float]] = None
+) -> List[Finding]:
+    """
+    ML scoring, rule evaluation and explanations for a frame of feature rows.
+    baselines maps an instrument to its FeatureStats, with the market-wide
+    baseline under None (see BaselineStore.snapshot).
+    Depends only on its arguments, so it can run inline or in a worker process.
+    If timings is given, the seconds spent scoring, evaluating rules and
+    explaining are added to it under "score", "rules" and "explain".
+    """
+    start = time.perf_counter()
+    features = features.copy()
+    features["ml_score"] = score_features(resolve_model(model), features)
+    scored = time.perf_counter()
+
+    evaluation = rule_engine.evaluate_frame(features)
+    is_anomaly = features["ml_score"] > anomaly_threshold
+    flagged = is_anomaly.copy()
+    flagged.loc[list(evaluation.alerts)] = True
+    evaluated = time.perf_counter()
+
+    # Only flagged rows are explained, all at once
+    rows = features[flagged]
+    explanations = explain_anomalies(rows, baselines)
+    if "event_time" in rows.columns:
+        window_starts = pd.to_datetime(rows["event_time"]).dt.as_unit("ns").astype("int64").tolist()
+    else:
+        window_starts = [0] * len(rows)
+    findings = [
+        Finding(
+            participant_id=participant_id,
+            instrument=instrument,
+            ml_score=float(ml_score),
+            is_anomaly=bool(anomalous),
+            window_start_ns=window_start_ns,
+            alerts=evaluation.alerts.get(i, []),
+            explanations=row_explanations
+        )
+        for i, participant_id, instrument, ml_score, anomalous, window_start_ns, row_explanations in zip(
+            rows.index,
+            rows["participant_id"],
+            rows["instrument"],
+            rows["ml_score"],
+            is_anomaly[flagged],
+            window_starts,
+            explanations
+        )
+    ]
+
+    if timings is not None:
+        done = time.perf_counter()
+        timings["score"] = timings.get("score", 0.0) + scored - start
+        timings["rules"] = timings.get("rules", 0.0) + evaluated - scored
+        timings["explain"] = timings.get("explain", 0.0) + done - evaluated
+    return findings
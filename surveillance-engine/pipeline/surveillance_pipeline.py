@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config import get_setting
+from features.baseline_store import MARKET, BaselineStore
+from features.feature_stats import FeatureStats, compute_feature_baselines
+from features.window_aggregator import WindowAggregator
+from ml.anomaly_detection import AnomalyDetector
+from ml.model_registry import ModelRegistry, create_model_registry
+from ml.model_trainer import BackgroundTrainer
+from pipeline.stages import Finding, analyse_windows
+from rules.rule_engine import RuleEngine
+from rules.rule_watcher import RuleWatcher
+
+Baselines = Dict[Optional[str], Dict[str, FeatureStats]]
+
+
+class SurveillancePipeline:
+    """
+    The analysis state for one partition of the trade flow: incremental
+    window features, rules, and the anomaly detector with its background
+    trainer.
+
+    main.py runs one for all trades. In sharded mode every shard process
+    owns one for the participants routed to it (see ShardedPipeline).
+    Baselines are not owned here: they are passed in, so all partitions
+    compare against the same market, and closed windows are handed back
+    (take_closed, or take_closed_baselines for a mergeable store).
+    """
+
+    def __init__(
+        self,
+        feature_cols: List[str],
+        window: str = "5min",
+        horizon: str = "15min",
+        rules_dir: str = "rules",
+        retrain_interval_s: float = 60.0,
+        retrain_min_rows: int = 500,
+        anomaly_threshold: float = 0.8,
+        baseline_settings: Optional[Dict[str, Any]] = None,
+        model_registry: Optional[ModelRegistry] = None,
+        rules_reload_interval_s: Optional[float] = None
+    ):
+        self.feature_cols = feature_cols
+        self.anomaly_threshold = anomaly_threshold
+        # BaselineStore arguments for take_closed_baselines()
+        self.baseline_settings = baseline_settings or {}
+        self.window_aggregator = WindowAggregator(window=window, retention=horizon)
+        self.rule_engine = RuleEngine(rules_dir=rules_dir)
+        # Picks up edited rule files in the background; None unless [rules] auto_reload is set
+        self.rule_watcher: Optional[RuleWatcher] = None
+        if rules_reload_interval_s is not None:
+            self.rule_watcher = RuleWatcher(self.rule_engine, interval_s=rules_reload_interval_s)
+            self.rule_watcher.start()
+        self.detector = AnomalyDetector()
+        self.trainer = BackgroundTrainer(
+            self.detector,
+            retrain_interval_s=retrain_interval_s,
+            retrain_min_rows=retrain_min_rows,
+            registry=model_registry
+        )
+        if model_registry is not None:
+            # Score from the first trade with the last saved model instead of waiting for a fit
+            fitted = model_registry.load_latest(feature_cols)
+            if fitted is not None:
+                self.detector.load(fitted)
+                print(
+                    f"Loaded model v{fitted.version} ({model_registry.model_name} {model_registry.model_version}), "
+                    f"fitted on {fitted.n_samples} rows at {fitted.fitted_at}"
+                )
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], feature_cols: List[str], shard: Optional[Tuple[int, int]] = None
+    ) -> "SurveillancePipeline":
+        return cls(
+            feature_cols,
+            horizon=get_setting(config, "trade_ingestion", "buffer_horizon", "15min"),
+            rules_dir=get_setting(config, "rules", "directory", "rules"),
+            retrain_interval_s=get_setting(config, "ml_model", "retrain_interval_seconds", 60.0),
+            retrain_min_rows=get_setting(config, "ml_model", "retrain_min_rows", 500),
+            anomaly_threshold=get_setting(config, "thresholds.anomaly", "ml_score_threshold", 0.8),
+            baseline_settings=dict(
+                half_life_s=get_setting(config, "baselines", "half_life_seconds", 3600.0),
+                sketch_k=get_setting(config, "baselines", "sketch_k", 200),
+                min_segment_weight=get_setting(config, "baselines", "min_segment_samples", 30)
+            ),
+            model_registry=create_model_registry(config, shard),
+            rules_reload_interval_s=(
+                get_setting(config, "rules", "reload_interval_seconds", 2.0)
+                if get_setting(config, "rules", "auto_reload", False) else None
+            )
+        )
+
+    @property
+    def watermark_s(self) -> Optional[float]:
+        watermark_ns = self.window_aggregator.watermark_ns
+        return None if watermark_ns is None else watermark_ns / 1e9
+
+    def ingest(self, trades: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        """
+        Updates the windows a micro-batch touched. Returns the feature rows
+        of those windows, or None if none changed.
+        """
+        changed_windows = self.window_aggregator.update(trades)
+        if not changed_windows:
+            return None
+        return self.window_aggregator.features(changed_windows)
+
+    def take_closed(self) -> pd.DataFrame:
+        return self.window_aggregator.take_closed()
+
+    def take_closed_baselines(self) -> BaselineStore:
+        """
+        The windows closed since the last call, folded into a fresh store to
+        be merged into the market-wide one. Cheaper to ship and merge than
+        the rows themselves, and the per-row work stays in this process.
+        """
+        store = BaselineStore(self.feature_cols, **self.baseline_settings)
+        store.update(self.take_closed(), now=self.watermark_s)
+        return store
+
+    def fill_baselines(self, baselines: Baselines) -> Baselines:
+        if not baselines.get(MARKET):
+            # No window has closed yet: compare against the live windows meanwhile
+            baselines[MARKET] = compute_feature_baselines(self.window_aggregator.features(), self.feature_cols)
+        return baselines
+
+    def maybe_retrain(self, n_rows: int):
+        # Retraining happens in the background; scoring uses the current version
+        self.trainer.observe(n_rows)
+        self.trainer.maybe_retrain(self.window_aggregator.features, self.feature_cols)
+
+    def analyse(
+        self,
+        features: pd.DataFrame,
+        baselines: Baselines,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Finding]:
+        return analyse_windows(
+            features, self.detector.current, self.rule_engine, baselines, self.anomaly_threshold, timings
+        )
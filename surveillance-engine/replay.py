@@ -0,0 +1,351 @@
+"""
+Replays historical trades from CSV or Parquet through the surveillance pipeline.
+
+Trades go through the same feature -> ML -> rules -> case path as the live
+engine (main.run_surveillance_cycle), driven by event time: case coalescing
+and the retrain interval follow event_time_ns, not the wall clock, and
+retraining runs synchronously, so a replay of the same file gives the
+same cases. By default trades are replayed as fast as the CPU allows;
+--speed 60 paces them at sixty times real time.
+
+Live, the model also retrains once retrain_min_rows new rows arrived, but
+never more than one fit at a time, which bounds fits by wall time. Replay
+has no such bound, so by default it only retrains every
+retrain_interval_seconds of event time; --retrain-min-rows restores the
+row trigger.
+
+Input columns: event_time_ns (or event_time as nanoseconds or timestamps),
+venue, instrument, side, price, quantity, participant_id, and optionally
+order_id and origin. Parquet needs pyarrow or fastparquet.
+
+Usage:
+    python surveillance-engine/replay.py trades.csv [--speed 0] [--batch-size 1000] [--output summary.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Executor, Future
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ENGINE_DIR)
+
+import main
+from cases.case_manager import CaseManager
+from cases.case_store import CaseStore, SqliteCaseStore
+from config import get_setting
+from features.baseline_store import BaselineStore
+from ml.model_trainer import BackgroundTrainer
+from pipeline.stage_executor import ExecutionMode, StageExecutor
+from pipeline.surveillance_pipeline import SurveillancePipeline
+
+TRADE_COLUMNS = ["event_time", "venue", "instrument", "side", "price", "quantity", "participant_id", "order_id", "origin"]
+STAGES = ["features", "baselines", "fit", "score", "rules", "explain", "cases"]
+
+
+class EventClock:
+    """
+    Replay time: the latest event time seen, in seconds. Used wherever the
+    live engine reads time.monotonic().
+    """
+
+    def __init__(self, start_s: float = 0.0):
+        self.now_s = start_s
+
+    def now(self) -> float:
+        return self.now_s
+
+    def advance_to(self, event_time_ns: int):
+        self.now_s = max(self.now_s, event_time_ns / 1e9)
+
+
+class InlineExecutor(Executor):
+    """
+    Runs submitted calls immediately, so model fits happen at a
+    deterministic point in the replay instead of in a background thread.
+    """
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def load_trades(path: str) -> pd.DataFrame:
+    """
+    Reads a CSV or Parquet trade file into the columns the pipeline expects,
+    with event_time as int64 nanoseconds, sorted by event time.
+    """
+    if path.endswith((".parquet", ".pq")):
+        try:
+            trades = pd.read_parquet(path)
+        except ImportError as e:
+            raise SystemExit(f"Reading Parquet needs pyarrow or fastparquet: {e}")
+    else:
+        trades = pd.read_csv(path, dtype={"participant_id": str, "order_id": str, "instrument": str, "venue": str})
+
+    if "event_time_ns" in trades.columns:
+        trades = trades.rename(columns={"event_time_ns": "event_time"})
+    if "event_time" not in trades.columns:
+        raise SystemExit(f"{path} has no event_time_ns column")
+    if not pd.api.types.is_integer_dtype(trades["event_time"]):
+        # as_unit: parsed timestamps may come back in microseconds
+        trades["event_time"] = pd.to_datetime(trades["event_time"], utc=True).dt.as_unit("ns").astype("int64")
+
+    missing = {"venue", "instrument", "side", "price", "quantity", "participant_id"} - set(trades.columns)
+    if missing:
+        raise SystemExit(f"{path} is missing columns: {', '.join(sorted(missing))}")
+    if "order_id" not in trades.columns:
+        trades["order_id"] = ""
+    if "origin" not in trades.columns:
+        trades["origin"] = trades["venue"]
+
+    trades = trades[TRADE_COLUMNS]
+    if not trades["event_time"].is_monotonic_increasing:
+        trades = trades.sort_values("event_time", kind="stable")
+    return trades.reset_index(drop=True)
+
+
+def batch_bounds(event_times: np.ndarray, batch_size: int, span_ns: Optional[int] = None) -> List[int]:
+    """
+    Row offsets splitting the trades into micro-batches of at most
+    batch_size trades, and, when span_ns is given, at most span_ns of
+    event time each (so paced replays do not hold trades back).
+    """
+    n = len(event_times)
+    bounds = set(range(0, n, batch_size))
+    if span_ns and n:
+        edges = np.arange(event_times[0], event_times[-1] + 1, span_ns)
+        bounds.update(np.searchsorted(event_times, edges).tolist())
+    bounds.add(n)
+    return sorted(b for b in bounds if b <= n)
+
+
+def iter_batches(trades: pd.DataFrame, bounds: List[int]) -> Iterator[List[Dict[str, Any]]]:
+    # Converted a batch at a time: a day of trades as dicts would not fit in memory
+    for start, end in zip(bounds, bounds[1:]):
+        if end > start:
+            yield trades.iloc[start:end].to_dict("records")
+
+
+def configure_engine(
+    clock: EventClock,
+    database: Optional[str] = None,
+    sync_retrain: bool = True,
+    retrain_interval_s: Optional[float] = None,
+    retrain_min_rows: float = math.inf
+):
+    """
+    Points main's pipeline, baselines and case manager at fresh state driven
+    by clock. main.load_engine() is not used: it would open the live case
+    store, archive and model registry and start the rule watcher. Replay
+    cases are kept in memory, or in their own SQLite file, trades are not
+    archived, and stages run inline. retrain_interval_s defaults to the
+    configured interval, in event time.
+    """
+    config = main.CONFIG
+    main.CASE_STORE = SqliteCaseStore(database) if database else CaseStore()
+    main.CASE_MANAGER = CaseManager(
+        coalesce_ttl_s=get_setting(config, "cases", "coalesce_ttl_seconds", 300.0),
+        score_update_threshold=get_setting(config, "cases", "score_update_threshold", 0.01),
+        clock=clock.now,
+        store=main.CASE_STORE
+    )
+    main.BASELINE_STORE = BaselineStore(
+        main.FEATURE_COLS,
+        half_life_s=get_setting(config, "baselines", "half_life_seconds", 3600.0),
+        sketch_k=get_setting(config, "baselines", "sketch_k", 200),
+        min_segment_weight=get_setting(config, "baselines", "min_segment_samples", 30),
+        refresh_s=get_setting(config, "baselines", "refresh_seconds", 1.0)
+    )
+    rules_dir = get_setting(config, "rules", "directory", "rules")
+    if not os.path.isabs(rules_dir) and not os.path.isdir(rules_dir):
+        rules_dir = os.path.join(ENGINE_DIR, rules_dir)
+    # No model registry: a replay starts unfitted, so runs are repeatable, and leaves the live models alone.
+    # No rule watcher either: the rules stay as they were when the replay started
+    pipeline = SurveillancePipeline.from_config(
+        {
+            **config,
+            "rules": {**config.get("rules", {}), "directory": rules_dir, "auto_reload": False},
+            "ml_model": {**config.get("ml_model", {}), "registry_dir": ""}
+        },
+        main.FEATURE_COLS
+    )
+    pipeline.trainer = BackgroundTrainer(
+        pipeline.detector,
+        retrain_interval_s=pipeline.trainer.retrain_interval_s if retrain_interval_s is None else retrain_interval_s,
+        retrain_min_rows=retrain_min_rows,
+        executor=InlineExecutor() if sync_retrain else None,
+        clock=clock.now,
+        on_fit=main.STAGE_SECONDS.labels("fit").observe
+    )
+    main.PIPELINE = pipeline
+    main.SHARDED_PIPELINE = None
+    main.TRADE_ARCHIVE = None
+    main.STAGE_EXECUTOR = StageExecutor(ExecutionMode.INLINE)
+
+
+async def replay(
+    trades: pd.DataFrame,
+    speed: float = 0.0,
+    batch_size: int = 1000,
+    database: Optional[str] = None,
+    sync_retrain: bool = True,
+    retrain_interval_s: Optional[float] = None,
+    retrain_min_rows: float = math.inf
+) -> Dict[str, Any]:
+    """
+    Feeds trades through main.run_surveillance_cycle in event-time order
+    and returns the summary. speed > 0 paces the replay at that multiple of
+    real time; 0 runs flat out.
+    """
+    event_times = trades["event_time"].to_numpy()
+    clock = EventClock(event_times[0] / 1e9 if len(event_times) else 0.0)
+    configure_engine(clock, database, sync_retrain, retrain_interval_s, retrain_min_rows)
+    await main.STAGE_EXECUTOR.start()
+
+    # Paced: cut batches at 100 ms of wall time, as the live ingest queue would
+    span_ns = int(0.1 * speed * 1e9) if speed > 0 else None
+    bounds = batch_bounds(event_times, batch_size, span_ns)
+    latencies = []
+    start = time.perf_counter()
+    try:
+        for batch in iter_batches(trades, bounds):
+            first_ns = batch[0]["event_time"]
+            if speed > 0:
+                due = (first_ns - event_times[0]) / 1e9 / speed
+                delay = due - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            clock.advance_to(batch[-1]["event_time"])
+            cycle_start = time.perf_counter()
+            await main.run_surveillance_cycle(batch)
+            latencies.append(time.perf_counter() - cycle_start)
+    finally:
+        main.STAGE_EXECUTOR.shutdown()
+        main.CASE_STORE.close()
+    return summarise(trades, time.perf_counter() - start, latencies, speed)
+
+
+def summarise(trades: pd.DataFrame, wall_s: float, latencies: List[float], speed: float) -> Dict[str, Any]:
+    event_times = trades["event_time"]
+    span_s = (event_times.iloc[-1] - event_times.iloc[0]) / 1e9 if len(trades) else 0.0
+    cases = list(main.CASE_MANAGER.cases.values())
+
+    stages = {}
+    for stage in STAGES:
+        histogram = main.STAGE_SECONDS.labels(stage)
+        if histogram.count:
+            stages[stage] = {
+                "calls": histogram.count,
+                "total_s": round(histogram.sum, 3),
+                "mean_ms": round(histogram.sum / histogram.count * 1e3, 3),
+                "share_of_wall": round(histogram.sum / wall_s, 4) if wall_s else None
+            }
+
+    def iso(ns):
+        return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+    return {
+        "trades": len(trades),
+        "batches": len(latencies),
+        "speed": speed or "max",
+        "event_time": {
+            "start": iso(event_times.iloc[0]) if len(trades) else None,
+            "end": iso(event_times.iloc[-1]) if len(trades) else None,
+            "span_s": round(span_s, 3)
+        },
+        "wall_s": round(wall_s, 3),
+        "trades_per_s": round(len(trades) / wall_s, 1) if wall_s else None,
+        "event_time_per_wall_time": round(span_s / wall_s, 1) if wall_s else None,
+        "cycle_latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)) * 1e3, 3),
+            "p99": round(float(np.percentile(latencies, 99)) * 1e3, 3),
+            "max": round(max(latencies) * 1e3, 3)
+        } if latencies else {},
+        "stages": stages,
+        "model_version": main.PIPELINE.detector.model_version,
+        "cases": {
+            "opened": len(cases),
+            "updates": sum(case.revision - 1 for case in cases),
+            "suppressed": main.CASE_MANAGER.suppressed,
+            "by_alert_type": dict(Counter(case.alert_type for case in cases)),
+            "by_priority": dict(Counter(case.priority for case in cases)),
+            "top_participants": Counter(case.participant_id for case in cases).most_common(10),
+            "items": [
+                {
+                    "case_id": case.case_id,
+                    "participant_id": case.participant_id,
+                    "instrument": case.instrument,
+                    "alert_type": case.alert_type,
+                    "window_start": iso(case.window_start_ns),
+                    "priority": case.priority,
+                    "ml_score": round(case.ml_score, 4),
+                    "revision": case.revision
+                }
+                for case in cases
+            ]
+        }
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="CSV or Parquet file of trades")
+    parser.add_argument("--speed", type=float, default=0.0, help="multiple of real time; 0 = as fast as possible")
+    parser.add_argument("--batch-size", type=int,
+                        default=get_setting(main.CONFIG, "trade_ingestion", "max_batch_size", 1000))
+    parser.add_argument("--output", help="write the summary JSON here instead of stdout")
+    parser.add_argument("--database", help="also persist replay cases to this SQLite file")
+    parser.add_argument("--retrain-interval", type=float,
+                        help="seconds of event time between fits (default: [ml_model] retrain_interval_seconds)")
+    parser.add_argument("--retrain-min-rows", type=float, default=math.inf,
+                        help="also retrain once this many new feature rows arrived (default: never)")
+    parser.add_argument("--async-retrain", action="store_true",
+                        help="retrain in the background as live does (faster, not reproducible)")
+    parser.add_argument("--verbose", action="store_true", help="keep the engine's per-case output")
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    load_start = time.perf_counter()
+    trades = load_trades(args.input)
+    print(f"Loaded {len(trades)} trades in {time.perf_counter() - load_start:.1f}s", file=sys.stderr)
+
+    with open(os.devnull, "w") as devnull, contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        summary = asyncio.run(replay(
+            trades, speed=args.speed, batch_size=args.batch_size,
+            database=args.database, sync_retrain=not args.async_retrain,
+            retrain_interval_s=args.retrain_interval, retrain_min_rows=args.retrain_min_rows
+        ))
+
+    print(f"Replayed {summary['trades']} trades ({summary['event_time']['span_s']:.0f}s of event time) "
+          f"in {summary['wall_s']:.1f}s: {summary['trades_per_s']:.0f} trades/s, "
+          f"{summary['cases']['opened']} cases", file=sys.stderr)
+    payload = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    run()
@@ -1,62 +1,265 @@
 import yaml
 import os
-from typing import List, Dict, Any
+import operator
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    One compiled 'when' clause, e.g. cancel_ratio: "> 0.7".
+
+    A clause that cannot be parsed (op is None) fails the rule whenever the
+    metric is present; an unrecognised operator never fails it. Both mirror
+    how the DSL has always been interpreted.
+    """
+    metric: str
+    op: Optional[str]
+    threshold: float = 0.0
+
+    @classmethod
+    def compile(cls, metric: str, condition: Any) -> "Condition":
+        try:
+            op, threshold = condition.split()
+            return cls(metric, op, float(threshold))
+        except Exception:
+            return cls(metric, None)
+
+    def test(self, value: Any) -> bool:
+        if self.op is None:
+            return False
+        compare = OPERATORS.get(self.op)
+        if compare is None:
+            return True
+        try:
+            return bool(compare(value, self.threshold))
+        except Exception:
+            return False
+
+    def mask(self, column: pd.Series) -> np.ndarray:
+        if self.op is None:
+            return np.zeros(len(column), dtype=bool)
+        compare = OPERATORS.get(self.op)
+        if compare is None:
+            return np.ones(len(column), dtype=bool)
+        try:
+            return np.asarray(compare(column, self.threshold), dtype=bool)
+        except Exception:
+            return np.zeros(len(column), dtype=bool)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule_id: Optional[str]
+    alert_type: Optional[str]
+    severity: Optional[str]
+    description: Optional[str]
+    conditions: Tuple[Condition, ...]
+
+    @classmethod
+    def compile(cls, rule_def: Dict[str, Any]) -> "CompiledRule":
+        conditions = rule_def.get("when") or {}
+        return cls(
+            rule_id=rule_def.get("id"),
+            alert_type=rule_def.get("alert_type"),
+            severity=rule_def.get("severity"),
+            description=rule_def.get("description"),
+            conditions=tuple(Condition.compile(metric, cond) for metric, cond in conditions.items())
+        )
+
+    def matches(self, metrics: Dict[str, Any]) -> bool:
+        for condition in self.conditions:
+            # Metrics the participant has no value for are skipped, not failed
+            if condition.metric in metrics and not condition.test(metrics[condition.metric]):
+                return False
+        return True
+
+    def mask(self, features_df: pd.DataFrame) -> np.ndarray:
+        result = np.ones(len(features_df), dtype=bool)
+        for condition in self.conditions:
+            if condition.metric in features_df.columns:
+                result &= condition.mask(features_df[condition.metric])
+        return result
+
+    def alert(self) -> Dict[str, Any]:
+        return {
+            "rule_id": self.rule_id,
+            "type": self.alert_type,
+            "severity": self.severity,
+            "description": self.description
+        }
+
+
+class RuleValidationError(ValueError):
+    """
+    Raised by load_rule_set(strict=True) with every problem found, one
+    "<file>: <problem>" line each.
+    """
+
+
+def validate_rule_def(rule_def: Any) -> List[str]:
+    """
+    Problems that would make a rule silently never (or always) fire: a
+    missing id or alert_type, an empty 'when', or a clause that is not
+    "<operator> <number>" with a known operator.
+    """
+    if not isinstance(rule_def, dict):
+        return ["not a mapping"]
+    problems = [f"missing {key}" for key in ("id", "alert_type") if not rule_def.get(key)]
+    conditions = rule_def.get("when")
+    if not isinstance(conditions, dict) or not conditions:
+        problems.append("'when' must be a non-empty mapping")
+        return problems
+    for metric, condition in conditions.items():
+        parts = condition.split() if isinstance(condition, str) else []
+        if len(parts) != 2 or parts[0] not in OPERATORS:
+            problems.append(f"{metric}: expected '<{'|'.join(OPERATORS)}> <number>', got {condition!r}")
+            continue
+        try:
+            float(parts[1])
+        except ValueError:
+            problems.append(f"{metric}: threshold {parts[1]!r} is not a number")
+    return problems
+
+
+def rule_files(rules_dir: str) -> List[str]:
+    if not os.path.isdir(rules_dir):
+        return []
+    return [
+        os.path.join(rules_dir, filename) for filename in sorted(os.listdir(rules_dir))
+        if filename.endswith(".yaml") or filename.endswith(".yml")
+    ]
+
+
+def load_rule_set(rules_dir: str, strict: bool = False) -> Tuple[CompiledRule, ...]:
+    """
+    Reads and compiles every rule file in rules_dir.
+
+    By default files are taken as they are, as at startup. With strict=True
+    nothing is returned unless every file parses and validates, and rule ids
+    are unique; otherwise RuleValidationError lists what is wrong.
+    """
+    rules = []
+    problems = []
+    for path in rule_files(rules_dir):
+        name = os.path.basename(path)
+        try:
+            with open(path, "r") as f:
+                rule_def = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError) as e:
+            if not strict:
+                raise
+            problems.append(f"{name}: {e}")
+            continue
+        if not rule_def:
+            if strict:
+                problems.append(f"{name}: empty file")
+            continue
+        if strict:
+            file_problems = validate_rule_def(rule_def)
+            problems.extend(f"{name}: {problem}" for problem in file_problems)
+            if file_problems:
+                continue
+        rules.append(CompiledRule.compile(rule_def))
+
+    if strict:
+        seen = set()
+        for rule in rules:
+            if rule.rule_id in seen:
+                problems.append(f"duplicate rule id {rule.rule_id!r}")
+            seen.add(rule.rule_id)
+        if problems:
+            raise RuleValidationError("\n".join(problems))
+    return tuple(rules)
+
+
+@dataclass
+class FrameEvaluation:
+    """
+    Result of RuleEngine.evaluate_frame: a boolean mask per rule (keyed by
+    rule id, aligned with the frame's index) and the alerts for every row
+    that matched at least one rule.
+    """
+    masks: Dict[Optional[str], pd.Series] = field(default_factory=dict)
+    alerts: Dict[Hashable, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    @property
+    def any_match(self) -> pd.Series:
+        if not self.masks:
+            return pd.Series(dtype=bool)
+        return pd.concat(self.masks.values(), axis=1).any(axis=1)
+
 
 class RuleEngine:
+    """
+    The active rule set is an immutable tuple that reload() replaces in a
+    single assignment. Each evaluate call reads it once, so an evaluation
+    sees either the old set or the new one, never a mix of the two.
+    """
+
     def __init__(self, rules_dir: str):
-        self.rules = []
+        self.rules_dir = rules_dir
+        self.rules: Tuple[CompiledRule, ...] = ()
+        # Bumped on every reload that changed the active set
+        self.version = 0
         self.load_rules(rules_dir)
 
     def load_rules(self, rules_dir: str):
-        if not os.path.exists(rules_dir):
-            return
-            
-        for filename in os.listdir(rules_dir):
-            if filename.endswith(".yaml") or filename.endswith(".yml"):
-                with open(os.path.join(rules_dir, filename), "r") as f:
-                    rule_def = yaml.safe_load(f)
-                    self.rules.append(rule_def)
+        """
+        Loads rules/*.yaml and compiles each 'when' clause once.
+        """
+        self.rules = self.rules + load_rule_set(rules_dir)
+
+    def reload(self) -> bool:
+        """
+        Re-reads rules_dir and swaps in the new rule set if every file is
+        valid. Raises RuleValidationError, leaving the active set as it
+        was, if any is not. Returns whether the active set changed.
+        """
+        rules = load_rule_set(self.rules_dir, strict=True)
+        if rules == self.rules:
+            return False
+        self.rules = rules
+        self.version += 1
+        return True
 
     def evaluate(self, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Evaluates all loaded rules against a participant's metrics.
         Returns a list of triggered alerts.
         """
-        alerts = []
-        for rule in self.rules:
-            if self._check_rule(rule, metrics):
-                alerts.append({
-                    "rule_id": rule.get("id"),
-                    "type": rule.get("alert_type"),
-                    "severity": rule.get("severity"),
-                    "description": rule.get("description")
-                })
-        return alerts
-
-    def _check_rule(self, rule: Dict, metrics: Dict) -> bool:
-        """
-        Interprets the DSL 'when' conditions.
-        Supported operators: >, <, >=, <=, ==
-        """
-        conditions = rule.get("when", {})
-        for metric_name, condition in conditions.items():
-            if metric_name not in metrics:
-                continue
-                
-            value = metrics[metric_name]
-            
-            # Simple DSL parsing (e.g. "> 0.7")
-            try:
-                op, threshold = condition.split()
-                threshold = float(threshold)
-                
-                if op == ">" and not (value > threshold): return False
-                if op == "<" and not (value < threshold): return False
-                if op == ">=" and not (value >= threshold): return False
-                if op == "<=" and not (value <= threshold): return False
-                if op == "==" and not (value == threshold): return False
-            except:
-                # Fallback or error logging
-                return False
-                
-        return True
+        return [rule.alert() for rule in self.rules if rule.matches(metrics)]
+
+    def evaluate_frame(self, features_df: pd.DataFrame) -> FrameEvaluation:
+        """
+        Evaluates all rules against every row of a feature frame at once.
+        Same semantics as evaluate(); a metric missing from the frame's
+        columns is skipped for every row.
+        """
+        rules = self.rules
+        evaluation = FrameEvaluation()
+        matched = []
+        for rule in rules:
+            mask = rule.mask(features_df)
+            evaluation.masks[rule.rule_id] = pd.Series(mask, index=features_df.index)
+            matched.append(mask)
+
+        if matched:
+            hits = np.column_stack(matched)
+            for pos in np.flatnonzero(hits.any(axis=1)):
+                evaluation.alerts[features_df.index[pos]] = [
+                    rule.alert() for rule, hit in zip(rules, hits[pos]) if hit
+                ]
+        return evaluation
@@ -0,0 +1,92 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+from rules.rule_engine import RuleEngine, RuleValidationError, rule_files
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+def fingerprint(rules_dir: str) -> Fingerprint:
+    """
+    Name, mtime and size of every rule file; any edit, addition or removal changes it.
+    """
+    entries = []
+    for path in rule_files(rules_dir):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue  # Removed while listing
+        entries.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+class RuleWatcher:
+    """
+    Reloads a RuleEngine when its rule files change.
+
+    A background thread polls the rules directory every interval_s. Files
+    are parsed, validated and compiled on that thread; the event loop only
+    ever sees the finished rule set, swapped in by RuleEngine.reload(). A
+    change is applied once the files have stayed the same for one poll, so
+    a file still being written is not picked up half way. If any file is
+    invalid the whole reload is rejected, the active rules stay in force,
+    and the same files are not retried until they change again.
+    """
+
+    def __init__(self, engine: RuleEngine, interval_s: float = 2.0):
+        self.engine = engine
+        self.interval_s = interval_s
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._applied = fingerprint(engine.rules_dir)
+        self._pending: Optional[Fingerprint] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rule-watcher", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> bool:
+        """
+        One check of the rules directory. Returns whether the active rule set was replaced.
+        """
+        current = fingerprint(self.engine.rules_dir)
+        if current == self._applied:
+            self._pending = None
+            return False
+        if current != self._pending:
+            # Changed since the last poll: wait for it to settle
+            self._pending = current
+            return False
+
+        self._applied = current
+        self._pending = None
+        try:
+            changed = self.engine.reload()
+        except RuleValidationError as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"Rule reload rejected, keeping {len(self.engine.rules)} active rules:\n{e}")
+            return False
+        self.last_error = None
+        if changed:
+            self.reloads += 1
+            print(f"Rules reloaded: {len(self.engine.rules)} rules (v{self.engine.version})")
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Rule watcher error: {e}")
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class SlowConsumerPolicy(str, Enum):
+    DROP = "drop"              # oldest pending message is discarded
+    CONFLATE = "conflate"      # only the latest pending message per key is kept
+    DISCONNECT = "disconnect"  # the subscriber is closed and must reconnect
+    MERGE = "merge"            # pending messages with the same key are merged; disconnect when full
+
+
+class SubscriberClosed(Exception):
+    pass
+
+
+class Subscriber:
+    """
+    Bounded mailbox for one streaming client.
+
+    offer() never blocks the publisher: when the mailbox is full the slow
+    consumer policy decides what gives. The client side drains everything
+    pending in one go, so a burst is handed over without one await per message.
+
+    Under MERGE nothing is lost: a message whose key is already pending is
+    folded into it with merge(pending, new). When maxsize distinct keys are
+    pending, the subscriber is disconnected rather than lose one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 10000,
+        policy: str = SlowConsumerPolicy.DROP,
+        key: Optional[Callable[[Any], Hashable]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        merge: Optional[Callable[[Any, Any], Any]] = None
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = SlowConsumerPolicy(policy)
+        self.key = key or id
+        self.clock = clock
+        self.merge = merge
+        if self.policy == SlowConsumerPolicy.MERGE and merge is None:
+            raise ValueError("The merge policy needs a merge function")
+        self.closed = False
+
+        # Pending (enqueued_at, message) pairs, oldest first; keyed when conflating or merging
+        self._keyed = self.policy in (SlowConsumerPolicy.CONFLATE, SlowConsumerPolicy.MERGE)
+        self._pending = OrderedDict() if self._keyed else deque()
+        self._ready = asyncio.Event()
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+        self.last_delivery_lag_s = 0.0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def offer(self, messages: Iterable[Any]):
+        if self.closed:
+            return
+        now = self.clock()
+        for message in messages:
+            self.published += 1
+            if self._keyed:
+                key = self.key(message)
+                if key in self._pending:
+                    # Keep the original enqueue time so lag reflects the oldest undelivered update
+                    enqueued_at, pending = self._pending[key]
+                    if self.policy == SlowConsumerPolicy.MERGE:
+                        message = self.merge(pending, message)
+                    self._pending[key] = (enqueued_at, message)
+                    self.conflated += 1
+                    continue
+                if len(self._pending) >= self.maxsize:
+                    if self.policy == SlowConsumerPolicy.MERGE:
+                        self.close()
+                        return
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                self._pending[key] = (now, message)
+            else:
+                if len(self._pending) >= self.maxsize:
+                    if self.policy == SlowConsumerPolicy.DISCONNECT:
+                        self.close()
+                        return
+                    self._pending.popleft()
+                    self.dropped += 1
+                self._pending.append((now, message))
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._ready.set()
+
+    async def drain(self) -> List[Any]:
+        """
+        Waits until something is pending, then takes all of it.
+        Raises SubscriberClosed once the subscriber has been disconnected.
+        """
+        while not self._pending:
+            if self.closed:
+                raise SubscriberClosed(self.name)
+            self._ready.clear()
+            await self._ready.wait()
+        if self.closed:
+            raise SubscriberClosed(self.name)
+
+        pending = self._pending.values() if self._keyed else self._pending
+        entries = list(pending)
+        self._pending.clear()
+        self.last_delivery_lag_s = self.clock() - entries[0][0]
+        self.delivered += len(entries)
+        return [message for _, message in entries]
+
+    def close(self):
+        self.closed = True
+        self._pending.clear()
+        self._ready.set()
+
+    def lag_seconds(self) -> float:
+        """
+        Age of the oldest message still waiting for this subscriber.
+        """
+        if not self._pending:
+            return 0.0
+        oldest = next(iter(self._pending.values())) if self._keyed else self._pending[0]
+        return self.clock() - oldest[0]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "subscriber": self.name,
+            "policy": self.policy.value,
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "lag_seconds": self.lag_seconds(),
+            "last_delivery_lag_seconds": self.last_delivery_lag_s,
+            "closed": self.closed,
+        }
+
+
+class Broadcaster:
+    """
+    Fans messages out to every registered Subscriber.
+
+    publish() hands each subscriber the whole batch with a single
+    non-blocking offer(), so its cost is O(subscribers) calls per batch
+    and a stalled client can only ever hold maxsize messages.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 10000,
+        policy: str = SlowConsumerPolicy.DROP,
+        key: Optional[Callable[[Any], Hashable]] = None,
+        merge: Optional[Callable[[Any, Any], Any]] = None
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = SlowConsumerPolicy(policy)
+        self.key = key
+        self.merge = merge
+        self.subscribers: Dict[int, Subscriber] = {}
+        self._next_id = 0
+
+    def subscribe(self, peer: str = "") -> Subscriber:
+        self._next_id += 1
+        subscriber = Subscriber(
+            f"{self.name}-{self._next_id}" + (f" ({peer})" if peer else ""),
+            maxsize=self.maxsize,
+            policy=self.policy,
+            key=self.key,
+            merge=self.merge
+        )
+        self.subscribers[self._next_id] = subscriber
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        for sub_id, sub in list(self.subscribers.items()):
+            if sub is subscriber:
+                del self.subscribers[sub_id]
+        subscriber.close()
+
+    def publish(self, messages: List[Any]):
+        if not messages:
+            return
+        for subscriber in list(self.subscribers.values()):
+            subscriber.offer(messages)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [subscriber.metrics() for subscriber in self.subscribers.values()]
@@ -0,0 +1,24 @@
+import cases_pb2
+
+
+def merge_case_messages(pending: cases_pb2.SurveillanceCase, update: cases_pb2.SurveillanceCase) -> cases_pb2.SurveillanceCase:
+    """
+    Folds a case message into the one for the same case_id still waiting
+    for a subscriber, so a slow client receives one message carrying all of
+    the evidence instead of losing some.
+
+    Alerts and events are appended, and the case's current state (status,
+    priority, score, revision) is taken from the later message. An opened
+    case merged with its updates is still an opened case. Returns a new
+    message: the pending one is shared with other subscribers.
+    """
+    merged = cases_pb2.SurveillanceCase()
+    merged.CopyFrom(pending)
+    merged.alerts.extend(update.alerts)
+    merged.events.extend(update.events)
+    merged.status = update.status
+    merged.priority = update.priority
+    merged.ml_score = update.ml_score
+    merged.revision = update.revision
+    merged.is_update = pending.is_update and update.is_update
+    return merged
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 import trades_pb2 as trades__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0b\x63\x61ses.proto\x12\x0csurveillance\x1a\x0ctrades.proto\"N\n\tCaseEvent\x12\x11\n\ttimestamp\x18\x01 \x01(\t\x12\r\n\x05\x61\x63tor\x18\x02 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x03 \x01(\t\x12\x0f\n\x07\x64\x65tails\x18\x04 \x01(\t\"\xbc\x01\n\x10SurveillanceCase\x12\x0f\n\x07\x63\x61se_id\x18\x01 \x01(\t\x12\x16\n\x0eparticipant_id\x18\x02 \x01(\t\x12\x12\n\ninstrument\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x10\n\x08priority\x18\x05 \x01(\t\x12\x10\n\x08ml_score\x18\x06 \x01(\x01\x12\'\n\x06\x65vents\x18\x07 \x03(\x0b\x32\x17.surveillance.CaseEvent\x12\x0e\n\x06\x61lerts\x18\x08 \x03(\t2R\n\nCaseStream\x12\x44\n\x0bStreamCases\x12\x13.surveillance.Empty\x1a\x1e.surveillance.SurveillanceCase0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0b\x63\x61ses.proto\x12\x0csurveillance\x1a\x0ctrades.proto\"N\n\tCaseEvent\x12\x11\n\ttimestamp\x18\x01 \x01(\t\x12\r\n\x05\x61\x63tor\x18\x02 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x03 \x01(\t\x12\x0f\n\x07\x64\x65tails\x18\x04 \x01(\t\"\xa2\x02\n\x10SurveillanceCase\x12\x0f\n\x07\x63\x61se_id\x18\x01 \x01(\t\x12\x16\n\x0eparticipant_id\x18\x02 \x01(\t\x12\x12\n\ninstrument\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x10\n\x08priority\x18\x05 \x01(\t\x12\x10\n\x08ml_score\x18\x06 \x01(\x01\x12\'\n\x06\x65vents\x18\x07 \x03(\x0b\x32\x17.surveillance.CaseEvent\x12\x0e\n\x06\x61lerts\x18\x08 \x03(\t\x12\x10\n\x08revision\x18\t \x01(\x05\x12\x11\n\tis_update\x18\n \x01(\x08\x12\x17\n\x0fwindow_start_ns\x18\x0b \x01(\x03\x12\x12\n\nalert_type\x18\x0c \x01(\t\x12\x12\n\ncreated_at\x18\r \x01(\t\"\xff\x01\n\tCaseQuery\x12\x16\n\x0eparticipant_id\x18\x01 \x01(\t\x12\x12\n\ninstrument\x18\x02 \x01(\t\x12\x10\n\x08statuses\x18\x03 \x03(\t\x12\x12\n\npriorities\x18\x04 \x03(\t\x12\x16\n\tmin_score\x18\x05 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\tmax_score\x18\x06 \x01(\x01H\x01\x88\x01\x01\x12\x15\n\rcreated_after\x18\x07 \x01(\t\x12\x16\n\x0e\x63reated_before\x18\x08 \x01(\t\x12\x11\n\tpage_size\x18\t \x01(\x05\x12\x12\n\npage_token\x18\n \x01(\tB\x0c\n\n_min_scoreB\x0c\n\n_max_score\"R\n\x08\x43\x61sePage\x12-\n\x05\x63\x61ses\x18\x01 \x03(\x0b\x32\x1e.surveillance.SurveillanceCase\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"\x1e\n\x0b\x43\x61seRequest\x12\x0f\n\x07\x63\x61se_id\x18\x01 \x01(\t2\xd6\x01\n\nCaseStream\x12\x44\n\x0bStreamCases\x12\x13.surveillance.Empty\x1a\x1e.surveillance.SurveillanceCase0\x01\x12<\n\tListCases\x12\x17.surveillance.CaseQuery\x1a\x16.surveillance.CasePage\x12\x44\n\x07GetCase\x12\x19.surveillance.CaseRequest\x1a\x1e.surveillance.SurveillanceCaseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,7 +35,13 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_CASEEVENT']._serialized_start=43
   _globals['_CASEEVENT']._serialized_end=121
   _globals['_SURVEILLANCECASE']._serialized_start=124
-  _globals['_SURVEILLANCECASE']._serialized_end=312
-  _globals['_CASESTREAM']._serialized_start=314
-  _globals['_CASESTREAM']._serialized_end=396
+  _globals['_SURVEILLANCECASE']._serialized_end=414
+  _globals['_CASEQUERY']._serialized_start=417
+  _globals['_CASEQUERY']._serialized_end=672
+  _globals['_CASEPAGE']._serialized_start=674
+  _globals['_CASEPAGE']._serialized_end=756
+  _globals['_CASEREQUEST']._serialized_start=758
+  _globals['_CASEREQUEST']._serialized_end=788
+  _globals['_CASESTREAM']._serialized_start=791
+  _globals['_CASESTREAM']._serialized_end=1005
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,35 @@
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# The engine and the UI share one config.toml at the repository root
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.toml")
+
+
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reads config.toml (or $SURVEILLANCE_CONFIG). Returns an empty dict when the
+    file or a TOML parser is unavailable, so every setting falls back to its default.
+    """
+    path = path or os.environ.get("SURVEILLANCE_CONFIG", DEFAULT_CONFIG_PATH)
+    if tomllib is None or not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def get_setting(config: Dict[str, Any], section: str, key: str, default: Any = None) -> Any:
+    """
+    Looks up config[section][key], where section may be dotted (e.g. "thresholds.anomaly").
+    """
+    node = config
+    for part in section.split("."):
+        node = node.get(part, {})
+    return node.get(key, default)
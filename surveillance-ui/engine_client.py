@@ -0,0 +1,80 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+import grpc
+
+import cases_pb2_grpc
+import trades_pb2_grpc
+
+
+class EngineClient:
+    """
+    The UI's one connection to the engine: a background thread running an
+    asyncio loop, with a single grpc.aio channel on that loop shared by
+    the trade and case subscriptions and by scenario injection.
+
+    Tk code hands coroutines to submit() rather than starting threads or
+    event loops of its own; they run as tasks on the shared loop and use
+    the `trades` and `cases` stubs. The channel reconnects by itself, so a
+    restarted engine is picked up by one connection, not one per task.
+    """
+
+    def __init__(self, address: str = "localhost:50051"):
+        self.address = address
+        self.loop = asyncio.new_event_loop()
+        self.channel: Optional[grpc.aio.Channel] = None
+        self.trades: Optional[trades_pb2_grpc.TradeStreamStub] = None
+        self.cases: Optional[cases_pb2_grpc.CaseStreamStub] = None
+        self._thread = threading.Thread(target=self._run, name="engine-client", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        # A grpc.aio channel belongs to the loop it was created on
+        asyncio.run_coroutine_threadsafe(self._connect(), self.loop).result()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """
+        Schedules a coroutine on the shared loop from any thread. Failures
+        are printed; the returned future can be waited on for the result.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._report)
+        return future
+
+    def close(self, timeout: float = 2.0):
+        """
+        Cancels the running tasks, closes the channel and stops the loop.
+        """
+        if not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout)
+        except Exception as e:
+            print(f"Engine client did not shut down cleanly: {e!r}")
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+    async def _connect(self):
+        self.channel = grpc.aio.insecure_channel(self.address)
+        self.trades = trades_pb2_grpc.TradeStreamStub(self.channel)
+        self.cases = cases_pb2_grpc.CaseStreamStub(self.channel)
+
+    async def _shutdown(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.channel is not None:
+            await self.channel.close()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @staticmethod
+    def _report(future: concurrent.futures.Future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Engine client task failed: {future.exception()!r}")
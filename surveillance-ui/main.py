@@ -1,18 +1,44 @@
 import tkinter as tk
 from tkinter import ttk
-import threading
 import asyncio
+from collections import deque
+from config import get_setting, load_config
+from engine_client import EngineClient
 from tabs.trade_stream import TradeStreamTab
 from tabs.detection_signals import DetectionSignalsTab
 from tabs.cases import CasesTab
 from tabs.case_details import CaseDetailsTab
 from tabs.simulation import SimulationTab
 
+# Most recent cases listed when the case stream (re)connects
+CASE_BACKFILL = 500
+
+CONFIG = load_config()
+
+
+def drain(pending):
+    """
+    Takes everything queued so far. Safe while subscriber threads keep appending.
+    """
+    return [pending.popleft() for _ in range(len(pending))]
+
+
 class SurveillanceLabApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Crypto Market Surveillance Lab")
-        self.geometry("1200x800")
+        self.geometry(f"{get_setting(CONFIG, 'ui', 'window_width', 1200)}x{get_setting(CONFIG, 'ui', 'window_height', 800)}")
+        self.refresh_rate_ms = get_setting(CONFIG, "ui", "refresh_rate_ms", 100)
+        self.max_trade_rows = get_setting(CONFIG, "ui", "max_trade_rows", 2000)
+        self.max_signal_rows = get_setting(CONFIG, "ui", "max_signal_rows", 1000)
+        self.max_case_rows = get_setting(CONFIG, "ui", "max_case_rows", 5000)
+
+        # Filled by the subscriber threads, drained into the tabs every refresh_rate_ms.
+        # Trades and signals beyond what a tab keeps would be dropped anyway, so
+        # those queues are bounded; case changes must all be applied, in order.
+        self.pending_trades = deque(maxlen=self.max_trade_rows)
+        self.pending_signals = deque(maxlen=self.max_signal_rows)
+        self.pending_cases = deque()
         
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True)
@@ -25,92 +51,126 @@ class SurveillanceLabApp(tk.Tk):
         self.cases_tab = self.make_tab("Cases")
         self.detail_tab = self.make_tab("Case Details")
         self.sim_tab = self.make_tab("Simulation Control")
+
+        # One background event loop and gRPC channel for every call to the engine
+        self.client = EngineClient(get_setting(CONFIG, "ui", "engine_address", "localhost:50051"))
+        self.client.start()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        self.trade_stream = TradeStreamTab(self.trade_tab)
-        self.detection_signals = DetectionSignalsTab(self.signal_tab)
-        self.cases_view = CasesTab(self.cases_tab, app=self)
+        self.trade_stream = TradeStreamTab(self.trade_tab, max_rows=self.max_trade_rows)
+        self.detection_signals = DetectionSignalsTab(self.signal_tab, max_rows=self.max_signal_rows)
+        self.cases_view = CasesTab(self.cases_tab, app=self, max_rows=self.max_case_rows)
         self.case_details_view = CaseDetailsTab(self.detail_tab)
-        self.simulation_control = SimulationTab(self.sim_tab)
+        self.simulation_control = SimulationTab(self.sim_tab, client=self.client)
 
-        # Start background subscribers
-        threading.Thread(target=self.start_subscriber_thread, daemon=True).start()
-        threading.Thread(target=self.start_case_subscriber, daemon=True).start()
+        # Both subscriptions run on the client's loop and share its channel
+        self.client.submit(self.subscribe_to_trades())
+        self.client.submit(self.subscribe_to_cases())
+        self.after(self.refresh_rate_ms, self.flush_updates)
 
-    def start_subscriber_thread(self):
-        asyncio.run(self.subscribe_to_trades())
-
-    def start_case_subscriber(self):
-        asyncio.run(self.subscribe_to_cases())
+    def flush_updates(self):
+        """
+        Applies everything the subscribers queued since the last flush,
+        one batch and one redraw per tab, then schedules the next flush.
+        """
+        try:
+            if self.pending_trades:
+                self.trade_stream.add_trades(drain(self.pending_trades))
+            if self.pending_signals:
+                self.detection_signals.add_signals(drain(self.pending_signals))
+            if self.pending_cases:
+                self.cases_view.apply_changes(drain(self.pending_cases))
+        finally:
+            self.after(self.refresh_rate_ms, self.flush_updates)
 
     async def subscribe_to_cases(self):
         import grpc
         import cases_pb2
-        import cases_pb2_grpc
         import trades_pb2 # for Empty
         
         print("Connecting to Case Stream...")
-        async with grpc.aio.insecure_channel('localhost:50051') as channel:
-            stub = cases_pb2_grpc.CaseStreamStub(channel)
-            try:
-                while True:
-                    try:
-                        async for case in stub.StreamCases(trades_pb2.Empty()):
-                            # Map to UI model
-                            case_data = {
-                                "id": case.case_id,
-                                "participant": case.participant_id,
-                                "priority": case.priority,
-                                "score": f"{case.ml_score:.2f}",
-                                "status": case.status,
-                                "instrument": case.instrument
-                                # TODO: Add alerts once proto is fixed
-                                # "alerts": list(case.alerts)
-                            }
-                            
-                            # Update Cases Tab
-                            self.after(0, lambda d=case_data: self.cases_view.add_case(d))
-                            
-                            # Update Detection Signals (Alerts)
-                            # Infer rule type from priority and score
-                            if case.priority == "HIGH":
-                                rule = "SPOOFING"
-                            elif case.ml_score > 0.8:
-                                rule = "ANOMALY (ML)"
-                            else:
-                                rule = "WASH_TRADING"
-                            
-                            signal_data = {
-                                "time": "Now",
-                                "rule": rule,
-                                "symbol": case.instrument,
-                                "participant": case.participant_id
-                            }
-                            # Store rule type in case_data for investigation view
-                            case_data["rule_type"] = rule
-                            
-                            self.after(0, lambda d=signal_data: self.detection_signals.add_signal(d))
-                            
-                    except grpc.RpcError as e:
-                        print(f"Case Stream disconnected: {e}")
-                        await asyncio.sleep(5)
-            except asyncio.CancelledError:
-                pass
+        stub = self.client.cases
+        try:
+            while True:
+                try:
+                    stream = stub.StreamCases(trades_pb2.Empty())
+                    # The stream only carries new changes: list what was opened before we
+                    # connected (rows are keyed by case_id, so overlap with the stream is harmless)
+                    page = await stub.ListCases(cases_pb2.CaseQuery(page_size=CASE_BACKFILL))
+                    for case in reversed(page.cases):
+                        self.show_case(case, signal=False)
+                    async for case in stream:
+                        self.show_case(case)
+
+                except grpc.RpcError as e:
+                    print(f"Case Stream disconnected: {e}")
+                    await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            pass
+
+    def show_case(self, case, signal=True):
+        """
+        Shows a streamed or listed case (called from the subscriber thread).
+        """
+        # Map to UI model
+        case_data = {
+            "id": case.case_id,
+            "participant": case.participant_id,
+            "priority": case.priority,
+            "score": f"{case.ml_score:.2f}",
+            "status": case.status,
+            "instrument": case.instrument,
+            "created": case.created_at,
+            "revision": case.revision,
+            "alert_type": case.alert_type,
+            "alerts": list(case.alerts)
+        }
+
+        # Updates are deltas for a case already shown: refresh its row only
+        if case.is_update:
+            self.pending_cases.append(("update", case_data))
+            return
 
+        # Infer rule type from the case's alert type (older engines: priority and score)
+        if case.alert_type:
+            rule = "ANOMALY (ML)" if case.alert_type == "ML_ANOMALY" else case.alert_type
+        elif case.priority == "HIGH":
+            rule = "SPOOFING"
+        elif case.ml_score > 0.8:
+            rule = "ANOMALY (ML)"
+        else:
+            rule = "WASH_TRADING"
+        # Store rule type in case_data for investigation view
+        case_data["rule_type"] = rule
+
+        # Update Cases Tab
+        self.pending_cases.append(("add", case_data))
+
+        if not signal:
+            return
+
+        # Update Detection Signals (Alerts)
+        signal_data = {
+            "time": "Now",
+            "rule": rule,
+            "symbol": case.instrument,
+            "participant": case.participant_id
+        }
+        self.pending_signals.append(signal_data)
 
     async def subscribe_to_trades(self):
         import grpc
         import trades_pb2
-        import trades_pb2_grpc
         
         print("Connecting to Trade Stream...")
-        async with grpc.aio.insecure_channel('localhost:50051') as channel:
-            stub = trades_pb2_grpc.TradeStreamStub(channel)
-            try:
-                # Retry loop
-                while True:
-                    try:
-                        print("Subscribing...")
-                        async for trade in stub.Subscribe(trades_pb2.Empty()):
+        stub = self.client.trades
+        try:
+            # Retry loop
+            while True:
+                try:
+                    print("Subscribing...")
+                    async for batch in stub.SubscribeBatches(trades_pb2.Empty()):
+                        for trade in batch.trades:
                             # Convert to dict for UI
                             data = {
                                 "time": trade.event_time_ns, # Raw for now
@@ -121,16 +181,20 @@ class SurveillanceLabApp(tk.Tk):
                                 "qty": f"{trade.quantity:.4f}",
                                 "participant": trade.participant_id
                             }
-                            # Schedule UI update on main thread
-                            self.after(0, lambda d=data: self.trade_stream.add_trade(d))
-                    except grpc.RpcError as e:
-                        print(f"Stream disconnected: {e}. Retrying in 2s...")
-                        await asyncio.sleep(2)
-                    except Exception as e:
-                        print(f"Subscriber error: {e}")
-                        await asyncio.sleep(2)
-            except asyncio.CancelledError:
-                pass
+                            # Shown on the main thread by the next flush_updates()
+                            self.pending_trades.append(data)
+                except grpc.RpcError as e:
+                    print(f"Stream disconnected: {e}. Retrying in 2s...")
+                    await asyncio.sleep(2)
+                except Exception as e:
+                    print(f"Subscriber error: {e}")
+                    await asyncio.sleep(2)
+        except asyncio.CancelledError:
+            pass
+
+    def on_close(self):
+        self.client.close()
+        self.destroy()
 
     def make_tab(self, name):
         frame = ttk.Frame(self.notebook)
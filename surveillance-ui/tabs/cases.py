@@ -1,20 +1,25 @@
 from tkinter import ttk
 import tkinter as tk
+from tabs.virtual_tree import VirtualTreeview
 
 class CasesTab:
-    def __init__(self, parent, app=None):
+    def __init__(self, parent, app=None, max_rows=5000):
         self.frame = parent
         self.app = app
+        self.max_rows = max_rows
+        # Case data by case id, for the cases still listed
+        self.cases = {}
         self.setup_ui()
 
     def setup_ui(self):
         columns = ("case_id", "participant", "instrument", "status", "priority", "created")
-        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
+        self.view = VirtualTreeview(self.frame, columns, capacity=self.max_rows)
+        self.tree = self.view.tree
         
         for col in columns:
             self.tree.heading(col, text=col.capitalize())
             
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.view.frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         btn_frame = ttk.Frame(self.frame)
         btn_frame.pack(fill="x", padx=10, pady=5)
@@ -28,36 +33,63 @@ class CasesTab:
         self.btn_close = ttk.Button(btn_frame, text="Close Case", command=self.on_close)
         self.btn_close.pack(side="left", padx=5)
 
+    def apply_changes(self, changes):
+        """
+        Applies a batch of ("add", case) and ("update", delta) changes, in
+        order, and redraws the list once.
+        """
+        for kind, case in changes:
+            if kind == "update":
+                self.update_case(case)
+            else:
+                self.add_case(case)
+        self.view.refresh()
+
     def add_case(self, case):
         # Store case data for later retrieval
-        if not hasattr(self, 'cases'):
-            self.cases = {}
-        
         case_id = case.get("id", "")
         self.cases[case_id] = case
         
-        values = (
-            case_id,
+        # Rows are keyed by case id so updates can find them; the oldest
+        # cases are dropped once max_rows are listed
+        for evicted in self.view.add(self.row_values(case), key=case_id):
+            self.cases.pop(evicted, None)
+
+    def update_case(self, delta):
+        """
+        Applies a case update (a delta carrying only new evidence) to the
+        case's existing row.
+        """
+        if delta.get("id") not in self.cases:
+            # Never saw the opening message (e.g. conflated away): show it as new
+            self.add_case(delta)
+            return
+
+        case = self.cases[delta["id"]]
+        alerts = case.get("alerts", []) + delta.get("alerts", [])
+        case.update({k: v for k, v in delta.items() if k != "alerts"})
+        case["alerts"] = alerts
+        self.view.add(self.row_values(case), key=case["id"])
+
+    def row_values(self, case):
+        return (
+            case.get("id", ""),
             case.get("participant", ""),
             case.get("instrument", ""),
             case.get("status", ""),
             case.get("priority", ""),
             case.get("created", "")
         )
-        self.tree.insert("", 0, values=values)
 
     def on_open(self):
         print("Open Case clicked")
 
     def on_investigate(self):
-        selection = self.tree.selection()
-        if not selection:
+        case_id = self.view.selected
+        if case_id is None:
             return
         
-        item = self.tree.item(selection[0])
-        case_id = item['values'][0]
-        
-        if hasattr(self, 'cases') and case_id in self.cases:
+        if case_id in self.cases:
             case = self.cases[case_id]
             rule_type = case.get('rule_type', 'UNKNOWN')
             
@@ -80,6 +112,7 @@ Instrument: {case.get('instrument', 'N/A')}
 Status: {case.get('status', 'N/A')}
 Priority: {case.get('priority', 'N/A')}
 ML Score: {case.get('score', 'N/A')}
+Revision: {case.get('revision', 1)}
 
 VIOLATION TYPE: {rule_type}
 
@@ -1,18 +1,20 @@
-from tkinter import ttk
+from tabs.virtual_tree import VirtualTreeview
 
 class DetectionSignalsTab:
-    def __init__(self, parent):
+    def __init__(self, parent, max_rows=1000):
         self.frame = parent
+        self.max_rows = max_rows
         self.setup_ui()
 
     def setup_ui(self):
         columns = ("time_window", "participant", "type", "desc", "severity")
-        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
+        self.view = VirtualTreeview(self.frame, columns, capacity=self.max_rows)
+        self.tree = self.view.tree
         
         for col in columns:
             self.tree.heading(col, text=col.capitalize())
         
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.view.frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Tag configuration for severity
         self.tree.tag_configure("HIGH", background="#ffcccc")
@@ -20,11 +22,16 @@ class DetectionSignalsTab:
         self.tree.tag_configure("LOW", background="#ffffcc")
 
     def add_signal(self, signal):
-        values = (
-            signal.get("time_window", ""),
-            signal.get("participant", ""),
-            signal.get("type", ""),
-            signal.get("desc", ""),
-            signal.get("severity", "")
-        )
-        self.tree.insert("", 0, values=values, tags=(signal.get("severity", "LOW"),))
+        self.add_signals([signal])
+
+    def add_signals(self, signals):
+        for signal in signals:
+            values = (
+                signal.get("time_window", ""),
+                signal.get("participant", ""),
+                signal.get("type", ""),
+                signal.get("desc", ""),
+                signal.get("severity", "")
+            )
+            self.view.add(values, tags=(signal.get("severity", "LOW"),))
+        self.view.refresh()
@@ -1,23 +1,21 @@
 import asyncio
-import threading
 import tkinter as tk
 from tkinter import ttk
 
-def run_async(coro):
-    asyncio.run(coro)
-
 class SimulationTab:
-    def __init__(self, parent):
+    def __init__(self, parent, client):
         self.frame = parent
+        # Scenarios run on the app's EngineClient loop and channel
+        self.client = client
         self.setup_ui()
 
     def setup_ui(self):
         frame = ttk.Labelframe(self.frame, text="Scenario Injection")
         frame.pack(fill="x", padx=20, pady=20)
         
-        ttk.Button(frame, text="Inject Normal Trading", command=lambda: threading.Thread(target=run_async, args=(self.inject_normal(),)).start()).pack(fill="x", padx=10, pady=5)
-        ttk.Button(frame, text="Inject Spoofing Scenario", command=lambda: threading.Thread(target=run_async, args=(self.inject_spoofing(),)).start()).pack(fill="x", padx=10, pady=5)
-        ttk.Button(frame, text="Inject Wash Trading", command=lambda: threading.Thread(target=run_async, args=(self.inject_wash(),)).start()).pack(fill="x", padx=10, pady=5)
+        ttk.Button(frame, text="Inject Normal Trading", command=lambda: self.client.submit(self.inject_normal())).pack(fill="x", padx=10, pady=5)
+        ttk.Button(frame, text="Inject Spoofing Scenario", command=lambda: self.client.submit(self.inject_spoofing())).pack(fill="x", padx=10, pady=5)
+        ttk.Button(frame, text="Inject Wash Trading", command=lambda: self.client.submit(self.inject_wash())).pack(fill="x", padx=10, pady=5)
         
         ttk.Separator(frame, orient='horizontal').pack(fill='x', padx=10, pady=10)
         
@@ -61,37 +59,34 @@ class SimulationTab:
             {"time": 1, "venue": "CEX", "instrument": "BTC-USDT", "side": "BUY", "price": 42999.0, "qty": 0.02, "pid": "Alice"}
         ]
 
-        import grpc
         import trades_pb2
-        import trades_pb2_grpc
         import time
         from datetime import datetime
 
-        async with grpc.aio.insecure_channel('localhost:50051') as channel:
-            stub = trades_pb2_grpc.TradeStreamStub(channel)
+        stub = self.client.trades
+        
+        for s in scenarios:
+            trade = trades_pb2.CanonicalTrade(
+                event_time_ns=int(time.time() * 1e9),
+                venue=s["venue"],
+                instrument=s["instrument"],
+                side=s["side"],
+                price=s["price"],
+                quantity=s["qty"],
+                participant_id=s["pid"],
+                origin="CEX" if s["venue"] == "CEX" else "DEX",
+                order_id=f"ORD-{int(time.time())}",
+                execution_id=f"EXEC-{int(time.time())}"
+            )
+            
+            batch = trades_pb2.TradeBatch(trades=[trade])
+            try:
+                await stub.PublishTrades(batch)
+                print(f"Sent: {s['pid']} {s['side']} {s['qty']}")
+            except Exception as e:
+                print(f"Failed to send: {e}")
             
-            for s in scenarios:
-                trade = trades_pb2.CanonicalTrade(
-                    event_time_ns=int(time.time() * 1e9),
-                    venue=s["venue"],
-                    instrument=s["instrument"],
-                    side=s["side"],
-                    price=s["price"],
-                    quantity=s["qty"],
-                    participant_id=s["pid"],
-                    origin="CEX" if s["venue"] == "CEX" else "DEX",
-                    order_id=f"ORD-{int(time.time())}",
-                    execution_id=f"EXEC-{int(time.time())}"
-                )
-                
-                batch = trades_pb2.TradeBatch(trades=[trade])
-                try:
-                    await stub.PublishTrades(batch)
-                    print(f"Sent: {s['pid']} {s['side']} {s['qty']}")
-                except Exception as e:
-                    print(f"Failed to send: {e}")
-                
-                await asyncio.sleep(1.0) # Slow injection
+            await asyncio.sleep(1.0) # Slow injection
         
         self.add_narrative("\u2713 Normal trading complete - No suspicious patterns detected.")
 
@@ -114,40 +109,37 @@ class SimulationTab:
             {"time": 1, "venue": "CEX", "instrument": "BTC-USDT", "side": "SELL", "price": 43000.0, "qty": 0.5,  "pid": "Eve", "op": "EXECUTE"},
         ]
 
-        import grpc
         import trades_pb2
-        import trades_pb2_grpc
         import time
 
-        async with grpc.aio.insecure_channel('localhost:50051') as channel:
-            stub = trades_pb2_grpc.TradeStreamStub(channel)
+        stub = self.client.trades
+        
+        for s in scenarios:
+            # Map "op" to side for our feature extractor hack
+            # If op is CANCEL, we send side="CANCEL"
+            side = "CANCEL" if s["op"] == "CANCEL" else s["side"]
             
-            for s in scenarios:
-                # Map "op" to side for our feature extractor hack
-                # If op is CANCEL, we send side="CANCEL"
-                side = "CANCEL" if s["op"] == "CANCEL" else s["side"]
-                
-                trade = trades_pb2.CanonicalTrade(
-                    event_time_ns=int(time.time() * 1e9),
-                    venue=s["venue"],
-                    instrument=s["instrument"],
-                    side=side,
-                    price=s["price"],
-                    quantity=s["qty"],
-                    participant_id=s["pid"],
-                    origin="CEX",
-                    order_id=f"ORD-SPOOF-{int(time.time()*1000)}",
-                    execution_id=f"EXEC-{int(time.time()*1000)}"
-                )
-                
-                batch = trades_pb2.TradeBatch(trades=[trade])
-                try:
-                    await stub.PublishTrades(batch)
-                    print(f"Sent Spoof: {s['pid']} {side} {s['qty']}")
-                except Exception as e:
-                    print(f"Failed to send: {e}")
-                
-                await asyncio.sleep(0.5) 
+            trade = trades_pb2.CanonicalTrade(
+                event_time_ns=int(time.time() * 1e9),
+                venue=s["venue"],
+                instrument=s["instrument"],
+                side=side,
+                price=s["price"],
+                quantity=s["qty"],
+                participant_id=s["pid"],
+                origin="CEX",
+                order_id=f"ORD-SPOOF-{int(time.time()*1000)}",
+                execution_id=f"EXEC-{int(time.time()*1000)}"
+            )
+            
+            batch = trades_pb2.TradeBatch(trades=[trade])
+            try:
+                await stub.PublishTrades(batch)
+                print(f"Sent Spoof: {s['pid']} {side} {s['qty']}")
+            except Exception as e:
+                print(f"Failed to send: {e}")
+            
+            await asyncio.sleep(0.5) 
         
         self.add_narrative("🚨 Abnormal behavior detected! High cancel ratio observed.")
         self.add_narrative("📋 Case opened for review - Check Detection Signals tab.")
@@ -169,36 +161,33 @@ class SimulationTab:
             {"time": 2, "venue": "CEX", "instrument": "BTC-USDT", "side": "SELL", "price": 43000.0, "qty": 1.0, "pid": "Grace"},
         ]
 
-        import grpc
         import trades_pb2
-        import trades_pb2_grpc
         import time
 
-        async with grpc.aio.insecure_channel('localhost:50051') as channel:
-            stub = trades_pb2_grpc.TradeStreamStub(channel)
+        stub = self.client.trades
+        
+        for s in scenarios:
+            trade = trades_pb2.CanonicalTrade(
+                event_time_ns=int(time.time() * 1e9),
+                venue=s["venue"],
+                instrument=s["instrument"],
+                side=s["side"],
+                price=s["price"],
+                quantity=s["qty"],
+                participant_id=s["pid"],
+                origin="CEX",
+                order_id=f"ORD-WASH-{int(time.time()*1000)}",
+                execution_id=f"EXEC-{int(time.time()*1000)}"
+            )
+            
+            batch = trades_pb2.TradeBatch(trades=[trade])
+            try:
+                await stub.PublishTrades(batch)
+                print(f"Sent Wash: {s['pid']} {s['side']} {s['qty']}")
+            except Exception as e:
+                print(f"Failed to send: {e}")
             
-            for s in scenarios:
-                trade = trades_pb2.CanonicalTrade(
-                    event_time_ns=int(time.time() * 1e9),
-                    venue=s["venue"],
-                    instrument=s["instrument"],
-                    side=s["side"],
-                    price=s["price"],
-                    quantity=s["qty"],
-                    participant_id=s["pid"],
-                    origin="CEX",
-                    order_id=f"ORD-WASH-{int(time.time()*1000)}",
-                    execution_id=f"EXEC-{int(time.time()*1000)}"
-                )
-                
-                batch = trades_pb2.TradeBatch(trades=[trade])
-                try:
-                    await stub.PublishTrades(batch)
-                    print(f"Sent Wash: {s['pid']} {s['side']} {s['qty']}")
-                except Exception as e:
-                    print(f"Failed to send: {e}")
-                
-                await asyncio.sleep(0.5)
+            await asyncio.sleep(0.5)
         
         self.add_narrative("\ud83d\udea8 Suspicious pattern identified! Matched buy/sell orders detected.")
         self.add_narrative("\ud83d\udccb Wash trading case opened - Review Cases tab.")
@@ -1,29 +1,37 @@
-from tkinter import ttk
+from tabs.virtual_tree import VirtualTreeview
 
 class TradeStreamTab:
-    def __init__(self, parent):
+    def __init__(self, parent, max_rows=2000):
         self.frame = parent
+        self.max_rows = max_rows
         self.setup_ui()
 
     def setup_ui(self):
         columns = ("time", "venue", "instrument", "side", "price", "qty", "participant")
-        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
+        # Only the newest max_rows trades are kept, and only the visible ones are drawn
+        self.view = VirtualTreeview(self.frame, columns, capacity=self.max_rows)
+        self.tree = self.view.tree
         
         for col in columns:
             self.tree.heading(col, text=col.capitalize())
             self.tree.column(col, width=100)
             
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.view.frame.pack(fill="both", expand=True, padx=10, pady=10)
 
     def add_trade(self, trade):
-        # trade is expected to be a dict or object with matching fields
-        values = (
-            trade.get("time", ""),
-            trade.get("venue", ""),
-            trade.get("instrument", ""),
-            trade.get("side", ""),
-            trade.get("price", ""),
-            trade.get("qty", ""),
-            trade.get("participant", "")
-        )
-        self.tree.insert("", 0, values=values)
+        self.add_trades([trade])
+
+    def add_trades(self, trades):
+        # Each trade is expected to be a dict or object with matching fields
+        for trade in trades:
+            values = (
+                trade.get("time", ""),
+                trade.get("venue", ""),
+                trade.get("instrument", ""),
+                trade.get("side", ""),
+                trade.get("price", ""),
+                trade.get("qty", ""),
+                trade.get("participant", "")
+            )
+            self.view.add(values)
+        self.view.refresh()
@@ -0,0 +1,150 @@
+import itertools
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+# (key, values, tags) of one row
+Row = Tuple[Hashable, Tuple[Any, ...], Tuple[str, ...]]
+
+DEFAULT_ROW_HEIGHT = 20
+
+
+class RowRing:
+    """
+    The rows behind a VirtualTreeview, capped at capacity: adding a row
+    past it drops the oldest. Rows have keys so they can be updated in
+    place; rows added without one get a running number.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._rows: "OrderedDict[Hashable, Tuple[Tuple[Any, ...], Tuple[str, ...]]]" = OrderedDict()  # Oldest first
+        self._next_key = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def add(self, values: Sequence[Any], tags: Sequence[str] = (), key: Optional[Hashable] = None) -> List[Hashable]:
+        """
+        Adds a row as the newest, or replaces the row with this key where
+        it stands. Returns the keys of the rows evicted to make room.
+        """
+        if key is None:
+            key = next(self._next_key)
+        self._rows[key] = (tuple(values), tuple(tags))
+        evicted = []
+        while len(self._rows) > self.capacity:
+            evicted.append(self._rows.popitem(last=False)[0])
+        return evicted
+
+    def page(self, offset: int, count: int) -> List[Row]:
+        """
+        `count` rows, newest first, starting `offset` rows from the newest.
+        """
+        rows = itertools.islice(reversed(self._rows.items()), offset, offset + count)
+        return [(key, values, tags) for key, (values, tags) in rows]
+
+
+class VirtualTreeview:
+    """
+    A Treeview over a RowRing that only materialises the rows on screen.
+
+    The widget holds as many items as fit in its height; scrolling
+    rewrites their values instead of moving through thousands of items,
+    and only slots whose content changed are touched. Rows are added
+    with add() and drawn by refresh(), which callers run once per batch.
+    The newest row is at the top. When the view is scrolled away from the
+    top, new rows do not move it.
+
+    Pack or grid `frame`; configure headings, columns and tags on `tree`.
+    """
+
+    def __init__(self, parent, columns: Sequence[str], capacity: int):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.rows = RowRing(capacity)
+        self.offset = 0
+        self.selected: Optional[Hashable] = None
+        self._shown: List[Row] = []
+
+        self.tree.bind("<Configure>", lambda event: self.refresh())
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+
+    @property
+    def visible(self) -> int:
+        """
+        Rows that fit in the widget (at least one, before it is mapped).
+        """
+        try:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        except (ValueError, TypeError):
+            row_height = DEFAULT_ROW_HEIGHT
+        return max(1, self.tree.winfo_height() // row_height)
+
+    def add(self, values: Sequence[Any], tags: Sequence[str] = (), key: Optional[Hashable] = None) -> List[Hashable]:
+        """
+        Adds or replaces a row (see RowRing.add) without drawing it.
+        """
+        is_new = key is None or key not in self.rows
+        evicted = self.rows.add(values, tags, key)
+        if is_new and self.offset > 0:
+            # Scrolled down: keep the same rows on screen as new ones arrive above
+            self.offset += 1
+        return evicted
+
+    def refresh(self):
+        """
+        Draws the visible page of rows.
+        """
+        visible = self.visible
+        self.offset = max(0, min(self.offset, len(self.rows) - visible))
+        page = self.rows.page(self.offset, visible)
+
+        items = self.tree.get_children()
+        for slot in range(len(items), len(page)):
+            self.tree.insert("", "end", iid=f"slot{slot}")
+        if len(items) > len(page):
+            self.tree.delete(*items[len(page):])
+        for slot, row in enumerate(page):
+            if slot >= len(self._shown) or self._shown[slot] != row:
+                self.tree.item(f"slot{slot}", values=row[1], tags=row[2])
+        self._shown = page
+
+        # The selection follows its row, not the slot it was in
+        slots = [f"slot{slot}" for slot, row in enumerate(page) if row[0] == self.selected]
+        if tuple(slots) != self.tree.selection():
+            self.tree.selection_set(slots)
+
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), min(1.0, (self.offset + visible) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int):
+        self.offset += rows
+        self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.rows))
+        elif unit == "pages":
+            self.offset += int(amount) * self.visible
+        else:
+            self.offset += int(amount)
+        self.refresh()
+
+    def on_select(self, event=None):
+        for slot in self.tree.selection():
+            index = int(slot[len("slot"):])
+            if index < len(self._shown):
+                self.selected = self._shown[index][0]
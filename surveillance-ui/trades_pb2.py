@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0ctrades.proto\x12\x0csurveillance\"\xc9\x01\n\x0e\x43\x61nonicalTrade\x12\x15\n\revent_time_ns\x18\x01 \x01(\x03\x12\r\n\x05venue\x18\x02 \x01(\t\x12\x12\n\ninstrument\x18\x03 \x01(\t\x12\x0c\n\x04side\x18\x04 \x01(\t\x12\r\n\x05price\x18\x05 \x01(\x01\x12\x10\n\x08quantity\x18\x06 \x01(\x01\x12\x10\n\x08order_id\x18\x07 \x01(\t\x12\x14\n\x0c\x65xecution_id\x18\x08 \x01(\t\x12\x16\n\x0eparticipant_id\x18\t \x01(\t\x12\x0e\n\x06origin\x18\n \x01(\t\":\n\nTradeBatch\x12,\n\x06trades\x18\x01 \x03(\x0b\x32\x1c.surveillance.CanonicalTrade\"\'\n\x03\x41\x63k\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x07\n\x05\x45mpty2\x8d\x01\n\x0bTradeStream\x12<\n\rPublishTrades\x12\x18.surveillance.TradeBatch\x1a\x11.surveillance.Ack\x12@\n\tSubscribe\x12\x13.surveillance.Empty\x1a\x1c.surveillance.CanonicalTrade0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0ctrades.proto\x12\x0csurveillance\"\xc9\x01\n\x0e\x43\x61nonicalTrade\x12\x15\n\revent_time_ns\x18\x01 \x01(\x03\x12\r\n\x05venue\x18\x02 \x01(\t\x12\x12\n\ninstrument\x18\x03 \x01(\t\x12\x0c\n\x04side\x18\x04 \x01(\t\x12\r\n\x05price\x18\x05 \x01(\x01\x12\x10\n\x08quantity\x18\x06 \x01(\x01\x12\x10\n\x08order_id\x18\x07 \x01(\t\x12\x14\n\x0c\x65xecution_id\x18\x08 \x01(\t\x12\x16\n\x0eparticipant_id\x18\t \x01(\t\x12\x0e\n\x06origin\x18\n \x01(\t\"L\n\nTradeBatch\x12,\n\x06trades\x18\x01 \x03(\x0b\x32\x1c.surveillance.CanonicalTrade\x12\x10\n\x08sequence\x18\x02 \x01(\x04\"L\n\x03\x41\x63k\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\tretryable\x18\x03 \x01(\x08\x12\x10\n\x08sequence\x18\x04 \x01(\x04\"\x07\n\x05\x45mpty2\x99\x02\n\x0bTradeStream\x12<\n\rPublishTrades\x12\x18.surveillance.TradeBatch\x1a\x11.surveillance.Ack\x12\x45\n\x12PublishTradeStream\x12\x18.surveillance.TradeBatch\x1a\x11.surveillance.Ack(\x01\x30\x01\x12@\n\tSubscribe\x12\x13.surveillance.Empty\x1a\x1c.surveillance.CanonicalTrade0\x01\x12\x43\n\x10SubscribeBatches\x12\x13.surveillance.Empty\x1a\x18.surveillance.TradeBatch0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,11 +34,11 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_CANONICALTRADE']._serialized_start=31
   _globals['_CANONICALTRADE']._serialized_end=232
   _globals['_TRADEBATCH']._serialized_start=234
-  _globals['_TRADEBATCH']._serialized_end=292
-  _globals['_ACK']._serialized_start=294
-  _globals['_ACK']._serialized_end=333
-  _globals['_EMPTY']._serialized_start=335
-  _globals['_EMPTY']._serialized_end=342
-  _globals['_TRADESTREAM']._serialized_start=345
-  _globals['_TRADESTREAM']._serialized_end=486
+  _globals['_TRADEBATCH']._serialized_end=310
+  _globals['_ACK']._serialized_start=312
+  _globals['_ACK']._serialized_end=388
+  _globals['_EMPTY']._serialized_start=390
+  _globals['_EMPTY']._serialized_end=397
+  _globals['_TRADESTREAM']._serialized_start=400
+  _globals['_TRADESTREAM']._serialized_end=681
 # @@protoc_insertion_point(module_scope)
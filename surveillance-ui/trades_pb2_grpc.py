@@ -39,11 +39,21 @@ class TradeStreamStub(object):
                 request_serializer=trades__pb2.TradeBatch.SerializeToString,
                 response_deserializer=trades__pb2.Ack.FromString,
                 _registered_method=True)
+        self.PublishTradeStream = channel.stream_stream(
+                '/surveillance.TradeStream/PublishTradeStream',
+                request_serializer=trades__pb2.TradeBatch.SerializeToString,
+                response_deserializer=trades__pb2.Ack.FromString,
+                _registered_method=True)
         self.Subscribe = channel.unary_stream(
                 '/surveillance.TradeStream/Subscribe',
                 request_serializer=trades__pb2.Empty.SerializeToString,
                 response_deserializer=trades__pb2.CanonicalTrade.FromString,
                 _registered_method=True)
+        self.SubscribeBatches = channel.unary_stream(
+                '/surveillance.TradeStream/SubscribeBatches',
+                request_serializer=trades__pb2.Empty.SerializeToString,
+                response_deserializer=trades__pb2.TradeBatch.FromString,
+                _registered_method=True)
 
 
 class TradeStreamServicer(object):
@@ -55,12 +65,28 @@ class TradeStreamServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PublishTradeStream(self, request_iterator, context):
+        """Many batches in flight over one HTTP/2 stream. Acks are cumulative and
+        coalesced; a retryable nack means resend everything after its sequence
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Subscribe(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SubscribeBatches(self, request, context):
+        """Same feed, but each message carries every trade that was pending for the
+        subscriber, so a burst costs one write instead of one per trade
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_TradeStreamServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -69,11 +95,21 @@ def add_TradeStreamServicer_to_server(servicer, server):
                     request_deserializer=trades__pb2.TradeBatch.FromString,
                     response_serializer=trades__pb2.Ack.SerializeToString,
             ),
+            'PublishTradeStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PublishTradeStream,
+                    request_deserializer=trades__pb2.TradeBatch.FromString,
+                    response_serializer=trades__pb2.Ack.SerializeToString,
+            ),
             'Subscribe': grpc.unary_stream_rpc_method_handler(
                     servicer.Subscribe,
                     request_deserializer=trades__pb2.Empty.FromString,
                     response_serializer=trades__pb2.CanonicalTrade.SerializeToString,
             ),
+            'SubscribeBatches': grpc.unary_stream_rpc_method_handler(
+                    servicer.SubscribeBatches,
+                    request_deserializer=trades__pb2.Empty.FromString,
+                    response_serializer=trades__pb2.TradeBatch.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'surveillance.TradeStream', rpc_method_handlers)
@@ -112,6 +148,33 @@ class TradeStream(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def PublishTradeStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/surveillance.TradeStream/PublishTradeStream',
+            trades__pb2.TradeBatch.SerializeToString,
+            trades__pb2.Ack.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def Subscribe(request,
             target,
@@ -138,3 +201,30 @@ class TradeStream(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def SubscribeBatches(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/surveillance.TradeStream/SubscribeBatches',
+            trades__pb2.Empty.SerializeToString,
+            trades__pb2.TradeBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
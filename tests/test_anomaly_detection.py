@@ -0,0 +1,97 @@
+"""
+Unit tests for the anomaly detector and its background trainer
+"""
+
+import time
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from ml.anomaly_detection import AnomalyDetector
+from ml.model_trainer import BackgroundTrainer
+
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+
+
+def make_features(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({col: rng.random(n) for col in FEATURE_COLS})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnomalyDetector(unittest.TestCase):
+    def test_unfitted_scores_zero(self):
+        """Scoring before the first fit returns neutral scores"""
+        detector = AnomalyDetector()
+        scores = detector.score(make_features(5))
+        self.assertTrue((scores == 0.0).all())
+        self.assertEqual(detector.model_version, 0)
+        self.assertIsNone(detector.last_fit_time)
+        self.assertIsNone(detector.last_fit_timestamp)
+
+    def test_fit_swaps_in_new_version(self):
+        """Each fit publishes a new model snapshot"""
+        detector = AnomalyDetector()
+        detector.fit(make_features(50), FEATURE_COLS)
+        first = detector.current
+        detector.fit(make_features(50, seed=4), FEATURE_COLS)
+
+        self.assertEqual(first.version, 1)
+        self.assertEqual(detector.model_version, 2)
+        self.assertIsNot(detector.current.model, first.model)
+        self.assertIsNotNone(detector.last_fit_time)
+        self.assertLess(abs(detector.last_fit_timestamp - time.time()), 60)
+
+
+class TestBackgroundTrainer(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.detector = AnomalyDetector()
+        self.trainer = BackgroundTrainer(
+            self.detector, retrain_interval_s=60, retrain_min_rows=100, clock=self.clock
+        )
+        self.features = make_features(50)
+
+    def retrain(self):
+        started = self.trainer.maybe_retrain(lambda: self.features, FEATURE_COLS)
+        self.trainer.wait(timeout=30)
+        return started
+
+    def test_first_rows_trigger_initial_fit(self):
+        """An unfitted detector trains as soon as any rows are seen"""
+        self.trainer.observe(1)
+        self.assertTrue(self.retrain())
+        self.assertEqual(self.detector.model_version, 1)
+
+    def test_retrains_after_min_rows_or_interval(self):
+        """Retraining waits for enough new rows or the schedule"""
+        self.trainer.observe(1)
+        self.retrain()
+
+        self.trainer.observe(10)
+        self.assertFalse(self.retrain())
+
+        self.trainer.observe(90)
+        self.assertTrue(self.retrain())
+        self.assertEqual(self.detector.model_version, 2)
+
+        self.trainer.observe(1)
+        self.clock.now += 61
+        self.assertTrue(self.retrain())
+        self.assertEqual(self.detector.model_version, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
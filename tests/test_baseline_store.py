@@ -0,0 +1,126 @@
+"""
+Unit tests for the streaming baseline store
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from features.baseline_store import BaselineStore, KLLSketch, StreamingStat, MARKET
+
+
+class TestStreamingStat(unittest.TestCase):
+    def test_matches_pandas_without_decay(self):
+        values = np.random.default_rng(1).normal(10, 3, 1000)
+        stat = StreamingStat()
+        for v in values:
+            stat.update(v)
+        self.assertAlmostEqual(stat.mean, values.mean(), places=9)
+        self.assertAlmostEqual(stat.std, pd.Series(values).std(), places=9)
+
+    def test_merge_equals_single_stream(self):
+        values = np.random.default_rng(2).exponential(2.0, 600)
+        single, left, right = StreamingStat(), StreamingStat(), StreamingStat()
+        for i, v in enumerate(values):
+            single.update(v, now=float(i), half_life_s=100.0)
+            (left if i % 2 else right).update(v, now=float(i), half_life_s=100.0)
+        left.merge(right, half_life_s=100.0)
+        self.assertAlmostEqual(left.weight, single.weight, places=6)
+        self.assertAlmostEqual(left.mean, single.mean, delta=0.05)
+
+    def test_decay_forgets_old_values(self):
+        stat = StreamingStat()
+        for _ in range(100):
+            stat.update(0.0, now=0.0, half_life_s=10.0)
+        for _ in range(100):
+            stat.update(100.0, now=100.0, half_life_s=10.0)
+        # Ten half-lives later the old regime carries ~0.1% of the weight
+        self.assertGreater(stat.mean, 99.0)
+
+
+class TestKLLSketch(unittest.TestCase):
+    def test_quantile_within_tolerance_and_bounded(self):
+        values = np.random.default_rng(3).lognormal(0, 1, 50_000)
+        sketch = KLLSketch(k=200, seed=1)
+        for v in values:
+            sketch.update(float(v))
+        rank = (values < sketch.quantile(0.95)).mean()
+        self.assertAlmostEqual(rank, 0.95, delta=0.02)
+        self.assertLess(sum(len(c) for c in sketch.compactors), 1000)
+
+    def test_merge(self):
+        values = np.random.default_rng(4).normal(0, 1, 20_000)
+        a, b = KLLSketch(k=200, seed=1), KLLSketch(k=200, seed=2)
+        for v in values[:10_000]:
+            a.update(float(v))
+        for v in values[10_000:]:
+            b.update(float(v))
+        a.merge(b)
+        self.assertEqual(a.n, len(values))
+        rank = (values < a.quantile(0.5)).mean()
+        self.assertAlmostEqual(rank, 0.5, delta=0.02)
+
+
+class TestBaselineStore(unittest.TestCase):
+    def frame(self, instrument, values):
+        return pd.DataFrame({"instrument": instrument, "num_trades": values})
+
+    def test_market_baseline_matches_batch_stats(self):
+        values = np.arange(1, 101, dtype=float)
+        store = BaselineStore(["num_trades"], half_life_s=None)
+        store.update(self.frame("BTC-USDT", values))
+        stats = store.baselines()["num_trades"]
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.std, pd.Series(values).std())
+        self.assertAlmostEqual(stats.p95, np.quantile(values, 0.95), delta=1.0)
+
+    def test_sparse_instrument_falls_back_to_market(self):
+        store = BaselineStore(["num_trades"], half_life_s=None, min_segment_weight=30)
+        store.update(self.frame("BTC-USDT", np.full(100, 10.0)))
+        store.update(self.frame("ETH-USDC", np.full(5, 50.0)))
+        store.update(self.frame("SOL-USDT", np.full(40, 2.0)))
+
+        snapshot = store.snapshot(["ETH-USDC", "SOL-USDT"])
+        self.assertAlmostEqual(snapshot["SOL-USDT"]["num_trades"].mean, 2.0)
+        self.assertAlmostEqual(snapshot["ETH-USDC"]["num_trades"].mean, snapshot[MARKET]["num_trades"].mean)
+
+    def test_merge_across_workers(self):
+        values = np.random.default_rng(5).normal(20, 4, 400)
+        single = BaselineStore(["num_trades"], half_life_s=None)
+        single.update(self.frame("BTC-USDT", values))
+        a = BaselineStore(["num_trades"], half_life_s=None)
+        b = BaselineStore(["num_trades"], half_life_s=None)
+        a.update(self.frame("BTC-USDT", values[:150]))
+        b.update(self.frame("BTC-USDT", values[150:]))
+        a.merge(b)
+
+        merged, expected = a.baselines("BTC-USDT")["num_trades"], single.baselines("BTC-USDT")["num_trades"]
+        self.assertAlmostEqual(merged.mean, expected.mean, places=9)
+        self.assertAlmostEqual(merged.std, expected.std, places=9)
+
+    def test_nan_rows_skipped(self):
+        store = BaselineStore(["num_trades"], half_life_s=None)
+        store.update(self.frame("BTC-USDT", [1.0, np.nan, 3.0]))
+        self.assertAlmostEqual(store.baselines()["num_trades"].mean, 2.0)
+
+    def test_shared_snapshot_refreshes_at_most_every_refresh_s(self):
+        store = BaselineStore(["num_trades"], half_life_s=None, refresh_s=1.0)
+        store.update(self.frame("BTC-USDT", np.full(50, 10.0)))
+        first = store.shared_snapshot(now=100.0)
+        self.assertAlmostEqual(first["BTC-USDT"]["num_trades"].mean, 10.0)
+
+        store.update(self.frame("BTC-USDT", np.full(50, 20.0)))
+        cached = store.shared_snapshot(now=100.5)
+        self.assertIs(cached["BTC-USDT"], first["BTC-USDT"])
+        cached["ETH-USDC"] = {}
+        self.assertNotIn("ETH-USDC", store.shared_snapshot(now=100.5))
+        self.assertAlmostEqual(store.shared_snapshot(now=101.0)["BTC-USDT"]["num_trades"].mean, 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
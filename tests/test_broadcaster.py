@@ -0,0 +1,135 @@
+"""
+Unit tests for subscriber fan-out
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+import cases_pb2
+from streaming.broadcaster import Broadcaster, SlowConsumerPolicy, SubscriberClosed
+from streaming.case_deltas import merge_case_messages
+
+
+def trade(order_id, participant_id="Alice"):
+    return {"order_id": order_id, "participant_id": participant_id}
+
+
+class TestBroadcaster(unittest.TestCase):
+    def test_every_subscriber_gets_the_batch(self):
+        """One publish reaches all subscribers, drained in a single call"""
+        async def scenario():
+            broadcaster = Broadcaster("trades")
+            a, b = broadcaster.subscribe(), broadcaster.subscribe()
+            batch = [trade(1), trade(2)]
+            broadcaster.publish(batch)
+            received = await a.drain()
+            self.assertEqual(received, batch)
+            # The same objects are delivered, not copies
+            self.assertIs(received[0], batch[0])
+            self.assertEqual(await b.drain(), batch)
+
+        asyncio.run(scenario())
+
+    def test_drain_waits_for_publish(self):
+        """drain() suspends until something is published"""
+        async def scenario():
+            broadcaster = Broadcaster("trades")
+            subscriber = broadcaster.subscribe()
+            asyncio.get_running_loop().call_later(0.01, broadcaster.publish, [trade(1)])
+            self.assertEqual(await asyncio.wait_for(subscriber.drain(), 1), [trade(1)])
+
+        asyncio.run(scenario())
+
+    def test_drop_policy_bounds_slow_subscriber(self):
+        """A stalled subscriber never holds more than maxsize messages"""
+        async def scenario():
+            broadcaster = Broadcaster("trades", maxsize=3, policy=SlowConsumerPolicy.DROP)
+            slow = broadcaster.subscribe()
+            broadcaster.publish([trade(i) for i in range(10)])
+            self.assertEqual(len(slow), 3)
+            self.assertEqual([t["order_id"] for t in await slow.drain()], [7, 8, 9])
+            self.assertEqual(slow.metrics()["dropped"], 7)
+
+        asyncio.run(scenario())
+
+    def test_conflate_policy_keeps_latest_per_key(self):
+        """Pending messages with the same key collapse to the newest one"""
+        async def scenario():
+            broadcaster = Broadcaster(
+                "trades", maxsize=10, policy=SlowConsumerPolicy.CONFLATE, key=lambda t: t["participant_id"]
+            )
+            slow = broadcaster.subscribe()
+            broadcaster.publish([trade(1, "Alice"), trade(2, "Bob"), trade(3, "Alice")])
+            self.assertEqual([t["order_id"] for t in await slow.drain()], [3, 2])
+            self.assertEqual(slow.metrics()["conflated"], 1)
+
+        asyncio.run(scenario())
+
+    def test_merge_policy_keeps_every_case_delta(self):
+        """Deltas for a pending case are merged into it; overflow disconnects instead of dropping"""
+        async def scenario():
+            broadcaster = Broadcaster(
+                "cases", maxsize=2, policy=SlowConsumerPolicy.MERGE,
+                key=lambda c: c.case_id, merge=merge_case_messages
+            )
+            slow = broadcaster.subscribe()
+            opened = cases_pb2.SurveillanceCase(case_id="C1", alerts=["a"], priority="LOW", revision=1)
+            update = cases_pb2.SurveillanceCase(case_id="C1", alerts=["b"], priority="HIGH", revision=2, is_update=True)
+            broadcaster.publish([opened, cases_pb2.SurveillanceCase(case_id="C2"), update])
+            first, second = await slow.drain()
+            self.assertEqual((list(first.alerts), first.priority, first.revision, first.is_update), (["a", "b"], "HIGH", 2, False))
+            self.assertEqual(second.case_id, "C2")
+            self.assertEqual(list(opened.alerts), ["a"])
+
+            broadcaster.publish([cases_pb2.SurveillanceCase(case_id=f"C{i}") for i in range(3)])
+            with self.assertRaises(SubscriberClosed):
+                await slow.drain()
+
+        asyncio.run(scenario())
+
+    def test_disconnect_policy_closes_subscriber(self):
+        """Overflow closes the subscriber without affecting the others"""
+        async def scenario():
+            broadcaster = Broadcaster("trades", maxsize=2, policy=SlowConsumerPolicy.DISCONNECT)
+            slow = broadcaster.subscribe()
+            broadcaster.publish([trade(1)])
+            fast = broadcaster.subscribe()
+            broadcaster.publish([trade(2), trade(3)])
+            with self.assertRaises(SubscriberClosed):
+                await slow.drain()
+            self.assertEqual(len(await fast.drain()), 2)
+
+        asyncio.run(scenario())
+
+    def test_lag_metrics(self):
+        """Lag is the age of the oldest undelivered message"""
+        async def scenario():
+            now = [100.0]
+            broadcaster = Broadcaster("trades")
+            subscriber = broadcaster.subscribe()
+            subscriber.clock = lambda: now[0]
+            broadcaster.publish([trade(1)])
+            now[0] = 102.5
+            self.assertAlmostEqual(subscriber.metrics()["lag_seconds"], 2.5)
+            await subscriber.drain()
+            self.assertEqual(subscriber.metrics()["lag_seconds"], 0.0)
+            self.assertAlmostEqual(subscriber.metrics()["last_delivery_lag_seconds"], 2.5)
+
+        asyncio.run(scenario())
+
+    def test_unsubscribe_stops_delivery(self):
+        """An unsubscribed client receives nothing further"""
+        broadcaster = Broadcaster("trades")
+        subscriber = broadcaster.subscribe()
+        broadcaster.unsubscribe(subscriber)
+        broadcaster.publish([trade(1)])
+        self.assertEqual(len(subscriber), 0)
+        self.assertEqual(broadcaster.metrics(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
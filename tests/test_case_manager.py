@@ -51,5 +51,129 @@ class TestCaseManager(unittest.TestCase):
         self.assertEqual(case.resolution, "False positive")
 
 
+class TestCaseCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.case_manager = CaseManager(coalesce_ttl_s=60, clock=lambda: self.now[0])
+
+    def record(self, alerts, ml_score=0.5, priority="MEDIUM", alert_type="SPOOFING", window_start_ns=0):
+        return self.case_manager.record_finding(
+            participant_id="TestTrader",
+            instrument="BTC-USDT",
+            window_start_ns=window_start_ns,
+            alert_type=alert_type,
+            alerts=alerts,
+            ml_score=ml_score,
+            priority=priority
+        )
+
+    def test_repeat_finding_updates_same_case(self):
+        """The same window and alert type updates one case with a delta"""
+        spoof = {"rule_id": "spoofing_large_orders", "type": "SPOOFING"}
+        opened = self.record([spoof])
+        self.assertTrue(opened.is_new)
+
+        self.assertIsNone(self.record([spoof]))
+
+        evidence = {"feature": "num_trades", "value": 40.0}
+        update = self.record([spoof, evidence], ml_score=0.9, priority="HIGH")
+        self.assertFalse(update.is_new)
+        self.assertEqual(update.case.case_id, opened.case.case_id)
+        self.assertEqual(update.new_alerts, [evidence])
+        self.assertEqual(update.case.revision, 2)
+        self.assertEqual(update.case.priority, "HIGH")
+        self.assertEqual(len(self.case_manager.cases), 1)
+
+    def test_evidence_changes_below_display_precision_are_not_updates(self):
+        """Baseline jitter that does not change the shown explanation adds nothing"""
+        explanation = {"feature": "num_trades", "value": 40.0, "market_p95": 12.0001, "deviation_sigma": 3.5001}
+        self.record([explanation])
+        jittered = {**explanation, "market_p95": 12.0002, "deviation_sigma": 3.4999}
+        self.assertIsNone(self.record([jittered]))
+
+        moved = {**explanation, "market_p95": 12.5}
+        update = self.record([moved])
+        self.assertEqual(update.new_alerts, [moved])
+        self.assertEqual(update.case.revision, 2)
+
+    def test_score_and_priority_never_go_down(self):
+        """A lower score or priority is not an update"""
+        self.record([], ml_score=0.9, priority="HIGH")
+        self.assertIsNone(self.record([], ml_score=0.7, priority="MEDIUM"))
+        case = next(iter(self.case_manager.cases.values()))
+        self.assertEqual((case.ml_score, case.priority), (0.9, "HIGH"))
+
+    def test_different_window_or_type_opens_new_case(self):
+        """Each window and alert type gets its own case"""
+        self.record([])
+        self.assertTrue(self.record([], alert_type="WASH_TRADING").is_new)
+        self.assertTrue(self.record([], window_start_ns=300 * 10**9).is_new)
+        self.assertEqual(len(self.case_manager.cases), 3)
+
+    def test_ttl_expiry_opens_new_case(self):
+        """A key not seen for the TTL no longer coalesces"""
+        first = self.record([])
+        self.now[0] = 59
+        self.assertIsNone(self.record([]))
+        self.now[0] = 59 + 61
+        second = self.record([])
+        self.assertTrue(second.is_new)
+        self.assertNotEqual(first.case.case_id, second.case.case_id)
+
+    def test_closed_case_suppresses_findings_within_ttl(self):
+        """A closed case is not reopened while its key is live"""
+        opened = self.record([])
+        self.case_manager.close_case(opened.case.case_id, "analyst_001", "False positive")
+        self.assertIsNone(self.record([{"rule_id": "new"}], ml_score=0.99))
+        self.assertEqual(self.case_manager.suppressed, 1)
+        self.assertEqual(len(self.case_manager.cases), 1)
+
+
+class TestCaseQueries(unittest.TestCase):
+    def setUp(self):
+        self.case_manager = CaseManager()
+        self.cases = [
+            self.case_manager.open_case(f"P{i % 3}", ["BTC-USDT", "ETH-USDT"][i % 2], [], i / 10, "MEDIUM")
+            for i in range(10)
+        ]
+
+    def test_filters_newest_first(self):
+        """Index and field filters combine; results are newest first"""
+        cases, cursor = self.case_manager.list_cases(participant_id="P0", instrument="BTC-USDT")
+        self.assertEqual(cases, [self.cases[6], self.cases[0]])
+        self.assertIsNone(cursor)
+
+        self.case_manager.close_case(self.cases[8].case_id, "analyst_001", "False positive")
+        cases, _ = self.case_manager.list_cases(statuses={"OPEN"}, min_score=0.55, max_score=0.85)
+        self.assertEqual(cases, [self.cases[7], self.cases[6]])
+
+        created = self.cases[4].created_at
+        cases, _ = self.case_manager.list_cases(created_after=created, created_before=created + "~")
+        self.assertIn(self.cases[4], cases)
+        self.assertIsNone(self.case_manager.get_case("missing"))
+
+    def test_cursor_pagination(self):
+        """Following the cursor visits every match exactly once"""
+        seen, cursor = [], None
+        while True:
+            page, cursor = self.case_manager.list_cases(instrument="ETH-USDT", limit=2, cursor=cursor)
+            seen.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.cases[9::-2])
+
+    def test_scan_is_capped_per_call(self):
+        """A filter that rarely matches returns short pages until the cursor runs out"""
+        self.case_manager.close_case(self.cases[1].case_id, "analyst_001", "False positive")
+        pages, cursor = [], None
+        while True:
+            page, cursor = self.case_manager.list_cases(statuses={"CLOSED"}, limit=1, cursor=cursor, max_scan=3)
+            pages.append(page)
+            if cursor is None:
+                break
+        self.assertEqual(len(pages), 4)
+        self.assertEqual([case for page in pages for case in page], [self.cases[1]])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for SQLite case persistence
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from cases.case_manager import CaseManager, CaseStatus
+from cases.case_store import CaseStore, SqliteCaseStore, create_case_store
+
+
+class TestSqliteCaseStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cases.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_cases_survive_restart(self):
+        """Cases, their audit events and alerts are reloaded by a new CaseManager"""
+        store = SqliteCaseStore(self.path, commit_interval_s=0.01)
+        manager = CaseManager(store=store)
+        spoof = {"rule_id": "spoofing_large_orders", "type": "SPOOFING"}
+        opened = manager.record_finding("TestTrader", "BTC-USDT", 300, "SPOOFING", [spoof], 0.5, "MEDIUM")
+        manager.record_finding("TestTrader", "BTC-USDT", 300, "SPOOFING",
+                               [spoof, {"feature": "num_trades", "value": 9.0}], 0.9, "HIGH")
+        manager.start_investigation(opened.case.case_id, "analyst_001")
+        manager.close_case(opened.case.case_id, "analyst_001", "Confirmed")
+        store.close()
+
+        store = SqliteCaseStore(self.path)
+        reloaded = CaseManager(store=store).cases[opened.case.case_id]
+        store.close()
+        self.assertEqual(reloaded.status, CaseStatus.CLOSED.value)
+        self.assertEqual(reloaded.resolution, "Confirmed")
+        self.assertEqual((reloaded.priority, reloaded.ml_score, reloaded.revision), ("HIGH", 0.9, 2))
+        self.assertEqual((reloaded.window_start_ns, reloaded.alert_type), (300, "SPOOFING"))
+        self.assertEqual([e.action for e in reloaded.events],
+                         ["CASE_OPENED", "CASE_UPDATED", "INVESTIGATION_STARTED", "CASE_CLOSED"])
+        self.assertEqual(reloaded.alerts, opened.case.alerts)
+
+    def test_open_cases_keep_coalescing_after_restart(self):
+        """The same finding after a reopen updates the open case instead of opening another"""
+        store = SqliteCaseStore(self.path, commit_interval_s=0.01)
+        spoof = {"rule_id": "spoofing_large_orders", "type": "SPOOFING"}
+        opened = CaseManager(store=store).record_finding("TestTrader", "BTC-USDT", 300, "SPOOFING", [spoof], 0.5, "MEDIUM")
+        store.close()
+
+        store = SqliteCaseStore(self.path)
+        manager = CaseManager(store=store)
+        self.assertIsNone(manager.record_finding("TestTrader", "BTC-USDT", 300, "SPOOFING", [spoof], 0.5, "MEDIUM"))
+        update = manager.record_finding("TestTrader", "BTC-USDT", 300, "SPOOFING", [spoof], 0.9, "HIGH")
+        store.close()
+        self.assertFalse(update.is_new)
+        self.assertEqual(update.case.case_id, opened.case.case_id)
+        self.assertEqual(len(manager.cases), 1)
+
+    def test_changes_are_group_committed(self):
+        """Changes arriving within the commit interval share a transaction"""
+        store = SqliteCaseStore(self.path, commit_interval_s=0.2)
+        manager = CaseManager(store=store)
+        for i in range(200):
+            manager.open_case(f"P{i}", "BTC-USDT", [], 0.5, "MEDIUM")
+        store.flush(timeout=10)
+
+        self.assertEqual(store.committed, 200)
+        self.assertLess(store.commits, 10)
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0], 200)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        store.close()
+
+    def test_factory(self):
+        """[database] settings pick the backend"""
+        self.assertIs(type(create_case_store({"enabled": False})), CaseStore)
+        with self.assertRaises(ValueError):
+            create_case_store({"enabled": True, "type": "postgresql"})
+        store = create_case_store({"enabled": True, "path": self.path})
+        self.assertIsInstance(store, SqliteCaseStore)
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Unit tests for the UI's shared engine client
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from concurrent import futures
+
+import grpc
+
+# Appended, not inserted: the UI's main and config modules must not shadow the engine's
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'surveillance-ui'))
+
+import trades_pb2
+import trades_pb2_grpc
+from engine_client import EngineClient
+
+
+class RecordingTradeStream(trades_pb2_grpc.TradeStreamServicer):
+    def __init__(self):
+        self.peers = set()
+        self.trades = 0
+
+    def PublishTrades(self, request, context):
+        self.peers.add(context.peer())
+        self.trades += len(request.trades)
+        return trades_pb2.Ack(success=True)
+
+
+class TestEngineClient(unittest.TestCase):
+    def setUp(self):
+        self.servicer = RecordingTradeStream()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        trades_pb2_grpc.add_TradeStreamServicer_to_server(self.servicer, self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+        self.addCleanup(self.server.stop, None)
+        self.client = EngineClient(f"localhost:{port}")
+        self.client.start()
+        self.addCleanup(self.client.close)
+
+    def test_calls_share_one_loop_and_connection(self):
+        """Work submitted from several threads runs on the client loop over one channel"""
+        async def publish(n):
+            self.assertIs(asyncio.get_running_loop(), self.client.loop)
+            batch = trades_pb2.TradeBatch(trades=[trades_pb2.CanonicalTrade(participant_id="P1")] * n)
+            return await self.client.trades.PublishTrades(batch)
+
+        submitted = []
+        threads = [threading.Thread(target=lambda n=n: submitted.append(self.client.submit(publish(n)))) for n in (1, 2, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(future.result(timeout=10).success for future in submitted))
+        self.assertEqual(self.servicer.trades, 6)
+        self.assertEqual(len(self.servicer.peers), 1)
+
+    def test_close_cancels_running_tasks(self):
+        """Long-running subscriptions are cancelled and the loop thread exits"""
+        future = self.client.submit(asyncio.sleep(3600))
+        self.client.close()
+        self.assertTrue(future.cancelled())
+        self.assertFalse(self.client._thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Unit tests for anomaly explanations
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from features.feature_stats import FeatureStats
+from ml.explainability import explain_anomalies, explain_anomaly, with_description
+
+MARKET = {
+    "num_trades": FeatureStats(mean=5.0, std=2.0, p95=9.0),
+    "avg_quantity": FeatureStats(mean=1.0, std=0.5, p95=2.0),
+    "venue_switch_count": FeatureStats(mean=1.0, std=0.0, p95=1.0),
+}
+ETH = {
+    "num_trades": FeatureStats(mean=50.0, std=10.0, p95=70.0),
+}
+
+
+class TestExplainAnomalies(unittest.TestCase):
+    def test_batch_matches_row_by_row(self):
+        """Every row gets the evidence explain_anomaly gives it against its instrument's baselines"""
+        rng = np.random.default_rng(3)
+        features = pd.DataFrame({
+            "participant_id": [f"P{i}" for i in range(200)],
+            "instrument": rng.choice(["BTC-USDT", "ETH-USDT"], 200),
+            "num_trades": rng.integers(0, 100, 200).astype(float),
+            "avg_quantity": rng.lognormal(0.0, 1.0, 200),
+            "venue_switch_count": rng.integers(0, 4, 200).astype(float),
+        })
+        features.loc[5, "avg_quantity"] = np.nan
+        baselines = {None: MARKET, "ETH-USDT": ETH}
+
+        batch = explain_anomalies(features, baselines)
+        expected = [
+            explain_anomaly(row, baselines.get(row["instrument"]) or baselines[None])
+            for row in features.to_dict("records")
+        ]
+        self.assertEqual(batch, expected)
+        self.assertTrue(any(batch))
+
+    def test_rows_without_baselines_get_no_evidence(self):
+        """No baselines, or none for the frame's features, means empty evidence per row"""
+        features = pd.DataFrame({"participant_id": ["P1", "P2"], "instrument": ["X", "Y"], "num_trades": [99.0, 1.0]})
+        self.assertEqual(explain_anomalies(features, {}), [[], []])
+        self.assertEqual(explain_anomalies(features.iloc[:0], {None: MARKET}), [])
+
+    def test_description_is_added_on_demand(self):
+        """Descriptions are built by with_description; rule alerts pass through unchanged"""
+        evidence = explain_anomaly({"num_trades": 13.0}, MARKET)[0]
+        self.assertNotIn("description", evidence)
+        shown = with_description(evidence)
+        self.assertEqual(
+            shown["description"],
+            "Participant value (13.0) exceeded market 95th percentile (9.0) by 4.0x standard deviations."
+        )
+        # Rounded once for display, not from already rounded evidence
+        near = with_description(explain_anomaly({"num_trades": 7.098}, {"num_trades": FeatureStats(mean=5.0, std=2.0, p95=7.0)})[0])
+        self.assertEqual((near["deviation_sigma"], near["value"]), (1.05, 7.098))
+        self.assertIn("by 1.0x standard deviations", near["description"])
+        self.assertNotIn("description", evidence)
+        rule_alert = {"rule_id": "SPOOF_01", "type": "SPOOFING"}
+        self.assertIs(with_description(rule_alert), rule_alert)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for feature extraction
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from features.feature_extraction import extract_features, extract_features_reference
+from features.window_aggregator import WindowAggregator
+
+BASE_NS = 1_700_000_000_000_000_000
+
+
+def make_trades(n, seed=7):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "event_time": BASE_NS + int(rng.integers(0, 12 * 60 * 10**9)),
+            "venue": str(rng.choice(["CEX", "DEX", "OTC"])),
+            "instrument": str(rng.choice(["BTC-USDT", "ETH-USDC"])),
+            "side": str(rng.choice(["BUY", "SELL", "CANCEL"])),
+            "price": 43000.0,
+            "quantity": float(rng.choice([1.0, 2.0, 0.5, 7.5])),
+            "participant_id": str(rng.choice(["Alice", "Bob", "Eve"])),
+        }
+        for _ in range(n)
+    ]
+
+
+class TestExtractFeatures(unittest.TestCase):
+    def test_matches_reference(self):
+        """Columnar implementation gives the same frame as the per-group reference"""
+        trades = pd.DataFrame(make_trades(2000))
+        expected = extract_features_reference(trades.copy())
+        actual = extract_features(trades.copy())
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_cancel_only_window(self):
+        """A window with only cancels has no executions and a cancel ratio of 1"""
+        trades = [dict(t, side="CANCEL", participant_id="Eve") for t in make_trades(5)]
+        features = extract_features(pd.DataFrame(trades))
+        self.assertTrue((features["num_trades"] == 0).all())
+        self.assertTrue((features["cancel_ratio"] == 1.0).all())
+        self.assertTrue((features["avg_quantity"] == 0.0).all())
+
+
+class TestWindowAggregator(unittest.TestCase):
+    def test_matches_extract_features(self):
+        """Incremental tallies give the same rows as a full recompute"""
+        trades = make_trades(400)
+        aggregator = WindowAggregator(window="5min", retention="1h")
+        for i in range(0, len(trades), 7):
+            aggregator.update(trades[i:i + 7])
+
+        expected = extract_features(pd.DataFrame(trades))
+        actual = aggregator.features()
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_update_returns_only_changed_windows(self):
+        """A single trade only touches its own window"""
+        aggregator = WindowAggregator(window="5min", retention="1h")
+        aggregator.update(make_trades(200))
+        trade = dict(make_trades(1, seed=1)[0], participant_id="Mallory")
+
+        changed = aggregator.update([trade])
+        self.assertEqual(len(changed), 1)
+        self.assertEqual(next(iter(changed))[0], "Mallory")
+        self.assertEqual(len(aggregator.features(changed)), 1)
+
+    def test_evicts_windows_past_retention(self):
+        """Windows older than the retention horizon are dropped"""
+        aggregator = WindowAggregator(window="5min", retention="5min")
+        trade = make_trades(1)[0]
+        aggregator.update([dict(trade, event_time=BASE_NS)])
+        aggregator.update([dict(trade, event_time=BASE_NS + 20 * 60 * 10**9)])
+
+        self.assertEqual(len(aggregator), 1)
+        changed = aggregator.update([dict(trade, event_time=BASE_NS)])
+        self.assertEqual(changed, set())
+        self.assertEqual(aggregator.late_trades, 1)
+
+    def test_take_closed_hands_out_each_window_once(self):
+        """Closed windows are handed out once, even if evicted in the same batch"""
+        aggregator = WindowAggregator(window="5min", retention="5min")
+        trade = make_trades(1)[0]
+        aggregator.update([dict(trade, event_time=BASE_NS)])
+        self.assertTrue(aggregator.take_closed().empty)
+
+        aggregator.update([dict(trade, event_time=BASE_NS + 20 * 60 * 10**9)])
+        closed = aggregator.take_closed()
+        self.assertEqual(len(closed), 1)
+        self.assertEqual(closed["num_trades"].iloc[0], 1)
+        self.assertTrue(aggregator.take_closed().empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
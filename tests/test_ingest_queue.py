@@ -0,0 +1,74 @@
+"""
+Unit tests for the bounded ingest queue
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from ingest.ingest_queue import BatchTooLarge, IngestQueue, OverflowPolicy
+
+
+def trades(*ids):
+    return [{"order_id": i} for i in ids]
+
+
+class TestIngestQueue(unittest.TestCase):
+    def test_reject_policy_refuses_whole_batch(self):
+        """A batch that does not fit is rejected without enqueueing any of it"""
+        async def scenario():
+            queue = IngestQueue(maxsize=3, policy=OverflowPolicy.REJECT)
+            self.assertTrue(await queue.put_batch(trades(1, 2)))
+            self.assertFalse(await queue.put_batch(trades(3, 4)))
+            self.assertEqual(queue.qsize(), 2)
+            self.assertEqual(queue.rejected, 2)
+
+            # Larger than the whole queue: retrying could never succeed
+            with self.assertRaises(BatchTooLarge):
+                await queue.put_batch(trades(5, 6, 7, 8))
+            self.assertEqual(queue.qsize(), 2)
+
+        asyncio.run(scenario())
+
+    def test_drop_oldest_policy_keeps_newest(self):
+        """Overflow discards the oldest queued trades"""
+        async def scenario():
+            queue = IngestQueue(maxsize=3, policy=OverflowPolicy.DROP_OLDEST)
+            await queue.put_batch(trades(1, 2, 3, 4, 5))
+            batch = await queue.get_batch()
+            self.assertEqual([t["order_id"] for t in batch], [3, 4, 5])
+            self.assertEqual(queue.dropped, 2)
+
+        asyncio.run(scenario())
+
+    def test_block_policy_waits_for_consumer(self):
+        """A blocked producer resumes once the worker drains the queue"""
+        async def scenario():
+            queue = IngestQueue(maxsize=2, policy=OverflowPolicy.BLOCK)
+            producer = asyncio.create_task(queue.put_batch(trades(1, 2, 3)))
+            await asyncio.sleep(0)
+            self.assertFalse(producer.done())
+
+            first = await queue.get_batch()
+            self.assertTrue(await producer)
+            second = await queue.get_batch()
+            self.assertEqual([t["order_id"] for t in first + second], [1, 2, 3])
+
+        asyncio.run(scenario())
+
+    def test_get_batch_respects_max_batch_size(self):
+        """The worker drains at most max_batch_size trades per cycle"""
+        async def scenario():
+            queue = IngestQueue(maxsize=10, max_batch_size=4)
+            await queue.put_batch(trades(*range(6)))
+            self.assertEqual(len(await queue.get_batch()), 4)
+            self.assertEqual(len(await queue.get_batch()), 2)
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the metrics registry and its HTTP endpoint
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from metrics.http_server import MetricsServer
+from metrics.registry import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_counter_and_labelled_gauge_render(self):
+        """Counters and labelled callbacks render in the text exposition format"""
+        registry = MetricsRegistry()
+        trades = registry.counter("trades_total", "Trades")
+        trades.inc(3)
+        trades.inc()
+        registry.callback("backlog", "Backlog", lambda: [(("cases", 'a"b'), 7)], labels=("stream", "subscriber"))
+
+        text = registry.render()
+        self.assertIn("# TYPE trades_total counter\ntrades_total 4\n", text)
+        self.assertIn('backlog{stream="cases",subscriber="a\\"b"} 7\n', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Observations land in the first bucket whose bound they do not exceed"""
+        registry = MetricsRegistry()
+        stage = registry.histogram("stage_seconds", "Stage time", labels=("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            stage.labels("score").observe(value)
+
+        lines = registry.render().splitlines()
+        self.assertIn('stage_seconds_bucket{stage="score",le="0.1"} 2', lines)
+        self.assertIn('stage_seconds_bucket{stage="score",le="1"} 3', lines)
+        self.assertIn('stage_seconds_bucket{stage="score",le="+Inf"} 4', lines)
+        self.assertIn('stage_seconds_sum{stage="score"} 3.65', lines)
+        self.assertIn('stage_seconds_count{stage="score"} 4', lines)
+
+    def test_failing_callback_does_not_break_scrape(self):
+        """A callback that raises is reported as a comment; other metrics still render"""
+        registry = MetricsRegistry()
+        registry.callback("broken", "Broken", lambda: 1 / 0)
+        registry.counter("ok_total", "Ok").inc()
+
+        text = registry.render()
+        self.assertIn("# broken unavailable", text)
+        self.assertIn("ok_total 1", text)
+
+
+class TestMetricsServer(unittest.TestCase):
+    def test_serves_metrics_over_http(self):
+        """GET /metrics returns the rendered registry; unknown paths are 404"""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests").inc(2)
+
+        async def get(port, path):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response.decode()
+
+        async def run():
+            server = MetricsServer(registry, host="127.0.0.1", port=0)
+            await server.start()
+            try:
+                return await get(server.port, "/metrics"), await get(server.port, "/missing")
+            finally:
+                await server.stop()
+
+        metrics, missing = asyncio.run(run())
+        self.assertTrue(metrics.startswith("HTTP/1.1 200 OK\r\n"))
+        self.assertIn("text/plain; version=0.0.4", metrics)
+        self.assertTrue(metrics.endswith("requests_total 2\n"))
+        self.assertTrue(missing.startswith("HTTP/1.1 404"))
+
+    def test_routes_are_per_method_and_slow_clients_time_out(self):
+        """A route answers only its methods, and a silent client gets 408"""
+        registry = MetricsRegistry()
+
+        async def request(port, method, path):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response.decode()
+
+        async def silent(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            response = await reader.read()
+            writer.close()
+            return response.decode()
+
+        async def run():
+            server = MetricsServer(registry, host="127.0.0.1", port=0, read_timeout_s=0.05)
+            server.route("/control", lambda query: (200, "text/plain", query.encode()), methods=("POST",))
+            await server.start()
+            try:
+                return (await request(server.port, "POST", "/metrics"), await request(server.port, "GET", "/control"),
+                        await request(server.port, "POST", "/control?x=1"), await silent(server.port))
+            finally:
+                await server.stop()
+
+        post_metrics, get_control, post_control, timed_out = asyncio.run(run())
+        self.assertTrue(post_metrics.startswith("HTTP/1.1 405"))
+        self.assertTrue(get_control.startswith("HTTP/1.1 405"))
+        self.assertTrue(post_control.startswith("HTTP/1.1 200"))
+        self.assertTrue(post_control.endswith("x=1"))
+        self.assertTrue(timed_out.startswith("HTTP/1.1 408"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the fitted model registry
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from ml.anomaly_detection import AnomalyDetector
+from ml.model_registry import ModelRegistry, create_model_registry
+from ml.model_trainer import BackgroundTrainer
+from pipeline.surveillance_pipeline import SurveillancePipeline
+
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+
+
+def make_features(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({col: rng.random(n) for col in FEATURE_COLS})
+
+
+def fitted_detector(times=1):
+    detector = AnomalyDetector()
+    for _ in range(times):
+        detector.fit(make_features(200), FEATURE_COLS)
+    return detector
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.registry = ModelRegistry(self.tmp.name, model_name="IsolationForest", model_version="v1", keep=2)
+
+    def test_saved_model_scores_identically(self):
+        """A loaded model scores like the one saved, and later fits continue its versions"""
+        detector = fitted_detector(times=3)
+        entry = self.registry.save(detector.current)
+        self.assertEqual((entry.model_name, entry.model_version, entry.version), ("IsolationForest", "v1", 3))
+
+        restored = AnomalyDetector()
+        restored.load(self.registry.load_latest(FEATURE_COLS))
+        features = make_features(50, seed=9)
+        pd.testing.assert_series_equal(restored.score(features), detector.score(features))
+        restored.fit(make_features(200), FEATURE_COLS)
+        self.assertEqual(restored.model_version, 4)
+
+    def test_incompatible_entries_are_skipped_and_old_ones_pruned(self):
+        """Only models fitted on the same columns with this scikit-learn load; keep bounds the registry"""
+        self.assertIsNone(self.registry.load_latest(FEATURE_COLS))
+        compatible = self.registry.save(fitted_detector().current)
+        other_cols = AnomalyDetector()
+        other_cols.fit(make_features(200), FEATURE_COLS[:2])
+        self.registry.save(other_cols.current)
+        self.assertEqual(self.registry.load_latest(FEATURE_COLS).feature_cols, FEATURE_COLS)
+
+        meta_path = compatible.path[:-len(".pkl")] + ".json"
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(meta_path, "w") as f:
+            json.dump({**meta, "sklearn_version": "0.0"}, f)
+        self.assertIsNone(self.registry.load_latest(FEATURE_COLS))
+        self.assertIsNone(ModelRegistry(self.tmp.name, model_version="v2").load_latest(FEATURE_COLS[:2]))
+
+        self.registry.save(fitted_detector().current)
+        self.assertEqual(len(self.registry.entries()), 2)
+        self.assertFalse(os.path.exists(compatible.path))
+
+    def test_pipeline_warm_loads_and_trainer_saves(self):
+        """A new pipeline scores with the saved model at once; every background fit is saved"""
+        detector = AnomalyDetector()
+        trainer = BackgroundTrainer(detector, executor=ThreadPoolExecutor(max_workers=1), registry=self.registry)
+        trainer.observe(200)
+        trainer.maybe_retrain(lambda: make_features(200), FEATURE_COLS)
+        trainer.wait()
+        self.assertEqual(self.registry.entries()[0].version, 1)
+
+        pipeline = SurveillancePipeline(
+            FEATURE_COLS, rules_dir=os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine', 'rules'),
+            model_registry=self.registry
+        )
+        self.assertTrue(pipeline.detector.is_fitted)
+        pipeline.trainer.observe(1)
+        self.assertFalse(pipeline.trainer.due())
+        self.assertIsNone(create_model_registry({"ml_model": {"registry_dir": ""}}))
+
+    def test_shards_get_their_own_directories(self):
+        """A shard's registry never lists models saved by another shard"""
+        config = {"ml_model": {"registry_dir": self.tmp.name}}
+        shard0 = create_model_registry(config, (0, 2))
+        shard1 = create_model_registry(config, (1, 2))
+        self.assertEqual(shard0.directory, os.path.join(self.tmp.name, "shard-0-of-2", "IsolationForest", "v1"))
+        shard0.save(fitted_detector().current)
+        self.assertEqual(len(shard0.entries()), 1)
+        self.assertEqual(shard1.entries(), [])
+        self.assertEqual(create_model_registry(config, (0, 4)).entries(), [])
+
+if __name__ == '__main__':
+    unittest.main()
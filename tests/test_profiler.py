@@ -0,0 +1,81 @@
+"""
+Unit tests for the surveillance cycle profiler
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from metrics.profiler import CycleProfiler
+
+
+def busy_stage(seconds=0.03):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestCycleProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_samples_every_nth_cycle_and_writes_reports(self):
+        """Sample mode profiles every Nth cycle and writes hot functions and collapsed stacks when the window turns over"""
+        profiler = CycleProfiler(enabled=True, every_n=2, window=2, sample_interval_s=0.001, output_dir=self.tmp.name)
+        for _ in range(4):
+            with profiler.profile():
+                busy_stage()
+
+        self.assertEqual(profiler.cycles, 4)
+        self.assertEqual(profiler.profiled, 2)
+        self.assertEqual(profiler.reports_written, 1)
+        with open(os.path.join(self.tmp.name, "stacks.collapsed")) as f:
+            collapsed = f.read()
+        with open(os.path.join(self.tmp.name, "hot_functions.txt")) as f:
+            hot = f.read()
+        # Root-first frames separated by ";" and a sample count
+        line = next(l for l in collapsed.splitlines() if "busy_stage" in l)
+        frames, count = line.rsplit(" ", 1)
+        self.assertTrue(frames.split(";")[-1].startswith("busy_stage"))
+        self.assertGreater(int(count), 0)
+        self.assertIn("busy_stage (test_profiler.py", hot)
+
+    def test_cprofile_mode(self):
+        """cprofile mode reports exact per-function statistics"""
+        profiler = CycleProfiler(enabled=True, mode="cprofile", every_n=1, window=5, output_dir=self.tmp.name)
+        with profiler.profile():
+            busy_stage(0.005)
+
+        self.assertIn("busy_stage", profiler.hot_functions())
+        profiler.write_reports()
+        self.assertEqual(os.listdir(self.tmp.name), ["hot_functions.txt"])
+
+    def test_runtime_toggle(self):
+        """Nothing is profiled while disabled; switching on over HTTP takes effect from the next cycle"""
+        profiler = CycleProfiler(enabled=False, every_n=1, window=10, output_dir=self.tmp.name)
+        with profiler.profile():
+            busy_stage(0.005)
+        self.assertEqual(profiler.profiled, 0)
+
+        status, content_type, body = profiler.status_http("")
+        self.assertFalse(json.loads(body)["enabled"])
+        status, content_type, body = profiler.handle_http("enabled=1")
+        self.assertEqual((status, content_type), (200, "application/json"))
+        self.assertTrue(json.loads(body)["enabled"])
+        with profiler.profile():
+            busy_stage(0.005)
+        self.assertEqual(profiler.profiled, 1)
+
+        # Switching off writes what was gathered
+        profiler.toggle()
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(profiler.reports_written, 1)
+
+if __name__ == '__main__':
+    unittest.main()
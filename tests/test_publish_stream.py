@@ -0,0 +1,154 @@
+"""
+Unit tests for the streaming publish RPC
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+import grpc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+import trades_pb2
+import trades_pb2_grpc
+from ingest.ingest_queue import BatchTooLarge
+from ingest.publish_stream import serve_publish_stream
+from ingest.trade_producer import StreamingTradePublisher
+
+
+def batch(sequence, n=1):
+    trades = [trades_pb2.CanonicalTrade(order_id=f"{sequence}-{i}") for i in range(n)]
+    return trades_pb2.TradeBatch(trades=trades, sequence=sequence)
+
+
+async def iterate(batches):
+    for b in batches:
+        yield b
+
+
+class Recorder:
+    """accept() stand-in that refuses the sequences listed in reject (once each)"""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.accepted = []
+        self.trades = 0
+
+    async def __call__(self, b):
+        if b.sequence in self.reject:
+            self.reject.discard(b.sequence)
+            return False
+        self.accepted.append(b.sequence)
+        self.trades += len(b.trades)
+        return True
+
+
+class TestServePublishStream(unittest.TestCase):
+    def run_stream(self, batches, accept, ack_every=32):
+        async def scenario():
+            return [ack async for ack in serve_publish_stream(iterate(batches), accept, ack_every)]
+        return asyncio.run(scenario())
+
+    def test_acks_are_cumulative_and_coalesced(self):
+        """A burst gets one ack per ack_every batches plus one at the end"""
+        accept = Recorder()
+        acks = self.run_stream([batch(i) for i in range(1, 11)], accept, ack_every=4)
+        self.assertEqual(accept.accepted, list(range(1, 11)))
+        self.assertEqual([a.sequence for a in acks], [4, 8, 10])
+        self.assertTrue(all(a.success for a in acks))
+
+    def test_rejected_batch_is_nacked_and_followers_discarded(self):
+        """Go-back-N: after a refusal nothing is queued until the resend arrives"""
+        accept = Recorder(reject={3})
+        batches = [batch(i) for i in range(1, 6)] + [batch(i) for i in range(3, 6)]
+        acks = self.run_stream(batches, accept, ack_every=100)
+
+        self.assertEqual(accept.accepted, [1, 2, 3, 4, 5])
+        nacks = [a for a in acks if not a.success]
+        self.assertEqual(len(nacks), 1)
+        self.assertTrue(nacks[0].retryable)
+        self.assertEqual(nacks[0].sequence, 2)
+        self.assertEqual(acks[-1].sequence, 5)
+
+    def test_oversized_batch_ends_the_stream(self):
+        """A batch that can never fit is nacked as not retryable and nothing after it is read"""
+        accept = Recorder()
+
+        async def refuse_large(b):
+            if len(b.trades) > 2:
+                raise BatchTooLarge("too large")
+            return await accept(b)
+
+        acks = self.run_stream([batch(1), batch(2, n=3), batch(3)], refuse_large, ack_every=100)
+        self.assertEqual(accept.accepted, [1])
+        # The nack still acknowledges batch 1 cumulatively
+        self.assertEqual([(a.success, a.retryable, a.sequence) for a in acks], [(False, False, 1)])
+
+    def test_duplicates_ignored(self):
+        """Resends of already accepted batches are not queued twice"""
+        accept = Recorder()
+        acks = self.run_stream([batch(1), batch(2), batch(1), batch(2), batch(3)], accept)
+        self.assertEqual(accept.accepted, [1, 2, 3])
+        self.assertEqual(acks[-1].sequence, 3)
+
+    def test_unsequenced_batches_take_next_number(self):
+        """Sequence 0 means the producer does not number its batches"""
+        accept = Recorder()
+        acks = self.run_stream([batch(0), batch(0)], accept)
+        self.assertEqual(len(accept.accepted), 2)
+        self.assertEqual(acks[-1].sequence, 2)
+
+
+class PublishServicer(trades_pb2_grpc.TradeStreamServicer):
+    def __init__(self, accept):
+        self.accept = accept
+
+    async def PublishTradeStream(self, request_iterator, context):
+        async for ack in serve_publish_stream(request_iterator, self.accept, ack_every=8):
+            yield ack
+
+
+class TestStreamingTradePublisher(unittest.TestCase):
+    def publish_all(self, accept, publishes, **publisher_args):
+        async def scenario():
+            server = grpc.aio.server()
+            trades_pb2_grpc.add_TradeStreamServicer_to_server(PublishServicer(accept), server)
+            port = server.add_insecure_port("127.0.0.1:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                    stub = trades_pb2_grpc.TradeStreamStub(channel)
+                    async with StreamingTradePublisher(stub, **publisher_args) as publisher:
+                        for trades in publishes:
+                            await publisher.publish(trades)
+                    return publisher
+            finally:
+                await server.stop(None)
+
+        return asyncio.run(asyncio.wait_for(scenario(), 30))
+
+    def test_producer_resends_after_nack(self):
+        """Every batch arrives exactly once and in order despite refusals"""
+        accept = Recorder(reject={5, 17})
+        publishes = [batch(0, n=5).trades for _ in range(40)]
+        publisher = self.publish_all(accept, publishes, max_in_flight=50, max_batch_trades=5, retry_delay_s=0.01)
+
+        self.assertEqual(accept.accepted, list(range(1, 41)))
+        self.assertEqual(publisher.acked_sequence, 40)
+        self.assertEqual(publisher.in_flight, 0)
+        self.assertGreater(publisher.resent, 0)
+
+    def test_single_trade_publishes_are_coalesced(self):
+        """Back-to-back publish() calls share one stream message"""
+        accept = Recorder()
+        publisher = self.publish_all(accept, [batch(0).trades for _ in range(100)], max_batch_trades=30)
+
+        self.assertEqual(accept.trades, 100)
+        self.assertEqual(accept.accepted, [1, 2, 3, 4])
+        self.assertEqual(publisher.acked_sequence, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
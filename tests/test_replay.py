@@ -0,0 +1,112 @@
+"""
+Unit tests for the historical replay entry point
+"""
+
+import asyncio
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+import replay
+
+BASE_NS = 1_700_000_000_000_000_000
+
+
+def make_trades():
+    rows = []
+    for minute in range(12):
+        for p in range(20):
+            rows.append({
+                "event_time_ns": BASE_NS + (minute * 60 + p) * 10**9,
+                "venue": "CEX", "instrument": "BTC-USDT", "side": "BUY" if p % 2 else "SELL",
+                "price": 40000.0, "quantity": 1.0, "participant_id": f"P{p}", "order_id": f"O{minute}-{p}"
+            })
+        for i in range(5):
+            rows.append({
+                "event_time_ns": BASE_NS + (minute * 60 + 30 + i) * 10**9,
+                "venue": "CEX", "instrument": "BTC-USDT", "side": "CANCEL",
+                "price": 40000.0, "quantity": 500.0, "participant_id": "SPOOFER", "order_id": f"S{minute}-{i}"
+            })
+    return pd.DataFrame(rows)
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_load_trades_normalises_and_sorts(self):
+        """Timestamps become int nanoseconds, rows are ordered by event time and origin defaults to the venue"""
+        path = os.path.join(self.tmp.name, "trades.csv")
+        frame = make_trades().iloc[::-1].rename(columns={"event_time_ns": "event_time"})
+        frame["event_time"] = pd.to_datetime(frame["event_time"], utc=True).astype(str)
+        frame.to_csv(path, index=False)
+
+        trades = replay.load_trades(path)
+        self.assertEqual(list(trades.columns), replay.TRADE_COLUMNS)
+        self.assertEqual(trades["event_time"].iloc[0], BASE_NS)
+        self.assertTrue(trades["event_time"].is_monotonic_increasing)
+        self.assertTrue((trades["origin"] == "CEX").all())
+
+    def test_batch_bounds_split_by_size_and_event_time(self):
+        """Batches hold at most batch_size trades and, when paced, at most span_ns of event time"""
+        times = pd.Series([0, 1, 2, 10, 11, 30]).to_numpy()
+        self.assertEqual(replay.batch_bounds(times, 4), [0, 4, 6])
+        self.assertEqual(replay.batch_bounds(times, 4, span_ns=10), [0, 3, 4, 5, 6])
+
+    def test_replay_opens_cases_in_event_time(self):
+        """The spoofer gets cases through the live pipeline, and a second replay finds the same ones"""
+        path = os.path.join(self.tmp.name, "trades.csv")
+        make_trades().to_csv(path, index=False)
+        trades = replay.load_trades(path)
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return asyncio.run(replay.replay(trades, batch_size=50, retrain_interval_s=math.inf))
+
+        summary = run()
+        self.assertEqual(summary["trades"], len(trades))
+        self.assertAlmostEqual(summary["event_time"]["span_s"], 11 * 60 + 34)
+        self.assertIn("features", summary["stages"])
+        self.assertEqual(summary["model_version"], 1)
+        spoofer_cases = [c for c in summary["cases"]["items"] if c["participant_id"] == "SPOOFER"]
+        self.assertTrue(spoofer_cases)
+        self.assertTrue(all(c["alert_type"] == "SPOOFING" for c in spoofer_cases))
+
+        def case_keys(s):
+            return sorted((c["participant_id"], c["window_start"], c["alert_type"]) for c in s["cases"]["items"])
+
+        self.assertEqual(case_keys(run()), case_keys(summary))
+
+    def test_replay_leaves_live_state_alone(self):
+        """No live case store, archive, model registry or rule watcher is opened, and stages run inline"""
+        live = {
+            "database": {"enabled": True, "path": os.path.join(self.tmp.name, "cases.db")},
+            "archive": {"enabled": True, "directory": os.path.join(self.tmp.name, "archive")},
+            "ml_model": {"registry_dir": os.path.join(self.tmp.name, "models")},
+            "rules": {"directory": "rules", "auto_reload": True},
+            "performance": {"execution_mode": "process"}
+        }
+        config, replay.main.CONFIG = replay.main.CONFIG, live
+        try:
+            replay.configure_engine(replay.EventClock())
+        finally:
+            replay.main.CONFIG = config
+
+        self.assertEqual(os.listdir(self.tmp.name), [])
+        self.assertIs(type(replay.main.CASE_STORE), replay.CaseStore)
+        self.assertIsNone(replay.main.TRADE_ARCHIVE)
+        self.assertIsNone(replay.main.PIPELINE.rule_watcher)
+        self.assertIsNone(replay.main.PIPELINE.trainer.registry)
+        self.assertEqual(replay.main.STAGE_EXECUTOR.mode, "inline")
+
+if __name__ == '__main__':
+    unittest.main()
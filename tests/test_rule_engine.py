@@ -6,9 +6,11 @@ import unittest
 import sys
 import os
 
+import pandas as pd
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
 
-from rules.rule_engine import RuleEngine
+from rules.rule_engine import RuleEngine, CompiledRule
 
 
 class TestRuleEngine(unittest.TestCase):
@@ -56,5 +58,39 @@ class TestRuleEngine(unittest.TestCase):
         self.assertEqual(len(alerts), 0)
 
 
+    def test_evaluate_frame_matches_row_evaluation(self):
+        """Vectorized evaluation flags the same rows with the same alerts"""
+        features = pd.DataFrame([
+            {"cancel_ratio": 0.8, "quantity_percentile": 99.0, "self_trade_ratio": 0.0, "wash_volume_ratio": 0.0},
+            {"cancel_ratio": 0.1, "quantity_percentile": 50.0, "self_trade_ratio": 0.5, "wash_volume_ratio": 0.5},
+            {"cancel_ratio": 0.9, "quantity_percentile": 80.0, "self_trade_ratio": 0.0, "wash_volume_ratio": 0.5},
+            {"cancel_ratio": 0.0, "quantity_percentile": 50.0, "self_trade_ratio": 0.0, "wash_volume_ratio": 0.0},
+        ], index=[10, 11, 12, 13])
+
+        evaluation = self.rule_engine.evaluate_frame(features)
+        expected = {
+            i: alerts for i, alerts in
+            ((i, self.rule_engine.evaluate(row.to_dict())) for i, row in features.iterrows())
+            if alerts
+        }
+        self.assertEqual(evaluation.alerts, expected)
+        self.assertEqual(list(evaluation.masks["spoofing_large_orders"]), [True, False, False, False])
+        self.assertEqual(list(evaluation.any_match), [True, True, False, False])
+
+    def test_missing_metrics_are_skipped(self):
+        """A metric absent from the input does not fail the rule"""
+        features = pd.DataFrame([{"cancel_ratio": 0.8}, {"cancel_ratio": 0.2}])
+        evaluation = self.rule_engine.evaluate_frame(features)
+        self.assertEqual(list(evaluation.masks["spoofing_large_orders"]), [True, False])
+        self.assertEqual(len(self.rule_engine.evaluate({"cancel_ratio": 0.8})), 2)
+
+    def test_malformed_condition_fails_rule(self):
+        """A condition that cannot be parsed never matches when its metric is present"""
+        rule = CompiledRule.compile({"id": "bad", "when": {"cancel_ratio": "greater than 0.7"}})
+        self.assertFalse(rule.matches({"cancel_ratio": 0.9}))
+        self.assertTrue(rule.matches({"other": 1.0}))
+        self.assertFalse(rule.mask(pd.DataFrame({"cancel_ratio": [0.9]}))[0])
+
+
 if __name__ == '__main__':
     unittest.main()
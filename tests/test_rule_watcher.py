@@ -0,0 +1,86 @@
+"""
+Unit tests for rule validation and hot reload
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from rules.rule_engine import RuleEngine, load_rule_set, validate_rule_def
+from rules.rule_watcher import RuleWatcher
+
+RULES_DIR = os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine', 'rules')
+
+SPOOFING = """id: spoofing_large_orders
+alert_type: SPOOFING
+severity: HIGH
+description: Large orders cancelled
+when:
+  cancel_ratio: "> {threshold}"
+"""
+
+
+class TestRuleWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.rules_dir = self.tmp.name
+        self.write("spoofing.yaml", SPOOFING.format(threshold=0.7))
+        self.engine = RuleEngine(self.rules_dir)
+        self.watcher = RuleWatcher(self.engine, interval_s=0.01)
+
+    def write(self, filename, text):
+        path = os.path.join(self.rules_dir, filename)
+        with open(path, "w") as f:
+            f.write(text)
+        # Make the edit visible even on filesystems with coarse mtimes
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_validation_reports_every_problem(self):
+        """Missing keys and unparseable clauses are listed; the shipped rules are valid"""
+        problems = validate_rule_def({"id": "r", "when": {"a": "> x", "b": "~ 1", "c": 3}})
+        self.assertEqual(len(problems), 4)
+        self.assertIn("missing alert_type", problems)
+        self.assertEqual(len(load_rule_set(RULES_DIR, strict=True)), len(RuleEngine(RULES_DIR).rules))
+
+    def test_changed_rules_swap_in_once_settled(self):
+        """An edit is applied on the poll after it stops changing"""
+        frame = pd.DataFrame({"cancel_ratio": [0.75]})
+        self.assertTrue(self.engine.evaluate_frame(frame).any_match.all())
+
+        self.write("spoofing.yaml", SPOOFING.format(threshold=0.8))
+        self.assertFalse(self.watcher.poll())
+        self.assertTrue(self.watcher.poll())
+        self.assertEqual(self.engine.version, 1)
+        self.assertFalse(self.engine.evaluate_frame(frame).any_match.any())
+        self.assertFalse(self.watcher.poll())
+
+    def test_invalid_files_leave_active_rules_alone(self):
+        """A broken or duplicate rule rejects the whole reload until the files change again"""
+        active = self.engine.rules
+        self.write("broken.yaml", "id: broken\nwhen: [\n")
+        self.write("copy.yaml", SPOOFING.format(threshold=0.9))
+        self.watcher.poll()
+        self.assertFalse(self.watcher.poll())
+        self.assertIs(self.engine.rules, active)
+        self.assertEqual(self.watcher.failures, 1)
+        self.assertIn("broken.yaml", self.watcher.last_error)
+        self.assertIn("duplicate rule id", self.watcher.last_error)
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(self.watcher.failures, 1)
+
+        os.remove(os.path.join(self.rules_dir, "broken.yaml"))
+        os.remove(os.path.join(self.rules_dir, "copy.yaml"))
+        self.watcher.poll()
+        self.watcher.poll()
+        self.assertIsNone(self.watcher.last_error)
+        self.assertIs(self.engine.rules, active)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Unit tests for the participant-sharded surveillance pipeline
+"""
+
+import asyncio
+import math
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from pipeline.sharded_pipeline import ShardedPipeline, shard_for
+
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+CONFIG = {
+    "rules": {"directory": os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine', 'rules')},
+    "ml_model": {"retrain_interval_seconds": math.inf, "retrain_min_rows": math.inf}
+}
+BASE_NS = 1_700_000_000_000_000_000
+
+
+def make_trades(participant_id, n, start_ns, side="BUY", quantity=1.0):
+    return [
+        {
+            "event_time": start_ns + i * 10**9,
+            "venue": "CEX",
+            "instrument": "BTC-USDT",
+            "side": side,
+            "price": 40000.0,
+            "quantity": quantity,
+            "participant_id": participant_id,
+            "order_id": f"{participant_id}-{i}",
+            "origin": "CEX"
+        }
+        for i in range(n)
+    ]
+
+
+class TestShardedPipeline(unittest.TestCase):
+    def test_routing_is_stable(self):
+        """A participant always maps to the same shard, in any process"""
+        self.assertEqual(shard_for("P42", 4), shard_for("P42", 4))
+        pipeline = ShardedPipeline(4, CONFIG, FEATURE_COLS)
+        trades = [t for i in range(40) for t in make_trades(f"P{i}", 2, BASE_NS)]
+        parts = pipeline.partition(trades)
+
+        self.assertEqual(sum(len(p) for p in parts), len(trades))
+        for shard, part in enumerate(parts):
+            self.assertTrue(all(shard_for(t["participant_id"], 4) == shard for t in part))
+        self.assertTrue(all(parts))
+
+    def test_shards_keep_state_between_calls(self):
+        """Each shard accumulates its own windows; closed windows are merged into one baseline store"""
+        async def run():
+            pipeline = ShardedPipeline(2, CONFIG, FEATURE_COLS)
+            try:
+                normal = [t for i in range(20) for t in make_trades(f"P{i}", 3, BASE_NS)]
+                spoofer = make_trades("SPOOFER", 20, BASE_NS, side="CANCEL", quantity=500.0)
+                await pipeline.submit(normal + spoofer[:10])
+                first = await pipeline.drain()
+                before = pipeline.baseline_store.baselines()
+                await pipeline.submit(spoofer[10:])
+                # Trades ten minutes later close every shard's first windows
+                await pipeline.submit([t for i in range(20) for t in make_trades(f"P{i}", 1, BASE_NS + 600 * 10**9)])
+                rest = await pipeline.drain()
+                return first, rest, before, pipeline.baseline_store, pipeline.model_versions
+
+            finally:
+                pipeline.shutdown()
+
+        first, rest, before, store, model_versions = asyncio.run(run())
+        results = first + rest
+        self.assertEqual(sorted(r.shard for r in first), [0, 1])
+        self.assertTrue(all(r.error is None for r in results))
+        self.assertEqual(sum(r.trades for r in results), 100)
+        self.assertIn("SPOOFER", {f.participant_id for r in results for f in r.findings})
+        self.assertEqual(before, {})
+        # Every participant's first window closed, in whichever shard it lives
+        market = store.segments[None]["num_trades"].stat
+        self.assertAlmostEqual(market.weight, 21.0)
+        # Three trades per normal window; the spoofer only cancelled
+        self.assertAlmostEqual(market.mean, 20 * 3 / 21)
+        # Each shard's latest reported model is what the coordinator exports
+        latest = {r.shard: r.model_version for r in results}
+        self.assertEqual(model_versions, [latest[0], latest[1]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Unit tests for the analysis stage and its process-pool executor
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from ml.anomaly_detection import AnomalyDetector
+from pipeline.stages import analyse_windows
+from pipeline.stage_executor import StageExecutor
+from rules.rule_engine import RuleEngine
+
+FEATURE_COLS = ["num_trades", "buy_sell_ratio", "avg_quantity", "venue_switch_count"]
+
+
+def make_features():
+    rows = []
+    for i in range(40):
+        rows.append({
+            "participant_id": f"P{i}",
+            "instrument": "BTC-USDT",
+            "num_trades": 4.0 + i % 3,
+            "buy_sell_ratio": 1.0,
+            "avg_quantity": 1.0 + (i % 5) / 10,
+            "venue_switch_count": 1.0,
+            "cancel_ratio": 0.0,
+            "quantity_percentile": 50.0,
+            "self_trade_ratio": 0.0,
+            "wash_volume_ratio": 0.0,
+        })
+    # One spoofer
+    rows[7].update(cancel_ratio=0.9, quantity_percentile=99.0)
+    return pd.DataFrame(rows)
+
+
+class TestAnalysisStage(unittest.TestCase):
+    def setUp(self):
+        self.features = make_features()
+        self.detector = AnomalyDetector()
+        self.detector.fit(self.features, FEATURE_COLS)
+        self.rule_engine = RuleEngine(rules_dir="surveillance-engine/rules")
+
+    def test_rule_hit_becomes_finding(self):
+        """Rows that trip a rule are returned as findings"""
+        findings = analyse_windows(self.features, self.detector.current, self.rule_engine, {}, anomaly_threshold=2.0)
+        self.assertEqual([f.participant_id for f in findings], ["P7"])
+        self.assertEqual(findings[0].alerts[0]["type"], "SPOOFING")
+
+    def test_process_mode_matches_inline(self):
+        """The process pool returns the same findings as inline execution"""
+        async def analyse(mode):
+            executor = StageExecutor(mode=mode, workers=1)
+            try:
+                return await executor.analyse(self.features, self.detector.current, self.rule_engine, {}, 0.5)
+            finally:
+                executor.shutdown()
+
+        inline = asyncio.run(analyse("inline"))
+        pooled = asyncio.run(analyse("process"))
+        self.assertEqual(
+            [(f.participant_id, round(f.ml_score, 9)) for f in inline],
+            [(f.participant_id, round(f.ml_score, 9)) for f in pooled]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Unit tests for startup timing and the import-time report
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from metrics.startup import SECTION_MARKER, StartupTimer, by_package, parse_import_times
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'surveillance-engine')
+
+IMPORT_TIMES = f"""import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+{SECTION_MARKER}
+import time:       500 |        500 |     numpy.core
+import time:       300 |        800 |   numpy
+import time:      2000 |       2000 |     sklearn.base
+import time:       200 |       3000 | sklearn
+{SECTION_MARKER}
+import time:        50 |         50 | json
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_times_are_split_and_grouped(self):
+        """-X importtime lines are parsed per section and summed per top-level package"""
+        before, first, second = parse_import_times(IMPORT_TIMES)
+        self.assertEqual([e.module for e in before], ["encodings"])
+        self.assertEqual([(e.module, e.depth) for e in first][:2], [("numpy.core", 2), ("numpy", 1)])
+        self.assertEqual(by_package(first), [("sklearn", 2.2), ("numpy", 0.8)])
+        self.assertEqual(second[0].cumulative_us, 50)
+
+    def test_timer_records_milestones_and_phases(self):
+        """Milestones are times since start; phases accumulate"""
+        timer = StartupTimer()
+        with timer.phase("imports"):
+            pass
+        with timer.phase("imports"):
+            pass
+        timer.mark("ready")
+        samples = dict(timer.samples())
+        self.assertEqual(set(samples), {("ready",), ("imports",)})
+        self.assertGreaterEqual(samples[("ready",)], samples[("imports",)])
+        self.assertTrue(timer.summary().startswith("ready after"))
+
+    def test_main_imports_without_the_analysis_stack(self):
+        """Importing main leaves pandas and sklearn to load_engine()"""
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, main; print(sorted({'pandas', 'sklearn', 'numpy'} & set(sys.modules)))"],
+            cwd=ENGINE_DIR, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+
+if __name__ == '__main__':
+    unittest.main()
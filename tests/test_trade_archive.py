@@ -0,0 +1,136 @@
+"""
+Unit tests for the partitioned columnar trade archive
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'surveillance-engine'))
+
+from archive.trade_archive import DAY_NS, TradeArchive
+
+BASE_NS = 1_700_000_000_000_000_000
+
+
+def make_trades(n, participants=5, instruments=("BTC-USDT", "ETH/USDT"), start_ns=BASE_NS, step_ns=10**9):
+    return [
+        {
+            "event_time": start_ns + i * step_ns,
+            "venue": "CEX" if i % 2 else "DEX",
+            "instrument": instruments[i % len(instruments)],
+            "side": "BUY",
+            "price": 100.0 + i,
+            "quantity": 1.0,
+            "participant_id": f"P{i % participants}",
+            "order_id": f"O{i}",
+            "origin": "CEX"
+        }
+        for i in range(n)
+    ]
+
+
+class TestTradeArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def open(self, **kwargs):
+        archive = TradeArchive(self.tmp.name, flush_interval_s=3600, **kwargs)
+        self.addCleanup(archive.close)
+        return archive
+
+    def test_partitions_by_day_and_instrument(self):
+        """Segments are written per UTC day and instrument, and read back in event-time order"""
+        archive = self.open()
+        trades = make_trades(40) + make_trades(20, start_ns=BASE_NS + DAY_NS)
+        archive.append(trades[:30])
+        archive.append(trades[30:])
+        archive.flush()
+
+        self.assertEqual(len(archive.catalog), 4)
+        self.assertEqual(archive.rows_written, 60)
+
+    def test_malformed_batch_is_counted_not_fatal(self):
+        """A batch that cannot be converted is dropped and counted; later batches are still archived"""
+        archive = self.open()
+        archive.append([{"instrument": "BTC-USDT"}])
+        archive.append(make_trades(10))
+        archive.flush(timeout=5)
+        self.assertEqual(archive.failed, 1)
+        self.assertEqual(archive.rows_written, 10)
+
+        archive.close()
+        start = time.monotonic()
+        archive.flush()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual({s.instrument for s in archive.catalog}, {"BTC-USDT", "ETH/USDT"})
+        everything = archive.read()
+        self.assertEqual(len(everything), 60)
+        self.assertEqual(list(everything["event_time"]), sorted(t["event_time"] for t in trades))
+        first = everything.iloc[0]
+        self.assertEqual(
+            (first["participant_id"], first["instrument"], first["order_id"], first["venue"], first["price"]),
+            ("P0", "BTC-USDT", "O0", "DEX", 100.0)
+        )
+
+    def test_participant_and_time_range_predicates(self):
+        """Only the requested participants' trades inside [start_ns, end_ns) come back"""
+        archive = self.open()
+        trades = make_trades(100)
+        archive.append(trades)
+        archive.flush()
+
+        start, end = BASE_NS + 20 * 10**9, BASE_NS + 60 * 10**9
+        result = archive.read(participant_id=["P1", "P3", "NOBODY"], start_ns=start, end_ns=end)
+        expected = [
+            t["order_id"] for t in trades
+            if t["participant_id"] in ("P1", "P3") and start <= t["event_time"] < end
+        ]
+        self.assertEqual(list(result["order_id"]), expected)
+
+        eth = archive.read(participant_id="P1", instrument="ETH/USDT")
+        self.assertEqual(set(eth["instrument"]), {"ETH/USDT"})
+        self.assertEqual(len(eth), 10)
+        self.assertTrue(archive.read(participant_id="NOBODY").empty)
+
+    def test_reopened_archive_finds_existing_segments(self):
+        """The catalog is rebuilt from disk; unfinished segment directories are ignored"""
+        archive = self.open()
+        archive.append(make_trades(10))
+        archive.flush()
+        archive.close()
+        partition = os.path.dirname(archive.catalog[0].path)
+        os.makedirs(os.path.join(partition, ".interrupted"))
+
+        reopened = self.open()
+        self.assertEqual(len(reopened.catalog), 2)
+        self.assertEqual(len(reopened.read(participant_id="P2")), 2)
+
+    def test_large_batches_flush_without_waiting(self):
+        """A segment is written as soon as max_segment_rows trades are pending"""
+        archive = self.open(max_segment_rows=50)
+        archive.append(make_trades(60, instruments=("BTC-USDT",)))
+        deadline = time.monotonic() + 5
+        while not archive.segments_written and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(archive.rows_written, 60)
+
+    def test_malformed_batch_is_counted_not_fatal(self):
+        """A batch that cannot be converted is dropped and counted; later batches are still archived"""
+        archive = self.open()
+        archive.append([{"instrument": "BTC-USDT"}])
+        archive.append(make_trades(10))
+        archive.flush(timeout=5)
+        self.assertEqual(archive.failed, 1)
+        self.assertEqual(archive.rows_written, 10)
+
+        archive.close()
+        start = time.monotonic()
+        archive.flush()
+        self.assertLess(time.monotonic() - start, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Unit tests for the UI's capped row ring
+"""
+
+import os
+import sys
+import unittest
+
+# Appended, not inserted: the UI's main and config modules must not shadow the engine's
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'surveillance-ui'))
+
+from tabs.virtual_tree import RowRing
+
+
+class TestRowRing(unittest.TestCase):
+    def test_oldest_rows_are_evicted_past_capacity(self):
+        """Rows are paged newest first and the ring never grows past capacity"""
+        ring = RowRing(capacity=3)
+        evicted = [ring.add((i,)) for i in range(5)]
+        self.assertEqual(evicted, [[], [], [], [0], [1]])
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([values for _, values, _ in ring.page(0, 10)], [(4,), (3,), (2,)])
+        self.assertEqual([values for _, values, _ in ring.page(1, 1)], [(3,)])
+
+    def test_keyed_rows_update_in_place(self):
+        """Re-adding a key replaces its row without moving or evicting anything"""
+        ring = RowRing(capacity=2)
+        ring.add(("open",), key="C1")
+        ring.add(("open",), tags=("HIGH",), key="C2")
+        self.assertEqual(ring.add(("closed",), key="C1"), [])
+        self.assertEqual(ring.page(0, 2), [("C2", ("open",), ("HIGH",)), ("C1", ("closed",), ())])
+        self.assertEqual(ring.add(("open",), key="C3"), ["C1"])
+        self.assertNotIn("C1", ring)
+
+if __name__ == '__main__':
+    unittest.main()